@@ -5,27 +5,40 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.widget import Widget
 from kivy.uix.image import Image as KivyImage
-from kivy.animation import Animation
-from kivy.graphics import Color, Rectangle, Ellipse, Line
-from kivy.properties import NumericProperty
-from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.clock import Clock, mainthread
+from kivy.graphics.texture import Texture
 
 import serial
 import json 
 import time
 import os
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from datetime import datetime
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from io import BytesIO
-from kivy.core.image import Image as CoreImage
+from threading import Thread
+
+from display import DisplayBinding, GlyphLabel
+from face import AnimatedFace
+from idle import IdleMode
+from profiler import install_from_env, span
+from pyramid import ChartPyramid
+from sensor_log import SensorLogTail, stamp
+from sketch import SketchStore
+from sparkline import Sparkline
+from streaming import (DRY_LEVEL, AnomalyMonitor, CorrelationTracker, DryingForecasts,
+                       summary_insights)
+from synthetic import sample_readings
 
 SERIAL_PORT = '/dev/ttyUSB0'
 BAUD_RATE = 9600
 
+CHART_PIXELS = 640      # Graph width, figsize 8in at 80 dpi
+MIN_VIEW_SPAN = 600     # Seconds, the furthest the charts zoom in
+
 
 def read_sensor_data(ser):
     try:
@@ -38,7 +51,7 @@ def read_sensor_data(ser):
 
 
 def save_to_csv(data):
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    timestamp = data.get('timestamp') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     try:
         log_entry = {
             'timestamp': timestamp,
@@ -72,24 +85,8 @@ def load_sensor_data(filename='sensor_log.jsonl'):
 
 
 def generate_sample_data():
-    import random
-    from datetime import datetime, timedelta
-    
-    data = []
-    start_time = datetime.now() - timedelta(hours=24)
-    
-    for i in range(100):
-        timestamp = start_time + timedelta(minutes=i * 15)
-        moisture = 40 + random.randint(-20, 40)
-        data.append({
-            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            'raw': random.randint(300, 700),
-            'moisture': max(0, min(100, moisture)),
-            'temperature': 25 + random.randint(-5, 10),
-            'humidity': 50 + random.randint(-15, 25),
-            'status': 'WET' if moisture > 60 else ('MOIST' if moisture > 30 else 'DRY')
-        })
-    return data
+    """A day of synthetic readings at 15 minute intervals, for when there is no sensor log yet"""
+    return sample_readings(100, 900)
 
 
 def analyze_data(data):
@@ -106,25 +103,8 @@ def analyze_data(data):
     avg_moisture = sum(moistures) / len(moistures)
     avg_temp = sum(temps) / len(temps)
     avg_humidity = sum(humidities) / len(humidities)
-    dry_periods = sum(1 for m in moistures if m < 30)
-    
-    insights = []
-    if avg_moisture < 40:
-        insights.append(f"WARNING: Low moisture ({avg_moisture:.1f}%)")
-    elif avg_moisture > 70:
-        insights.append(f"HIGH moisture ({avg_moisture:.1f}%)")
-    else:
-        insights.append(f"OPTIMAL moisture ({avg_moisture:.1f}%)")
-    
-    if dry_periods > len(data) * 0.3:
-        insights.append(f"{dry_periods} critical dry periods!")
-    
-    if avg_temp > 30:
-        insights.append(f"High temp ({avg_temp:.1f}C)")
-    elif avg_temp < 18:
-        insights.append(f"Low temp ({avg_temp:.1f}C)")
-    
-    insights.append(f"Total: {len(data)} readings")
+    dry_periods = sum(1 for m in moistures if m < DRY_LEVEL)
+    insights = summary_insights(avg_moisture, avg_temp, dry_periods, len(data))
     
     return {
         'avg_moisture': avg_moisture,
@@ -134,199 +114,183 @@ def analyze_data(data):
     }
 
 
-def create_graph_image(data, graph_type='all'):
-    display_data = data[-100:]
-    fig, ax = plt.subplots(figsize=(8, 5), facecolor='white')
-    
-    if graph_type == 'all':
-        times = list(range(len(display_data)))
-        ax.plot(times, [d['moisture'] for d in display_data], 'b-', linewidth=2, label='Moisture')
-        ax.plot(times, [d['temperature'] for d in display_data], 'r-', linewidth=2, label='Temp')
-        ax.plot(times, [d['humidity'] for d in display_data], 'g-', linewidth=2, label='Humidity')
-        ax.set_title('All Parameters Over Time', fontsize=14, fontweight='bold')
-        ax.legend()
-    elif graph_type == 'temp_moisture':
-        temps = [d['temperature'] for d in display_data]
-        moistures = [d['moisture'] for d in display_data]
-        ax.scatter(temps, moistures, c='red', s=30, alpha=0.6)
-        ax.set_xlabel('Temperature (°C)', fontsize=12)
-        ax.set_ylabel('Moisture (%)', fontsize=12)
-        ax.set_title('Temperature vs Moisture', fontsize=14, fontweight='bold')
-    else:
-        humids = [d['humidity'] for d in display_data]
-        moistures = [d['moisture'] for d in display_data]
-        ax.scatter(humids, moistures, c='green', s=30, alpha=0.6)
-        ax.set_xlabel('Humidity (%)', fontsize=12)
-        ax.set_ylabel('Moisture (%)', fontsize=12)
-        ax.set_title('Humidity vs Moisture', fontsize=14, fontweight='bold')
-    
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    buf = BytesIO()
-    plt.savefig(buf, format='png', dpi=80)
-    buf.seek(0)
-    texture = CoreImage(buf, ext='png').texture
-    plt.close(fig)
+def load_graph_render():
+    """Import matplotlib and the renderer on first use, it costs seconds on a Pi"""
+    import graph_render
+    return graph_render
+
+
+def preload_graph_render(*args):
+    """Warm the matplotlib import in the background once the first frame is up"""
+    Thread(target=load_graph_render, daemon=True).start()
+
+
+def create_graph_image(data, graph_type='all', figsize=(8, 5), dpi=80, texture=None, xlim=None,
+                       fits=None):
+    """Update the persistent figure and blit its Agg buffer into a (reused) texture"""
+    graph = load_graph_render().get_persistent_graph(graph_type, figsize, dpi)
+    pixels = graph.update(data, xlim, fits)
+    width, height = graph.size()
+    return texture_from_rgba(width, height, pixels, texture)
+
+
+def texture_from_rgba(width, height, pixels, texture=None):
+    """Blit an RGBA buffer into texture, allocating one only if sizes differ"""
+    if texture is None or tuple(texture.size) != (width, height):
+        texture = Texture.create(size=(width, height), colorfmt='rgba')
+        # Agg rows run top to bottom, Kivy textures bottom to top
+        texture.flip_vertical()
+    if isinstance(pixels, memoryview):
+        # A live canvas buffer is (height, width, 4), blit_buffer wants it flat;
+        # worker results arrive as bytes, which are flat but read-only
+        pixels = pixels.cast('B')
+    texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
     return texture
 
 
-class AnimatedFace(Widget):
-    moisture_level = NumericProperty(50)
+def data_version(data):
+    """Cheap fingerprint of a reading list, changes whenever a reading is appended"""
+    if not data:
+        return (0, None)
+    return (len(data), data[-1].get('timestamp'))
+
+
+class GraphTextureCache:
+    """LRU cache of rendered graph textures keyed on data version and render params"""
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.bg_color = None
-        self.bg_rect = None
-        self.left_eye = None
-        self.right_eye = None
-        self.left_eye_highlight = None
-        self.right_eye_highlight = None
-        self.left_brow = None
-        self.right_brow = None
-        self.left_cheek_color = None
-        self.right_cheek_color = None
-        self.mouth = None
-        self.tear_color = None
-        self.is_blinking = False
-        self.original_eye_size = 0
-        
-        self.draw_face()
-        self.bind(moisture_level=self.update_expression)
-        self.bind(pos=self.redraw, size=self.redraw)
-        Clock.schedule_interval(self.blink, 3)
-    
-    def draw_face(self):
-        self.canvas.clear()
-        
-        with self.canvas.before:
-            self.bg_color = Color(0.85, 0.95, 0.95, 1)
-            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
-        
-        with self.canvas:
-            center_x = self.x + self.width / 2
-            center_y = self.y + self.height / 2
-            self.original_eye_size = min(self.width, self.height) * 0.12
-            eye_size = self.original_eye_size
-            eye_spacing = self.width * 0.15
-            
-            Color(0.2, 0.2, 0.2, 1)
-            self.left_brow = Line(points=[], width=5)
-            self.right_brow = Line(points=[], width=5)
-            
-            Color(0.1, 0.1, 0.1, 1)
-            self.left_eye = Ellipse(
-                pos=(center_x - eye_spacing - eye_size/2, center_y + self.height * 0.08 - eye_size/2),
-                size=(eye_size, eye_size)
-            )
-            Color(1, 1, 1, 1)
-            self.left_eye_highlight = Ellipse(
-                pos=(center_x - eye_spacing - eye_size/2 + eye_size * 0.3, 
-                     center_y + self.height * 0.08 - eye_size/2 + eye_size * 0.3),
-                size=(eye_size * 0.35, eye_size * 0.35)
-            )
-            
-            Color(0.1, 0.1, 0.1, 1)
-            self.right_eye = Ellipse(
-                pos=(center_x + eye_spacing - eye_size/2, center_y + self.height * 0.08 - eye_size/2),
-                size=(eye_size, eye_size)
-            )
-            Color(1, 1, 1, 1)
-            self.right_eye_highlight = Ellipse(
-                pos=(center_x + eye_spacing - eye_size/2 + eye_size * 0.3, 
-                     center_y + self.height * 0.08 - eye_size/2 + eye_size * 0.3),
-                size=(eye_size * 0.35, eye_size * 0.35)
-            )
-            
-            # Eyelashes
-            Color(0.1, 0.1, 0.1, 1)
-            for pos_x in [center_x - eye_spacing, center_x + eye_spacing]:
-                for i in range(4):
-                    offset = (i - 1.5) * eye_size * 0.25
-                    Line(points=[pos_x + offset, center_y + self.height * 0.08 + eye_size/2,
-                                pos_x + offset, center_y + self.height * 0.08 + eye_size/2 + eye_size * 0.6],
-                        width=2)
-            
-            cheek_size = self.width * 0.08
-            self.left_cheek_color = Color(1, 0.7, 0.75, 0)
-            Ellipse(pos=(center_x - self.width * 0.25 - cheek_size/2, 
-                        center_y - self.height * 0.05 - cheek_size/2),
-                   size=(cheek_size, cheek_size * 0.7))
-            
-            self.right_cheek_color = Color(1, 0.7, 0.75, 0)
-            Ellipse(pos=(center_x + self.width * 0.25 - cheek_size/2, 
-                        center_y - self.height * 0.05 - cheek_size/2),
-                   size=(cheek_size, cheek_size * 0.7))
-            
-            Color(0.2, 0.2, 0.2, 1)
-            self.mouth = Line(points=[], width=4)
-            
-            self.tear_color = Color(0.3, 0.6, 1, 0)
-            Ellipse(pos=(center_x + eye_spacing + eye_size * 0.8, center_y),
-                   size=(self.width * 0.02, self.height * 0.04))
-        
-        self.update_expression()
+    def __init__(self, max_entries=12):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.render_times = {}
+        self.spare = {}
     
-    def redraw(self, *args):
-        self.draw_face()
+    def make_key(self, data, graph_type='all', figsize=(8, 5), dpi=80, version=None, xlim=None,
+                 fits=None):
+        if version is None:
+            version = data_version(data)
+        return (version, graph_type, tuple(figsize), dpi, xlim, fits)
     
-    def blink(self, dt):
-        if self.is_blinking:
-            return
-        self.is_blinking = True
-        
-        left_eye_x, left_eye_y = self.left_eye.pos
-        right_eye_x, right_eye_y = self.right_eye.pos
-        
-        close = Animation(size=(self.original_eye_size, 3),
-                         pos=(left_eye_x, left_eye_y + self.original_eye_size/2), duration=0.08)
-        open_a = Animation(size=(self.original_eye_size, self.original_eye_size),
-                          pos=(left_eye_x, left_eye_y), duration=0.08)
-        
-        def reset(*args):
-            self.is_blinking = False
-        (close + open_a).bind(on_complete=reset).start(self.left_eye)
-        (close + open_a).start(self.right_eye)
-    
-    def update_expression(self, *args):
-        center_x = self.x + self.width / 2
-        center_y = self.y + self.height / 2
-        mouth_width = self.width * 0.25
-        
-        if self.moisture_level > 60:
-            self.draw_happy_mouth(center_x, center_y, mouth_width)
-            Animation(rgba=(0.3, 0.95, 0.4, 1), duration=0.3).start(self.bg_color)
-            Animation(a=0.5, duration=0.5).start(self.left_cheek_color)
-            Animation(a=0.5, duration=0.5).start(self.right_cheek_color)
-        elif self.moisture_level > 30:
-            self.draw_worried_mouth(center_x, center_y, mouth_width)
-            Animation(rgba=(1, 0.95, 0.3, 1), duration=0.3).start(self.bg_color)
-            Animation(a=0, duration=0.3).start(self.left_cheek_color)
-        else:
-            self.draw_sad_mouth(center_x, center_y, mouth_width)
-            Animation(rgba=(1, 0.4, 0.4, 1), duration=0.3).start(self.bg_color)
+    def lookup(self, key):
+        texture = self.entries.get(key)
+        if texture is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return texture
+    
+    def store(self, key, texture, render_ms):
+        self.render_times[key[1]] = render_ms
+        self.entries[key] = texture
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            _, evicted = self.entries.popitem(last=False)
+            # Keep one evicted texture per size around to blit the next render into
+            self.spare[tuple(evicted.size)] = evicted
+    
+    def take_spare(self, size):
+        return self.spare.pop(tuple(size), None)
+    
+    def get(self, data, graph_type='all', figsize=(8, 5), dpi=80, version=None, xlim=None,
+            fits=None):
+        key = self.make_key(data, graph_type, figsize, dpi, version, xlim, fits)
+        texture = self.lookup(key)
+        if texture is not None:
+            return texture
+        
+        start = time.perf_counter()
+        size = (int(figsize[0] * dpi), int(figsize[1] * dpi))
+        texture = create_graph_image(data, graph_type, figsize, dpi, self.take_spare(size),
+                                     xlim, fits)
+        self.store(key, texture, (time.perf_counter() - start) * 1000)
+        return texture
+    
+    def clear(self):
+        self.entries.clear()
+        self.spare.clear()
     
-    def draw_happy_mouth(self, cx, cy, w):
-        points = []
-        for i in range(20):
-            x = cx - w/2 + (w * i / 19)
-            y = cy - self.height * 0.12 - (w * 0.4) * (1 - 4 * ((i/19) - 0.5) ** 2)
-            points.extend([x, y])
-        self.mouth.points = points
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0,
+            'entries': len(self.entries),
+            'render_ms': dict(self.render_times)
+        }
+
+
+graph_cache = GraphTextureCache()
+
+
+class GraphRenderPool:
+    """Render graphs in worker processes and swap textures in on the UI thread"""
+    
+    def __init__(self, cache, max_workers=3):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.executor = None
+        self.latest = {}
     
-    def draw_worried_mouth(self, cx, cy, w):
-        self.mouth.points = [cx - w/2, cy - self.height * 0.15, cx + w/2, cy - self.height * 0.15]
+    def get_executor(self):
+        if self.executor is None:
+            # Workers get graph_render's functions, which pickle by reference to a module
+            # without Kivy, and are spawned fresh rather than forked with the window's GL state
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                mp_context=get_context('spawn'),
+                                                initializer=load_graph_render().init_worker)
+        return self.executor
+    
+    def request(self, data, graph_type, on_ready, figsize=(8, 5), dpi=80, version=None, xlim=None,
+                fits=None, on_error=None):
+        """Deliver a texture to on_ready, now if cached, otherwise once rendered.
+        
+        A failed render calls on_error with the exception instead.
+        Returns True when on_ready was called before returning.
+        """
+        key = self.cache.make_key(data, graph_type, figsize, dpi, version, xlim, fits)
+        self.latest[graph_type] = key
+        texture = self.cache.lookup(key)
+        if texture is not None:
+            on_ready(texture)
+            return True
+        
+        start = time.perf_counter()
+        try:
+            future = self.get_executor().submit(load_graph_render().render_graph, data,
+                                                graph_type, figsize, dpi, xlim, fits)
+        except Exception as e:
+            print(f"Graph pool unavailable, rendering inline: {e}")
+            on_ready(self.cache.get(data, graph_type, figsize, dpi, version, xlim, fits))
+            return True
+        future.add_done_callback(lambda f: self.finish(f, key, start, on_ready, on_error))
+        return False
     
-    def draw_sad_mouth(self, cx, cy, w):
-        points = []
-        for i in range(20):
-            x = cx - w/2 + (w * i / 19)
-            y = cy - self.height * 0.12 + (w * 0.4) * (1 - 4 * ((i/19) - 0.5) ** 2)
-            points.extend([x, y])
-        self.mouth.points = points
+    @mainthread
+    def finish(self, future, key, start, on_ready, on_error=None):
+        try:
+            width, height, pixels = future.result()
+        except Exception as e:
+            print(f"Graph render error: {e}")
+            if on_error is not None and self.latest.get(key[1]) == key:
+                on_error(e)
+            return
+        
+        texture = texture_from_rgba(width, height, pixels, self.cache.take_spare((width, height)))
+        self.cache.store(key, texture, (time.perf_counter() - start) * 1000)
+        # A newer request for this graph may have been issued while we rendered
+        if self.latest.get(key[1]) == key:
+            on_ready(texture)
     
-    def animate_to_level(self, new_level):
-        Animation(moisture_level=new_level, duration=0.3, t='in_out_quad').start(self)
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+graph_pool = GraphRenderPool(graph_cache)
 
 
 class MainMonitorScreen(Screen):
@@ -335,7 +299,7 @@ class MainMonitorScreen(Screen):
         
         layout = FloatLayout()
         
-        self.face = AnimatedFace(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0})
+        self.face = AnimatedFace(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0}, level_duration=0.3)
         layout.add_widget(self.face)
         
         # Analytics button - BOTTOM CENTER
@@ -356,8 +320,8 @@ class MainMonitorScreen(Screen):
                                size=(80, 100), pos_hint={'x': 0.02, 'top': 0.98})
         temp_layout.add_widget(Label(text='T', font_size='50sp', bold=True,
                                     color=(0.9, 0.3, 0.2, 1), size_hint=(1, 0.6)))
-        self.temp_value = Label(text='--C', font_size='22sp', bold=True,
-                               color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
+        self.temp_value = GlyphLabel(text='--C', font_size='22sp', bold=True,
+                                     color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
         temp_layout.add_widget(self.temp_value)
         layout.add_widget(temp_layout)
         
@@ -366,19 +330,39 @@ class MainMonitorScreen(Screen):
                                 size=(80, 100), pos_hint={'right': 0.98, 'top': 0.98})
         humid_layout.add_widget(Label(text='H', font_size='50sp', bold=True,
                                      color=(0.2, 0.5, 0.9, 1), size_hint=(1, 0.6)))
-        self.humidity_value = Label(text='--%', font_size='22sp', bold=True,
-                                   color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
+        self.humidity_value = GlyphLabel(text='--%', font_size='22sp', bold=True,
+                                         color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
         humid_layout.add_widget(self.humidity_value)
         layout.add_widget(humid_layout)
         
         # Moisture - TOP CENTER
-        self.moisture_label = Label(text='--%', font_size='56sp', bold=True,
-                                   color=(0.2, 0.2, 0.2, 1), size_hint=(None, None),
-                                   size=(200, 100), pos_hint={'center_x': 0.5, 'top': 0.95})
+        self.moisture_label = GlyphLabel(text='--%', font_size='56sp', bold=True,
+                                         color=(0.2, 0.2, 0.2, 1), size_hint=(None, None),
+                                         size=(200, 100), pos_hint={'center_x': 0.5, 'top': 0.95})
         layout.add_widget(self.moisture_label)
         
+        # Readouts redraw only when the shown string changes, at most once a second
+        self.moisture_display = DisplayBinding(self.moisture_label, '{}%')
+        self.temp_display = DisplayBinding(self.temp_value, '{}C')
+        self.humidity_display = DisplayBinding(self.humidity_value, '{}%')
+        
+        self.eta_label = Label(text='', font_size='18sp', color=(0.3, 0.3, 0.3, 1),
+                               size_hint=(None, None), size=(300, 40),
+                               pos_hint={'center_x': 0.5, 'y': 0.14})
+        layout.add_widget(self.eta_label)
+        self.forecasts = DryingForecasts()
+        
+        # Recent moisture trend, without a trip to the analytics screen
+        self.sparkline = Sparkline(size_hint=(None, None), size=(200, 60),
+                                   pos_hint={'right': 0.98, 'y': 0.04})
+        layout.add_widget(self.sparkline)
+        
         self.add_widget(layout)
         
+        # Low frame rate and no blinking when the readings stop changing, a touch wakes it
+        self.idle = IdleMode([self.face])
+        self.bind(on_touch_down=self.idle.activity)
+        
         self.ser = None
         self.init_serial()
         Clock.schedule_interval(self.read_sensor, 0.5)
@@ -395,21 +379,29 @@ class MainMonitorScreen(Screen):
         if self.ser is None:
             import random
             m = random.randint(20, 95)
+            self.idle.watch(m)
             self.face.animate_to_level(m)
-            self.moisture_label.text = str(m) + '%'
-            self.temp_value.text = str(random.randint(18, 30)) + 'C'
-            self.humidity_value.text = str(random.randint(40, 80)) + '%'
+            self.moisture_display.update(m)
+            self.sparkline.add(m)
+            self.temp_display.update(random.randint(18, 30))
+            self.humidity_display.update(random.randint(40, 80))
             return
         
         try:
             data = read_sensor_data(self.ser)
             if data:
+                stamp(data)
                 m = data['moisture']
+                self.idle.watch((m, data.get('temperature'), data.get('humidity')))
                 self.face.animate_to_level(m)
-                self.moisture_label.text = str(m) + '%'
-                self.temp_value.text = str(int(data.get('temperature', 0))) + 'C'
-                self.humidity_value.text = str(int(data.get('humidity', 0))) + '%'
-                save_to_csv(data)
+                self.moisture_display.update(m)
+                self.sparkline.add(m)
+                self.temp_display.update(int(data.get('temperature', 0)))
+                self.humidity_display.update(int(data.get('humidity', 0)))
+                self.forecasts.add(data)
+                self.eta_label.text = self.forecasts.summary()
+                with span('save_to_csv'):
+                    save_to_csv(data)
         except:
             pass
     
@@ -459,7 +451,24 @@ class AnalyticsScreen(Screen):
         stats.add_widget(self.humid_card)
         content.add_widget(stats)
         
+        # Zoom / pan controls for the charted time range
+        controls = BoxLayout(size_hint=(1, None), height=50, spacing=8)
+        for text, action in [('<<', lambda *a: self.pan(-0.25)),
+                             ('Zoom +', lambda *a: self.zoom(0.5)),
+                             ('Zoom -', lambda *a: self.zoom(2)),
+                             ('>>', lambda *a: self.pan(0.25)),
+                             ('All', lambda *a: self.reset_view())]:
+            btn = Button(text=text, size_hint=(None, 1), width=80,
+                         background_color=(0.3, 0.6, 0.9, 1), bold=True, font_size='16sp')
+            btn.bind(on_press=action)
+            controls.add_widget(btn)
+        self.view_label = Label(text='', font_size='14sp', color=(0.3, 0.3, 0.3, 1))
+        controls.add_widget(self.view_label)
+        content.add_widget(controls)
+        
         # Graphs
+        self.graph_images = {}
+        self.graph_placeholders = {}
         for title in ['all', 'temp_moisture', 'humid_moisture']:
             graph_box = BoxLayout(size_hint=(1, None), height=300, padding=10)
             with graph_box.canvas.before:
@@ -468,10 +477,17 @@ class AnalyticsScreen(Screen):
             graph_box.bind(pos=lambda i,v,r=rect: setattr(r, 'pos', i.pos),
                           size=lambda i,v,r=rect: setattr(r, 'size', i.size))
             
-            img = KivyImage(allow_stretch=True)
-            graph_box.add_widget(img)
+            slot = FloatLayout()
+            img = KivyImage(allow_stretch=True, pos_hint={'x': 0, 'y': 0})
+            placeholder = Label(text='Rendering...', font_size='18sp', color=(0.5, 0.5, 0.5, 1),
+                                pos_hint={'x': 0, 'y': 0}, opacity=0)
+            slot.add_widget(img)
+            slot.add_widget(placeholder)
+            graph_box.add_widget(slot)
             content.add_widget(graph_box)
             
+            self.graph_images[title] = img
+            self.graph_placeholders[title] = placeholder
             if title == 'all':
                 self.graph1_img = img
             elif title == 'temp_moisture':
@@ -480,7 +496,7 @@ class AnalyticsScreen(Screen):
                 self.graph3_img = img
         
         # Insights - FIXED to prevent layout loop
-        insights_box = BoxLayout(orientation='vertical', size_hint=(1, None), height=200, padding=15)
+        insights_box = BoxLayout(orientation='vertical', size_hint=(1, None), height=420, padding=15)
         with insights_box.canvas.before:
             Color(0.95, 0.98, 0.95, 1)
             r = Rectangle(pos=insights_box.pos, size=insights_box.size)
@@ -504,6 +520,16 @@ class AnalyticsScreen(Screen):
         layout.add_widget(scroll)
         self.add_widget(layout)
         
+        self.log_tail = SensorLogTail()
+        self.pyramid = ChartPyramid()
+        self.monitor = AnomalyMonitor()
+        self.forecasts = DryingForecasts()
+        self.correlations = CorrelationTracker()
+        self.sketches = SketchStore()
+        self.readings = []
+        self.showing_sample = False
+        self.view = None  # (t0, t1) in epoch seconds, None follows the full history
+        
         self.bind(on_enter=lambda *a: self.load_data())
     
     def create_card(self, label, value, color):
@@ -520,21 +546,118 @@ class AnalyticsScreen(Screen):
         card.value_label = value_label
         return card
     
+    def reset_readings(self):
+        """Drop every reading and the pyramid and trackers built from them"""
+        self.readings = []
+        self.pyramid = ChartPyramid()
+        self.monitor = AnomalyMonitor()
+        self.forecasts = DryingForecasts()
+        self.correlations = CorrelationTracker()
+        self.showing_sample = False
+        self.view = None
+    
     def load_data(self, *args):
-        data = load_sensor_data()
-        analysis = analyze_data(data)
+        # Only readings appended since the last load are parsed and rolled up
+        new_data, restarted = self.log_tail.read_new()
+        # Real readings replace the synthetic sample rather than follow it
+        if restarted or (self.showing_sample and new_data):
+            self.reset_readings()
+        sample = not self.readings and not new_data
+        if sample:
+            print("No sensor readings logged yet, showing synthetic sample data")
+            new_data = generate_sample_data()
+            self.showing_sample = True
+        self.readings.extend(new_data)
+        self.pyramid.extend(new_data)
+        self.monitor.extend(new_data)
+        self.forecasts.extend(new_data)
+        self.correlations.extend(new_data)
+        if not sample:
+            self.sketches.extend(new_data)  # Sample data must not end up in the persisted sketches
+        analysis = analyze_data(self.readings)
         
         self.moisture_card.value_label.text = f"{analysis['avg_moisture']:.1f}%"
         self.temp_card.value_label.text = f"{analysis['avg_temp']:.1f}C"
         self.humid_card.value_label.text = f"{analysis['avg_humidity']:.1f}%"
         
-        # Generate graphs
-        self.graph1_img.texture = create_graph_image(data, 'all')
-        self.graph2_img.texture = create_graph_image(data, 'temp_moisture')
-        self.graph3_img.texture = create_graph_image(data, 'humid_moisture')
+        self.render_view()
         
         # Insights - simple text join
-        self.insights_label.text = '\n'.join(analysis['insights'])
+        self.insights_label.text = '\n'.join(analysis['insights'] + self.forecasts.insights()
+                                             + self.sketches.insights() + self.correlations.insights()
+                                             + self.monitor.insights())
+    
+    def render_view(self):
+        """Render the charts for the current view from cached pyramid levels"""
+        bounds = self.pyramid.bounds()
+        if bounds is None:
+            return
+        t0, t1 = self.view or bounds
+        level, rows = self.pyramid.view(t0, t1, CHART_PIXELS)
+        version = (self.pyramid.version, level, t0, t1)
+        
+        # Generate graphs in parallel off the UI thread
+        for graph_type in self.graph_images:
+            if graph_type == 'all':
+                xlim, fits = (t0, t1), None
+            else:
+                xlim, fits = None, self.correlations.fits(graph_type)
+            if not graph_pool.request(rows, graph_type, partial(self.show_graph, graph_type),
+                                      version=version, xlim=xlim, fits=fits,
+                                      on_error=partial(self.show_graph_error, graph_type)):
+                self.graph_placeholders[graph_type].text = 'Rendering...'
+                self.graph_placeholders[graph_type].opacity = 1
+        
+        fmt = lambda t: datetime.fromtimestamp(t).strftime('%m-%d %H:%M')
+        self.view_label.text = f"{fmt(t0)} - {fmt(t1)} ({level})"
+        p5, p50, p95 = self.sketches.query('moisture', t0, t1).quantiles([0.05, 0.5, 0.95])
+        if p50 is not None:
+            self.view_label.text += f"\nmoisture {p5:.0f}-{p95:.0f}%, median {p50:.0f}%"
+    
+    def zoom(self, factor):
+        bounds = self.pyramid.bounds()
+        if bounds is None:
+            return
+        t0, t1 = self.view or bounds
+        center = (t0 + t1) / 2
+        half = max((t1 - t0) * factor, MIN_VIEW_SPAN) / 2
+        self.set_view(center - half, center + half)
+    
+    def pan(self, fraction):
+        bounds = self.pyramid.bounds()
+        if bounds is None or self.view is None:
+            return
+        t0, t1 = self.view
+        shift = (t1 - t0) * fraction
+        self.set_view(t0 + shift, t1 + shift)
+    
+    def set_view(self, t0, t1):
+        first, last = self.pyramid.bounds()
+        window = t1 - t0
+        if window >= last - first:
+            self.view = None
+        else:
+            if t0 < first:
+                t0, t1 = first, first + window
+            elif t1 > last:
+                t0, t1 = last - window, last
+            self.view = (t0, t1)
+        self.render_view()
+    
+    def reset_view(self):
+        self.view = None
+        self.render_view()
+    
+    def show_graph(self, graph_type, texture):
+        self.graph_images[graph_type].texture = texture
+        self.graph_placeholders[graph_type].opacity = 0
+    
+    def show_graph_error(self, graph_type, error):
+        """Keep the last good graph if there is one, otherwise say the render failed"""
+        if self.graph_images[graph_type].texture is not None:
+            self.graph_placeholders[graph_type].opacity = 0
+        else:
+            self.graph_placeholders[graph_type].text = 'Graph could not be rendered'
     
     def go_back(self, *args):
         self.manager.transition = SlideTransition(direction='right')
@@ -543,10 +666,15 @@ class AnalyticsScreen(Screen):
 
 class SmartAgricApp(App):
     def build(self):
+        install_from_env()
         sm = ScreenManager()
         sm.add_widget(MainMonitorScreen(name='main'))
         sm.add_widget(AnalyticsScreen(name='analytics'))
+        Clock.schedule_once(preload_graph_render, 1)
         return sm
+    
+    def on_stop(self):
+        graph_pool.shutdown()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,227 @@
+"""Headless batch analytics over archived sensor logs
+
+Usage: python batch.py [--workers N] [--chunk-mb MB] [--export rollups.csv] [--level hour|day]
+                       [--json] sensor_log.jsonl [more logs ...]
+
+Each log is cut into byte ranges that end on line boundaries, the ranges are
+aggregated in a multiprocessing pool and the partial aggregates merged, so
+throughput grows with the number of cores rather than with file size.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from sketch import KllSketch
+from streaming import DRY_LEVEL, METRICS, summary_insights
+
+
+class Aggregate:
+    """Mergeable partial totals for a slice of the log: sums, extremes, hourly rollups, sketches"""
+
+    def __init__(self):
+        self.count = 0
+        self.skipped = 0
+        self.dry = 0
+        self.sums = {m: 0.0 for m in METRICS}
+        self.mins = {m: None for m in METRICS}
+        self.maxs = {m: None for m in METRICS}
+        self.hours = {}  # 'YYYY-MM-DD HH' -> [count, sum, min, max per metric ...]
+        self.sketches = {m: KllSketch() for m in METRICS}
+
+    def add(self, reading):
+        try:
+            values = [float(reading[m]) for m in METRICS]
+        except (KeyError, TypeError, ValueError):
+            self.skipped += 1
+            return
+        self.count += 1
+        if values[0] < DRY_LEVEL:
+            self.dry += 1
+        for m, v in zip(METRICS, values):
+            self.sums[m] += v
+            if self.mins[m] is None or v < self.mins[m]:
+                self.mins[m] = v
+            if self.maxs[m] is None or v > self.maxs[m]:
+                self.maxs[m] = v
+            self.sketches[m].update(v)
+
+        # Sliced rather than parsed, strptime would dominate the run time
+        hour = str(reading.get('timestamp', ''))[:13]
+        row = self.hours.get(hour)
+        if row is None:
+            row = self.hours[hour] = [0] + [x for v in values for x in (0.0, v, v)]
+        row[0] += 1
+        for i, v in enumerate(values):
+            j = 1 + 3 * i
+            row[j] += v
+            if v < row[j + 1]:
+                row[j + 1] = v
+            if v > row[j + 2]:
+                row[j + 2] = v
+
+    def merge(self, other):
+        """Fold another partial aggregate into this one, returns self"""
+        self.count += other.count
+        self.skipped += other.skipped
+        self.dry += other.dry
+        for m in METRICS:
+            self.sums[m] += other.sums[m]
+            if other.mins[m] is not None:
+                self.mins[m] = other.mins[m] if self.mins[m] is None else min(self.mins[m], other.mins[m])
+                self.maxs[m] = other.maxs[m] if self.maxs[m] is None else max(self.maxs[m], other.maxs[m])
+            self.sketches[m].merge(other.sketches[m])
+        for hour, theirs in other.hours.items():
+            mine = self.hours.get(hour)
+            if mine is None:
+                self.hours[hour] = theirs
+            else:
+                Aggregate.merge_row(mine, theirs)
+        return self
+
+    def rollups(self, level='hour'):
+        """[(period, count, avg/min/max per metric ...)] sorted by period"""
+        width = 13 if level == 'hour' else 10
+        periods = {}
+        for hour, row in self.hours.items():
+            period = hour[:width]
+            if period in periods:
+                Aggregate.merge_row(periods[period], row)
+            else:
+                periods[period] = list(row)
+        out = []
+        for period in sorted(periods):
+            row = periods[period]
+            n = row[0]
+            values = []
+            for j in range(1, len(row), 3):
+                values += [row[j] / n, row[j + 1], row[j + 2]]
+            out.append((period, n, *values))
+        return out
+
+    @staticmethod
+    def merge_row(mine, theirs):
+        mine[0] += theirs[0]
+        for j in range(1, len(mine), 3):
+            mine[j] += theirs[j]
+            mine[j + 1] = min(mine[j + 1], theirs[j + 1])
+            mine[j + 2] = max(mine[j + 2], theirs[j + 2])
+
+    def analysis(self):
+        """Same fields and insight rules as analytics.analyze_data, plus percentiles"""
+        if not self.count:
+            return {'avg_moisture': 0, 'avg_temp': 0, 'avg_humidity': 0,
+                    'insights': ["No data available yet!"]}
+        avg_moisture = self.sums['moisture'] / self.count
+        avg_temp = self.sums['temperature'] / self.count
+        avg_humidity = self.sums['humidity'] / self.count
+
+        insights = summary_insights(avg_moisture, avg_temp, self.dry, self.count)
+
+        return {
+            'avg_moisture': avg_moisture,
+            'avg_temp': avg_temp,
+            'avg_humidity': avg_humidity,
+            'min_moisture': self.mins['moisture'],
+            'max_moisture': self.maxs['moisture'],
+            'dry_periods': self.dry,
+            'total_readings': self.count,
+            'skipped_lines': self.skipped,
+            'percentiles': {m: dict(zip(('p5', 'p50', 'p95'),
+                                        self.sketches[m].quantiles([0.05, 0.5, 0.95])))
+                            for m in METRICS},
+            'insights': insights
+        }
+
+
+def split_chunks(paths, chunk_size):
+    """(path, start, end) byte ranges of about chunk_size covering every file"""
+    chunks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, size, chunk_size):
+            chunks.append((path, start, min(start + chunk_size, size)))
+    return chunks
+
+
+def process_chunk(chunk):
+    """Aggregate the lines that start inside [start, end) of a file
+
+    A line belongs to the chunk its first byte falls in, so a chunk skips the
+    partial line it starts in the middle of and reads past `end` to finish
+    its last one.
+    """
+    path, start, end = chunk
+    aggregate = Aggregate()
+    with open(path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()  # Rest of the line owned by the previous chunk
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            if not line.strip():
+                continue
+            try:
+                aggregate.add(json.loads(line))
+            except ValueError:
+                aggregate.skipped += 1
+    return aggregate
+
+
+def run(paths, workers=None, chunk_size=16 << 20):
+    """Map process_chunk over every chunk of paths and reduce to one Aggregate"""
+    chunks = split_chunks(paths, chunk_size)
+    total = Aggregate()
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            total.merge(process_chunk(chunk))
+        return total
+    with Pool(workers) as pool:
+        # Merged in chunk order, as the serial path does, so float sums and sketch
+        # compactions, and with them the exported rollups, are the same every run
+        for partial in pool.imap(process_chunk, chunks):
+            total.merge(partial)
+    return total
+
+
+def export_rollups(aggregate, filename, level='hour'):
+    header = ['period', 'count'] + [f"{m}_{stat}" for m in METRICS for stat in ('avg', 'min', 'max')]
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in aggregate.rollups(level):
+            writer.writerow([row[0], row[1]] + [round(v, 2) for v in row[2:]])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch analytics over sensor_log.jsonl archives')
+    parser.add_argument('logs', nargs='+', help='sensor_log.jsonl files')
+    parser.add_argument('--workers', type=int, default=None, help='pool size (default: all cores)')
+    parser.add_argument('--chunk-mb', type=float, default=16, help='byte range per task')
+    parser.add_argument('--export', help='write rollups to this CSV file')
+    parser.add_argument('--level', choices=('hour', 'day'), default='day', help='rollup period')
+    parser.add_argument('--json', action='store_true', help='print the analysis as JSON')
+    args = parser.parse_args(argv)
+
+    aggregate = run(args.logs, args.workers, max(1, int(args.chunk_mb * (1 << 20))))
+    analysis = aggregate.analysis()
+    if args.json:
+        print(json.dumps(analysis, indent=2))
+    else:
+        print('\n'.join(analysis['insights']))
+        for metric, p in analysis.get('percentiles', {}).items():
+            if p['p50'] is not None:
+                print(f"{metric}: p5 {p['p5']:.1f}  p50 {p['p50']:.1f}  p95 {p['p95']:.1f}")
+    if args.export:
+        export_rollups(aggregate, args.export, args.level)
+        print(f"Rollups written to {args.export}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
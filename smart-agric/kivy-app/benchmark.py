@@ -0,0 +1,705 @@
+"""Timing benchmarks for the Kivy app's hot paths
+
+Usage: python benchmark.py [name ...]     (no names runs everything)
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__[len('bench_'):]] = func
+    return func
+
+
+def timed(func, repeat=10):
+    """Run func repeat times and return the samples in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    median = samples[len(samples) // 2]
+    print(f"  {label:<34} median {median:8.2f} ms   min {samples[0]:8.2f} ms")
+    return median
+
+
+def graph_image_png(data, graph_type='all', figsize=(8, 5), dpi=80):
+    """The original PNG round-trip path of the last 100 readings, to compare the live path against"""
+    from io import BytesIO
+    from kivy.core.image import Image as CoreImage
+    import graph_render
+
+    plt = graph_render.plt
+    fig, ax = plt.subplots(figsize=figsize, facecolor='white')
+    graph_render.draw_graph(ax, data[-100:], graph_type)
+    plt.tight_layout()
+    buf = BytesIO()
+    plt.savefig(buf, format='png', dpi=dpi)
+    buf.seek(0)
+    texture = CoreImage(buf, ext='png').texture
+    plt.close(fig)
+    return texture
+
+
+@benchmark
+def bench_graph_texture(repeat=10):
+    """PNG round trip vs direct Agg buffer blit, per chart"""
+    from kivy.core.window import Window  # noqa: F401  (textures need a GL context)
+    import analytics
+
+    data = analytics.generate_sample_data()
+    for graph_type in ['all', 'temp_moisture', 'humid_moisture']:
+        print(f"{graph_type}:")
+        png = report('png savefig + decode',
+                     timed(lambda: graph_image_png(data, graph_type), repeat))
+        texture = analytics.create_graph_image(data, graph_type)
+        direct = report('agg buffer -> reused texture',
+                        timed(lambda: analytics.create_graph_image(data, graph_type, texture=texture),
+                              repeat))
+        print(f"  speedup {png / direct:.2f}x")
+
+
+@benchmark
+def bench_graph_frame(repeat=50):
+    """Fresh figure per render vs persistent figure updated in place"""
+    import matplotlib.pyplot as plt
+    import graph_render
+    from analytics import generate_sample_data
+
+    data = generate_sample_data() + generate_sample_data()
+
+    def fresh(graph_type, window):
+        fig = graph_render.build_figure(window, graph_type)
+        bytes(fig.canvas.buffer_rgba())
+        plt.close(fig)
+
+    for graph_type in ['all', 'temp_moisture', 'humid_moisture']:
+        print(f"{graph_type}:")
+        graph = graph_render.get_persistent_graph(graph_type)
+        graph.update(data[:100])
+        windows = iter(range(101, 101 + repeat))
+        before = report('fresh figure', timed(lambda: fresh(graph_type, data[:100]), repeat // 5))
+        after = report('persistent set_data',
+                       timed(lambda: graph.update(data[:next(windows)]), repeat))
+        print(f"  speedup {before / after:.1f}x, {graph.full_redraws} full redraws")
+
+
+def month_of_readings(per_hour=60, seed=1):
+    """Random-walk readings covering 30 days, for long-range chart benchmarks"""
+    import random
+    rng = random.Random(seed)
+    moisture, temp, humid = 60.0, 25.0, 60.0
+    data = []
+    for _ in range(30 * 24 * per_hour):
+        moisture = min(100, max(0, moisture + rng.gauss(0, 1.5)))
+        temp = min(45, max(5, temp + rng.gauss(0, 0.3)))
+        humid = min(100, max(10, humid + rng.gauss(0, 1)))
+        data.append({'moisture': moisture, 'temperature': temp, 'humidity': humid})
+    return data
+
+
+@benchmark
+def bench_downsample(repeat=3):
+    """Month-long chart, every reading vs LTTB to pixel width, with pixel error"""
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import graph_render
+
+    data = month_of_readings()
+    print(f"{len(data)} readings")
+
+    def render(graph_type, downsample):
+        fig = graph_render.build_figure(data, graph_type, downsample=downsample)
+        pixels = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(np.int16)
+        plt.close(fig)
+        return pixels
+
+    for graph_type in ['all', 'temp_moisture']:
+        print(f"{graph_type}:")
+        raw = report('every reading', timed(lambda: render(graph_type, False), repeat))
+        small = report('downsampled', timed(lambda: render(graph_type, True), repeat))
+        diff = np.abs(render(graph_type, False) - render(graph_type, True))
+        changed = (diff.max(axis=2) > 32).mean() * 100
+        print(f"  speedup {raw / small:.1f}x, mean abs pixel error {diff.mean():.2f}/255, "
+              f"{changed:.2f}% of pixels visibly different")
+        if graph_type != 'all':
+            # The scatter's outline: topmost and bottommost red pixel in each column
+            def outline(pixels):
+                red = pixels[..., 0] - pixels[..., 1] > 60
+                columns = np.flatnonzero(red.any(axis=0))
+                rows = np.arange(red.shape[0])[:, None]
+                top = np.where(red, rows, red.shape[0]).min(axis=0)[columns]
+                bottom = np.where(red, rows, -1).max(axis=0)[columns]
+                return columns, top, bottom
+            full, small = outline(render(graph_type, False)), outline(render(graph_type, True))
+            same = np.intersect1d(full[0], small[0])
+            error = [np.abs(a[np.searchsorted(full[0], same)] - b[np.searchsorted(small[0], same)]).mean()
+                     for a, b in zip(full[1:], small[1:])]
+            print(f"  outline: {len(same)}/{len(full[0])} columns inked, "
+                  f"top/bottom off by {error[0]:.1f}/{error[1]:.1f} px on average")
+
+
+@benchmark
+def bench_sketch(repeat=5):
+    """Quantile sketches: ingest cost, query merge time and rank error vs exact"""
+    import tempfile
+    from datetime import datetime, timedelta
+    from sensor_log import reading_time
+    from sketch import SketchStore
+
+    data = month_of_readings(per_hour=360)
+    start = datetime(2026, 1, 1)
+    for i, d in enumerate(data):
+        d['timestamp'] = (start + timedelta(seconds=10 * i)).strftime('%Y-%m-%d %H:%M:%S')
+    print(f"{len(data)} readings")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sketches.jsonl')
+        store = SketchStore(path)
+        ingest = timed(lambda: store.extend(data), 1)[0]
+        print(f"  ingest {ingest * 1000 / len(data):.1f} us/reading, "
+              f"{os.path.getsize(path) // 1024} KB on disk")
+        report('construct, file read in background', timed(lambda: SketchStore(path), 1))
+        report('reload from disk', timed(lambda: SketchStore(path).wait(), 1))
+        print(f"  {len(store.hours)} open days with hourly sketches, {len(store.days)} day sketches")
+
+    t0, t1 = reading_time(data[len(data) // 5]), reading_time(data[len(data) * 4 // 5])
+    qs = [0.05, 0.5, 0.95]
+    for metric in ('moisture', 'temperature'):
+        print(f"{metric}:")
+        report('month query', timed(lambda: store.query(metric).quantiles(qs), repeat))
+        report('mid-range query', timed(lambda: store.query(metric, t0, t1).quantiles(qs), repeat))
+        values = sorted(d[metric] for d in data)
+        errors = [abs(sum(v <= x for v in values) / len(values) - q)
+                  for q, x in zip(qs, store.query(metric).quantiles(qs))]
+        print(f"  max rank error {max(errors) * 100:.2f}%")
+
+
+@benchmark
+def bench_batch(days=120):
+    """Batch CLI throughput over an archived log at 1, 2 and 4 workers"""
+    import json
+    import tempfile
+    from datetime import datetime, timedelta
+    import batch
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sensor_log.jsonl')
+        start = datetime(2026, 1, 1)
+        with open(path, 'w') as f:
+            for month in range(days // 30):
+                for i, d in enumerate(month_of_readings(per_hour=120, seed=month)):
+                    d['timestamp'] = (start + timedelta(days=30 * month, seconds=30 * i)
+                                      ).strftime('%Y-%m-%d %H:%M:%S')
+                    f.write(json.dumps(d) + '\n')
+        size = os.path.getsize(path) / (1 << 20)
+        print(f"{size:.0f} MB archive, {os.cpu_count()} cores")
+        chunk = 4 << 20
+        base = None
+        for workers in (1, 2, 4):
+            ms = report(f'{workers} worker(s)', timed(lambda: batch.run([path], workers, chunk), 1))
+            base = base or ms
+            print(f"  {size / ms * 1000:.1f} MB/s, speedup {base / ms:.2f}x")
+
+
+@benchmark
+def bench_generate(devices=10, days=5):
+    """Synthetic generator throughput per storage format"""
+    import tempfile
+    import synthetic
+
+    count = devices * days * 1440
+    for formats in (['jsonl'], ['csv'], ['supabase'], ['sketches'], sorted(synthetic.FORMATS)):
+        with tempfile.TemporaryDirectory() as tmp:
+            def write():
+                writers = synthetic.Writers(formats, tmp)
+                for row in synthetic.generate(devices, days, 60, seed=1):
+                    writers.write(*row)
+                writers.close()
+            ms = report(' + '.join(formats), timed(write, 1))
+            print(f"  {count / ms * 1000:,.0f} readings/s")
+
+
+FACE_READINGS = [80, 75, 70, 50, 45, 40, 20, 25, 22, 65, 90, 85]  # Every 0.5 s, like the serial poll
+
+
+@benchmark
+def bench_face(interval=0.5):
+    """AnimatedFace: Animation objects created, peak running and CPU per frame over a reading sweep"""
+    from kivy.animation import Animation
+    from kivy.clock import Clock
+    from face import AnimatedFace
+
+    created = [0]
+    original_init = Animation.__init__
+
+    def counting_init(self, **kwargs):
+        created[0] += 1
+        original_init(self, **kwargs)
+
+    Animation.__init__ = counting_init
+    try:
+        face = AnimatedFace(size=(800, 480))
+        Clock.tick()
+        created[0] = 0
+        frames, cpu, peak = 0, 0.0, 0
+        for level in FACE_READINGS:
+            face.animate_to_level(level)
+            end = time.perf_counter() + interval
+            while time.perf_counter() < end:
+                start = time.process_time()
+                Clock.tick()  # Sleeps to hold the frame rate, so count CPU time only
+                cpu += time.process_time() - start
+                frames += 1
+                peak = max(peak, len(Animation._instances))
+    finally:
+        Animation.__init__ = original_init
+    print(f"  {len(FACE_READINGS)} readings, {frames} frames")
+    print(f"  Animation objects created {created[0]}, peak running {peak}")
+    print(f"  CPU per frame {cpu / frames * 1000:.2f} ms")
+
+
+@benchmark
+def bench_face_resize(resizes=200):
+    """AnimatedFace: time per resize and canvas instructions alive afterwards"""
+    from kivy.clock import Clock
+    from face import AnimatedFace
+
+    face = AnimatedFace(size=(800, 480))
+    Clock.tick()
+
+    def instructions(group=face.canvas):
+        return sum(1 + instructions(child) if hasattr(child, 'children') else 1
+                   for child in group.children)
+
+    before = instructions()
+    samples = []
+    for i in range(resizes):
+        start = time.process_time()
+        # A layout pass typically moves and resizes the widget more than once per frame
+        face.pos = (i % 7, i % 5)
+        face.size = (800 + i % 50, 480 + i % 30)
+        Clock.tick()  # Sleeps to hold the frame rate, so count CPU time only
+        samples.append((time.process_time() - start) * 1000)
+    report('CPU per resized frame', samples)
+    print(f"  canvas instructions {before} -> {instructions()} after {resizes} resizes")
+
+
+@benchmark
+def bench_face_render(interval=0.5):
+    """AnimatedFace: vector vs sprites per frame, drawn by the software GL renderer (llvmpipe)"""
+    from kivy.base import EventLoop
+    from kivy.clock import Clock
+    from kivy.core.window import Window  # Creates the GL context Fbos need
+    from kivy.graphics.opengl import glFinish
+    from face import AnimatedFace
+
+    Window.size = (800, 480)
+    EventLoop.ensure_window()
+    for sprites in (False, True):
+        start = time.perf_counter()
+        face = AnimatedFace(size=(800, 480), sprites=sprites)
+        Window.add_widget(face)
+        EventLoop.idle()
+        setup = (time.perf_counter() - start) * 1000
+        cpu, frames = [], []
+        for level in FACE_READINGS:
+            face.animate_to_level(level)
+            end = time.perf_counter() + interval
+            while time.perf_counter() < end:
+                start = time.perf_counter()
+                thread = time.thread_time()
+                Clock.tick()
+                Window.dispatch('on_draw')
+                # Python and instruction updates on the UI thread, rasterizing runs in llvmpipe's
+                cpu.append((time.thread_time() - thread) * 1000)
+                glFinish()
+                frames.append((time.perf_counter() - start) * 1000)
+        Window.remove_widget(face)
+        mode = 'sprites' if face.sprites else 'vector'
+        print(f"  {mode}: setup {setup:.1f} ms, {len(frames)} frames")
+        report(f'{mode} UI thread CPU', cpu)
+        report(f'{mode} frame to glFinish', frames)
+
+
+@benchmark
+def bench_idle(seconds=6):
+    """IdleMode: CPU, loop wakeups and frames drawn per second with a steady reading, active vs idle"""
+    from kivy.base import EventLoop
+    from kivy.core.window import Window
+    from face import AnimatedFace
+    from idle import IdleMode
+
+    Window.size = (800, 480)
+    EventLoop.ensure_window()
+    drawn = [0]
+    Window.bind(on_draw=lambda *args: drawn.__setitem__(0, drawn[0] + 1))
+    face = AnimatedFace(size=(800, 480))
+    Window.add_widget(face)
+    idle = IdleMode([face], idle_after=3600)
+    for mode in ('active', 'idle'):
+        if mode == 'idle':
+            idle.enter_idle()
+        drawn[0] = loops = 0
+        cpu = time.process_time()  # Counts llvmpipe's threads too
+        start = last = time.perf_counter()
+        while last - start < seconds:
+            EventLoop.idle()
+            loops += 1
+            now = time.perf_counter()
+            if int(now * 2) != int(last * 2):  # The serial poll, same reading every 0.5 s
+                idle.watch((45, 24, 60))
+                face.animate_to_level(45)
+            last = now
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        print(f"  {mode:6}  CPU {100 * cpu / elapsed:5.1f}%   {loops / elapsed:5.1f} wakeups/s   "
+              f"{drawn[0] / elapsed:5.1f} frames drawn/s")
+    start = time.perf_counter()
+    idle.activity()  # A touch
+    EventLoop.idle()
+    print(f"  wake to first full-rate frame {(time.perf_counter() - start) * 1000:.0f} ms")
+    Window.remove_widget(face)
+
+
+@benchmark
+def bench_ingest(seconds=20):
+    """Serial thread to UI: display latency and handler wakeups, 0.5 s poll vs Clock trigger"""
+    import queue
+    import random
+    from kivy.clock import Clock
+    from newMain import SerialReader
+
+    class Port:
+        """Arduino stand-in: a JSON line every 0.5-2 s, sometimes three back to back"""
+
+        def __init__(self, rng):
+            self.rng = rng
+            self.pending = 0
+            self.sent = {}
+
+        def readline(self):
+            if not self.pending:
+                time.sleep(self.rng.uniform(0.5, 2))
+                self.pending = 3 if self.rng.random() < 0.2 else 1
+            self.pending -= 1
+            n = len(self.sent)
+            self.sent[n] = time.perf_counter()
+            return f'{{"n": {n}, "moisture": 45}}\n'.encode()
+
+    for mode in ('poll', 'trigger'):
+        readings = queue.Queue()
+        port = Port(random.Random(1))
+        latency, wakeups = [], [0]
+
+        def handle(*args):
+            wakeups[0] += 1
+            while True:
+                try:
+                    data = readings.get_nowait()
+                except queue.Empty:
+                    break
+                latency.append((time.perf_counter() - port.sent[data['n']]) * 1000)
+
+        if mode == 'poll':
+            event = Clock.schedule_interval(handle, 0.5)
+            on_data = None
+        else:
+            event = on_data = Clock.create_trigger(handle)
+        reader = SerialReader('stand-in', 9600)
+        reader.serial = port
+        reader.start_reading(readings, on_data)
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            Clock.tick()
+        reader.running = False
+        event.cancel()
+        print(f"  {mode:8} {len(latency)} readings, {wakeups[0] * 60 / seconds:.0f} handler wakeups/min")
+        report(f'{mode} display latency', latency)
+
+
+@benchmark
+def bench_labels(seconds=20, interval=0.5):
+    """Dashboard readouts: texture uploads per minute, Label vs DisplayBinding over GlyphLabel"""
+    import functools
+    from kivy.base import EventLoop
+    from kivy.clock import Clock
+    from kivy.core.window import Window  # Label textures need a GL context
+    from kivy.uix.label import Label
+    import display
+    from synthetic import VirtualDevice
+
+    EventLoop.ensure_window()
+    redraws, busy = [0], [0.0]
+
+    def counted(update):
+        @functools.wraps(update)  # Kivy's triggers look the method up again by name
+        def wrapper(self, *args):
+            start = time.perf_counter()
+            update(self, *args)
+            busy[0] += time.perf_counter() - start
+            redraws[0] += 1
+        return wrapper
+
+    originals = Label.texture_update, display.GlyphLabel.layout
+    Label.texture_update = counted(Label.texture_update)
+    display.GlyphLabel.layout = counted(display.GlyphLabel.layout)
+    try:
+        for mode in ('Label', 'GlyphLabel'):
+            device = VirtualDevice('sensor_1', 1)
+            sizes, formats = ('56sp', '22sp', '22sp'), ('{}%', '{}°C', '{}%')
+            if mode == 'Label':
+                labels = [Label(font_size=size, bold=True) for size in sizes]
+                show = [lambda v, label=label, fmt=fmt: setattr(label, 'text', fmt.format(v))
+                        for label, fmt in zip(labels, formats)]
+            else:
+                labels = [display.GlyphLabel(font_size=size, bold=True) for size in sizes]
+                show = [display.DisplayBinding(label, fmt).update for label, fmt in zip(labels, formats)]
+            warm = display.glyph_uploads
+            t = start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                if time.perf_counter() >= t:
+                    if t - start >= seconds / 2 and warm is not None:
+                        # Steady state from here, the glyphs for most digits are cached
+                        warm, uploads = None, display.glyph_uploads
+                        redraws[0], busy[0] = 0, 0.0
+                    t += interval
+                    moisture, temperature, humidity, _ = device.step(t, interval)
+                    for update, value in zip(show, (moisture, temperature, humidity)):
+                        update(value)
+                Clock.tick()
+            per_minute = 60 / (seconds / 2)
+            if mode == 'Label':
+                uploads = redraws[0]
+            else:
+                uploads = display.glyph_uploads - uploads
+            print(f"  {mode:10} {uploads * per_minute:4.0f} texture uploads/min  "
+                  f"{redraws[0] * per_minute:4.0f} redraws/min  {busy[0] * 1000 * per_minute:6.1f} ms/min")
+        print(f"  {len(display.GLYPHS)} glyph textures cached")
+    finally:
+        Label.texture_update, display.GlyphLabel.layout = originals
+
+
+@benchmark
+def bench_grid(devices=50, seconds=10, interval=0.5):
+    """PlantGrid: frame times with 50 faces on llvmpipe, readings for every device each 0.5 s"""
+    from kivy.base import EventLoop
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.graphics.opengl import glFinish
+    from grid import PlantGrid
+    from synthetic import VirtualDevice
+
+    Window.size = (800, 480)
+    EventLoop.ensure_window()
+    grid = PlantGrid(size=Window.size)
+    Window.add_widget(grid)
+    fleet = [VirtualDevice(f"sensor_{i + 1}", i) for i in range(devices)]
+    for sweep in ('culled', 'scrolling'):
+        frames = []
+        t = start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            now = time.perf_counter()
+            if now >= t:
+                t += interval
+                for device in fleet:
+                    moisture, temperature, humidity, _ = device.step(now * 3600, 3600)
+                    grid.add({'moisture': moisture}, device.device_id)
+            if sweep == 'scrolling':
+                grid.scroll_y = 1 - ((now - start) / seconds * 2) % 1
+            frame = time.perf_counter()
+            Clock.tick()
+            Window.dispatch('on_draw')
+            glFinish()
+            frames.append((time.perf_counter() - frame) * 1000)
+        frames.sort()
+        p95 = frames[int(len(frames) * 0.95)]
+        print(f"  {sweep}: {len(grid.tiles)} faces, {grid.visible_count()} drawn, "
+              f"{1000 / frames[len(frames) // 2]:.0f} fps median, {1000 / p95:.0f} fps at p95")
+        report(f'{sweep} frame to glFinish', frames)
+    Window.remove_widget(grid)
+    grid.blinker.stop()
+
+
+@benchmark
+def bench_profiler(callbacks=50, ticks=2000):
+    """Profiler: overhead per Clock callback and per frame, and the time to dump its trace"""
+    import tempfile
+    from kivy.base import EventLoop
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    import profiler
+
+    EventLoop.ensure_window()
+    work = list(range(100))
+
+    class Ticker:
+        def tick(self, dt):
+            sum(work)
+
+    tickers = [Ticker() for _ in range(callbacks)]
+    path = os.path.join(tempfile.gettempdir(), 'frame_trace.json')
+    medians = {}
+    max_fps, Clock._max_fps = Clock._max_fps, 0  # Time the callbacks, not the sleep to the frame cap
+    for mode in ('off', 'on'):
+        prof = profiler.Profiler(path)
+        if mode == 'on':
+            prof.install(overlay=False)
+        events = [Clock.schedule_interval(ticker.tick, 0) for ticker in tickers]
+        samples = []
+        for _ in range(ticks):
+            start = time.perf_counter()
+            Clock.tick()
+            samples.append((time.perf_counter() - start) * 1000)
+        medians[mode] = report(f"Clock.tick, {callbacks} callbacks, profiler {mode}", samples)
+        for event in events:
+            event.cancel()
+        if mode == 'on':
+            flips = sorted(timed(Window.flip, 200))
+            prof.uninstall()
+            plain = sorted(timed(Window.flip, 200))
+            print(f"  {(flips[100] - plain[100]) * 1000:.2f} us overhead per frame")
+            dump = report(f"dump {len(prof.events)} trace events", timed(prof.dump, 3))
+            print(f"  {os.path.getsize(path) / 1e6:.1f} MB trace, {dump / len(prof.events) * 1000:.2f} us/event")
+    Clock._max_fps = max_fps
+    print(f"  {(medians['on'] - medians['off']) * 1000 / callbacks:.2f} us overhead per callback")
+
+
+@benchmark
+def bench_sparkline(readings=2000, points=120):
+    """Sparkline: cost and transient memory per reading, ring buffer Mesh vs rebuilt Line"""
+    import tracemalloc
+    from collections import deque
+    from kivy.base import EventLoop
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.graphics import Line
+    from kivy.uix.widget import Widget
+    from sparkline import Sparkline
+    from synthetic import VirtualDevice
+
+    EventLoop.ensure_window()
+    max_fps, Clock._max_fps = Clock._max_fps, 0  # Time the redraw, not the sleep to the frame cap
+
+    class LineSparkline(Widget):
+        """The obvious version: a deque, a fresh points list and a Line per reading"""
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.values = deque(maxlen=points)
+            with self.canvas:
+                self.line = Line()
+
+        def add(self, value):
+            self.values.append(value)
+            low, high = min(self.values), max(self.values)
+            span = max(high - low, 5)
+            step = self.width / (points - 1)
+            offset = points - len(self.values)
+            self.line.points = [coord for k, v in enumerate(self.values)
+                                for coord in (self.x + (k + offset) * step,
+                                              self.y + (v - low) * self.height / span)]
+
+    for mode in ('Line', 'Sparkline'):
+        device = VirtualDevice('sensor_1', 1)
+        widget = (LineSparkline if mode == 'Line' else Sparkline)(size=(200, 60))
+        Window.add_widget(widget)
+        values = [device.step(t * 30, 30)[0] for t in range(readings)]
+
+        def reading(value):
+            widget.add(value)
+            Clock.tick()  # Sparkline redraws from its trigger here
+
+        for value in values[:points]:
+            reading(value)  # Fill the buffer first
+        feed = iter(values)
+        samples = timed(lambda: reading(next(feed)), readings - points)
+        report(f"{mode}, per reading incl. Clock.tick", samples)
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        reading(values[0])
+        peak = tracemalloc.get_traced_memory()[1] - start
+        tracemalloc.stop()
+        print(f"  {peak / 1024:.1f} KiB peak Python allocation per reading")
+        Window.remove_widget(widget)
+    Clock._max_fps = max_fps
+
+
+ENTRY_POINTS = ['analytics', 'main', 'newMain']
+
+FIRST_FRAME_DRIVER = """
+import time
+start = time.perf_counter()
+from kivy.clock import Clock
+import {module}
+app = {module}.SmartAgricApp()
+def first_frame(dt):
+    print('FIRST_FRAME', (time.perf_counter() - start) * 1000)
+    app.stop()
+Clock.schedule_once(first_frame, 0)
+app.run()
+"""
+
+
+def import_report(module, top=8):
+    """-X importtime for a fresh interpreter importing module: (total ms, slowest)"""
+    import subprocess
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, env=dict(os.environ, KIVY_NO_CONSOLELOG='1'))
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1:]
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative) / 1000, depth, name.strip()))
+    total = next(ms for ms, depth, name in rows if depth == 0 and name == module)
+    # Direct imports of the entry point, nested ones are in their parent's cumulative time
+    children = sorted(((ms, name) for ms, depth, name in rows if depth == 1), reverse=True)
+    return total, [f"{ms:8.1f} ms  {name}" for ms, name in children[:top]]
+
+
+@benchmark
+def bench_startup():
+    """Import time and time to first frame for each app entry point"""
+    import subprocess
+    for module in ENTRY_POINTS:
+        total, lines = import_report(module)
+        if total is None:
+            print(f"{module}: import failed: {' '.join(lines)}")
+            continue
+        print(f"{module}: import {total:.1f} ms, slowest top-level imports:")
+        for line in lines:
+            print(f"  {line}")
+        result = subprocess.run([sys.executable, '-c', FIRST_FRAME_DRIVER.format(module=module)],
+                                capture_output=True, text=True, timeout=120,
+                                env=dict(os.environ, KIVY_NO_CONSOLELOG='1'))
+        frame = [l for l in result.stdout.splitlines() if l.startswith('FIRST_FRAME')]
+        if frame:
+            print(f"  first frame after {float(frame[0].split()[1]):.0f} ms")
+        else:
+            error = (result.stderr.strip().splitlines() or ['no display?'])[-1]
+            print(f"  first frame not reached: {error}")
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}', choose from: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+        print(f"== {name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
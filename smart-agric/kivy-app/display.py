@@ -0,0 +1,113 @@
+"""Readouts that only touch the GPU when the text on screen actually changes"""
+import time
+
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import Color, Rectangle
+from kivy.properties import BooleanProperty, ColorProperty, NumericProperty, StringProperty
+from kivy.uix.widget import Widget
+
+GLYPHS = {}  # (char, font size px, bold) -> texture, shared by every GlyphLabel
+glyph_uploads = 0
+
+
+def glyph_texture(char, font_size, bold=False):
+    """White texture of one character, rasterized and uploaded the first time it is asked for"""
+    global glyph_uploads
+    key = (char, font_size, bold)
+    texture = GLYPHS.get(key)
+    if texture is None:
+        label = CoreLabel(text=char, font_size=font_size, bold=bold)
+        label.refresh()
+        texture = GLYPHS[key] = label.texture
+        glyph_uploads += 1
+    return texture
+
+
+class GlyphLabel(Widget):
+    """Centered single-line label for short readouts like '45%' or '24°C'
+
+    A Label re-rasterizes its whole string into a new texture on every
+    change. Here each character is a quad over a cached glyph texture, so
+    once the digits have been seen a new value only swaps textures and
+    moves quads. The quads are kept and reused as the text changes length.
+    """
+    text = StringProperty('')
+    font_size = NumericProperty('15sp')
+    bold = BooleanProperty(False)
+    color = ColorProperty([1, 1, 1, 1])
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        with self.canvas:
+            self.tint = Color(rgba=self.color)
+        self.quads = []
+        self.layout_trigger = Clock.create_trigger(self.layout, -1)
+        self.bind(text=self.layout_trigger, font_size=self.layout_trigger, bold=self.layout_trigger,
+                  pos=self.layout_trigger, size=self.layout_trigger, color=self.update_color)
+        self.layout()
+
+    def update_color(self, *args):
+        self.tint.rgba = self.color
+
+    def layout(self, *args):
+        glyphs = [glyph_texture(char, self.font_size, self.bold) for char in self.text]
+        while len(self.quads) < len(glyphs):
+            quad = Rectangle(size=(0, 0))
+            self.canvas.add(quad)
+            self.quads.append(quad)
+        width = sum(texture.width for texture in glyphs)
+        height = max((texture.height for texture in glyphs), default=0)
+        x = int(self.center_x - width / 2)
+        y = int(self.center_y - height / 2)
+        for quad, texture in zip(self.quads, glyphs):
+            quad.texture = texture
+            quad.pos = (x, y)
+            quad.size = texture.size
+            x += texture.width
+        for quad in self.quads[len(glyphs):]:
+            quad.size = (0, 0)
+
+
+class DisplayBinding:
+    """Format values onto a label, skipping repeats and refreshing at most every min_interval
+
+    A value that formats to what is already on screen is dropped. One that
+    arrives within min_interval of the last refresh is held, and only the
+    newest held value is shown when the interval is up.
+    """
+
+    def __init__(self, label, fmt='{}', min_interval=1.0):
+        self.label = label
+        self.fmt = fmt
+        self.min_interval = min_interval
+        self.pending = None
+        self.shown_at = float('-inf')
+        self.refreshes = 0
+        self.skipped = 0
+
+    def update(self, value):
+        text = self.fmt.format(value)
+        if text == self.label.text:
+            self.pending = None  # Back to what is showing, drop anything held
+            self.skipped += 1
+            return
+        wait = self.shown_at + self.min_interval - time.monotonic()
+        if wait <= 0:
+            self.show(text)
+            return
+        if self.pending is None:
+            Clock.schedule_once(self.flush, wait)
+        else:
+            self.skipped += 1
+        self.pending = text
+
+    def flush(self, *args):
+        if self.pending is not None:
+            self.show(self.pending)
+
+    def show(self, text):
+        self.pending = None
+        self.label.text = text
+        self.shown_at = time.monotonic()
+        self.refreshes += 1
@@ -0,0 +1,147 @@
+"""Downsampling helpers so long histories can be charted at screen resolution"""
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets: reduce a series to `threshold` points
+
+    Keeps the first and last point, then from each bucket picks the point that
+    forms the largest triangle with the previous pick and the average of the
+    next bucket, which preserves peaks and troughs. xs must be increasing.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_len = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / avg_len
+        avg_y = sum(ys[avg_start:avg_end]) / avg_len
+
+        ax = xs[a]
+        ay = ys[a]
+        max_area = -1
+        next_a = avg_start - 1
+        for j in range(int(i * every) + 1, avg_start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+
+        out_x.append(xs[next_a])
+        out_y.append(ys[next_a])
+        a = next_a
+
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+
+def column_extremes(pairs, columns):
+    """Lowest and highest y in each of `columns` equal-width x columns, for scatter plots
+
+    Scatter x values are not ordered, so LTTB does not apply; binning on x
+    instead keeps every column's outliers, and the extreme columns hold the
+    outliers in x. At most 2 * columns points come back, ordered by x.
+    """
+    n = len(pairs)
+    if columns <= 0 or n <= 2 * columns:
+        return pairs
+    x_min = min(x for x, _ in pairs)
+    width = (max(x for x, _ in pairs) - x_min) / columns or 1
+    low, high = {}, {}
+    for pair in pairs:
+        column = min(int((pair[0] - x_min) / width), columns - 1)
+        if column not in low or pair[1] < low[column][1]:
+            low[column] = pair
+        if column not in high or pair[1] > high[column][1]:
+            high[column] = pair
+    kept = []
+    for column in sorted(low):
+        kept.append(low[column])
+        if high[column] is not low[column]:
+            kept.append(high[column])
+    return kept
+
+
+def envelope(xs, lows, highs, columns=None):
+    """Plot-ready (xs, ys) outline of a series of bucket minimums and maximums
+
+    Used for rollups such as the chart pyramid, where LTTB over the bucket
+    means would average spikes and troughs away. Buckets are merged into
+    `columns` equal-width x columns and each column becomes a vertical
+    stroke from its lowest to its highest value, alternating direction so
+    the line zigzags through the band. With no columns, or no more buckets
+    than columns, every bucket gets its own stroke. xs must be increasing.
+    """
+    n = len(xs)
+    if columns and n > columns and xs[-1] > xs[0]:
+        x_min = xs[0]
+        width = (xs[-1] - x_min) / columns
+        col_xs, col_lows, col_highs = [], [], []
+        last = None
+        for x, low, high in zip(xs, lows, highs):
+            column = min(int((x - x_min) / width), columns - 1)
+            if column != last:
+                col_xs.append(x_min + (column + 0.5) * width)
+                col_lows.append(low)
+                col_highs.append(high)
+                last = column
+            else:
+                if low < col_lows[-1]:
+                    col_lows[-1] = low
+                if high > col_highs[-1]:
+                    col_highs[-1] = high
+        xs, lows, highs = col_xs, col_lows, col_highs
+
+    out_x, out_y = [], []
+    for i, (x, low, high) in enumerate(zip(xs, lows, highs)):
+        first, second = (low, high) if i % 2 == 0 else (high, low)
+        out_x.append(x)
+        out_y.append(first)
+        if high != low:
+            out_x.append(x)
+            out_y.append(second)
+    return out_x, out_y
+
+
+class MinMaxBuckets:
+    """Streaming min/max-per-bucket decimation for plots that only append
+
+    Every `bucket_size` readings collapse into the two points holding the
+    bucket's lowest and highest y (ordered by x), so an append-only plot keeps
+    its peaks and troughs at 2 points per bucket.
+    """
+
+    def __init__(self, bucket_size):
+        self.bucket_size = max(1, int(bucket_size))
+        self.count = 0
+        self.low = None
+        self.high = None
+
+    def push(self, x, y):
+        """Add a point, return the points of the bucket it completed (or [])"""
+        if self.count == 0 or y < self.low[1]:
+            self.low = (x, y)
+        if self.count == 0 or y > self.high[1]:
+            self.high = (x, y)
+        self.count += 1
+        if self.count < self.bucket_size:
+            return []
+        points = self.pending()
+        self.count = 0
+        return points
+
+    def pending(self):
+        """Points of the bucket still filling up"""
+        if self.count == 0:
+            return []
+        if self.low == self.high:
+            return [self.low]
+        return [self.low, self.high] if self.low[0] <= self.high[0] else [self.high, self.low]
@@ -0,0 +1,514 @@
+from collections import OrderedDict
+
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.graphics import (Canvas, ClearBuffers, ClearColor, Color, Ellipse, Fbo,
+                           InstructionGroup, Line, Rectangle, Translate)
+from kivy.properties import BooleanProperty, NumericProperty
+from kivy.uix.widget import Widget
+
+# Bands follow the sensor status: above 60 is WET, above 30 MOIST, else DRY
+EXPRESSIONS = {
+    'happy': {'smile': -0.4, 'mouth_drop': 0.12, 'brow_arch': 0.02, 'brow_tilt': 0,
+              'background': (0.3, 0.95, 0.4, 1), 'cheeks': 0.5, 'tear': 0},
+    'worried': {'smile': 0, 'mouth_drop': 0.15, 'brow_arch': 0, 'brow_tilt': 0.015,
+                'background': (1, 0.95, 0.3, 1), 'cheeks': 0, 'tear': 0},
+    'sad': {'smile': 0.4, 'mouth_drop': 0.12, 'brow_arch': 0, 'brow_tilt': -0.02,
+            'background': (1, 0.4, 0.4, 1), 'cheeks': 0, 'tear': 1},
+}
+TRANSITION = 0.5
+BLINK = 0.16
+MOUTH_POINTS = 20
+BROW_POINTS = 8
+SPRITE_SIZES = 4  # Sizes whose sprites are kept for faces yet to be laid out at them
+
+# Moisture levels where each mood is fully formed, mouth and brows morph linearly in between
+MOOD_STOPS = ((25, 'sad'), (35, 'worried'), (55, 'worried'), (65, 'happy'))
+
+# Unit curves over 0..1, scaled to the widget once per size
+MOUTH_STEPS = [i / (MOUTH_POINTS - 1) for i in range(MOUTH_POINTS)]
+MOUTH_ARCH = [1 - 4 * (p - 0.5) ** 2 for p in MOUTH_STEPS]
+BROW_STEPS = [i / (BROW_POINTS - 1) for i in range(BROW_POINTS)]
+BROW_ARCH = [1 - 4 * (p - 0.5) ** 2 for p in BROW_STEPS]
+
+# (width, height) -> {(expression, eyes shut): Fbo}, faces of one size all look alike
+SPRITES = OrderedDict()
+
+
+def expression_for(level):
+    if level > 60:
+        return 'happy'
+    if level > 30:
+        return 'worried'
+    return 'sad'
+
+
+def mood_blend(level):
+    """(expression, expression, weight) whose blend draws the mouth and brows at a level"""
+    low_level, low = MOOD_STOPS[0]
+    if level <= low_level:
+        return low, low, 0.0
+    for high_level, high in MOOD_STOPS[1:]:
+        if level < high_level:
+            if high == low:
+                break
+            return low, high, (level - low_level) / (high_level - low_level)
+        low_level, low = high_level, high
+    return low, low, 0.0
+
+
+class AnimatedFace(Widget):
+    """Plant face whose expression follows the soil moisture band
+    
+    moisture_level tweens on every reading. Mouth and brows follow it
+    continuously, blended at most once per frame from curves cached for
+    each expression at the current size. Background, cheeks and tear only
+    react when the level crosses into another band, cancelling whatever
+    transition is still running. The canvas is built once; resizing only
+    moves the existing instructions.
+    
+    With sprites=True (set at construction) each expression is rendered once
+    per size, eyes open and shut, into an Fbo. The live canvas is then two
+    textured quads cross-faded by the mood blend plus the tear, for boards
+    where drawing the vector face every frame is too slow. If the Fbos
+    can't be created the face falls back to vectors. Faces of the same size
+    share their sprites, so a grid of them renders each expression once.
+    
+    blinks=False leaves blinking to the owner, which calls blink() itself.
+    level_duration is how long moisture_level takes to reach a new reading.
+    """
+    moisture_level = NumericProperty(50)
+    sprites = BooleanProperty(False)
+    blinks = BooleanProperty(True)
+    level_duration = NumericProperty(1)
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        
+        # Background color (changes based on emotion)
+        self.bg_color = None
+        self.bg_rect = None
+        
+        # Graphics references
+        self.left_eye = None
+        self.right_eye = None
+        self.left_eye_color = None
+        self.right_eye_color = None
+        
+        # Eye highlights (for shine effect)
+        self.left_eye_highlight = None
+        self.right_eye_highlight = None
+        
+        # Eyebrows
+        self.left_brow = None
+        self.right_brow = None
+        self.left_brow_color = None
+        self.right_brow_color = None
+        
+        # Eyelashes
+        self.left_lashes = []
+        self.right_lashes = []
+        
+        # Cheeks
+        self.left_cheek = None
+        self.right_cheek = None
+        self.left_cheek_color = None
+        self.right_cheek_color = None
+        
+        self.mouth_color = None
+        self.mouth = None
+        self.tear = None
+        self.tear_color = None
+        
+        self.is_blinking = False
+        self.original_eye_size = 0
+        self.expression = None
+        self.level_target = self.moisture_level
+        self.curves = {}  # expression -> (mouth, left brow, right brow) points at this size
+        self.blend = ('worried', 'worried', 0.0)  # mood_blend of the level on screen
+        self.sprite_fbos = {}  # (expression, eyes shut) -> Fbo holding that face at this size
+        
+        self.draw_face()
+        
+        self.geometry_trigger = Clock.create_trigger(self.update_geometry, -1)
+        self.bind(moisture_level=self.geometry_trigger)
+        self.bind(moisture_level=self.update_expression)
+        # A layout pass can move and resize the face several times, place it once per frame
+        self.layout_trigger = Clock.create_trigger(self.layout, -1)
+        self.bind(pos=self.layout_trigger, size=self.layout_trigger)
+        
+        self.blink_event = Clock.schedule_interval(self.blink, 3)
+        if not self.blinks:
+            self.blink_event.cancel()
+    
+    def draw_face(self):
+        """Create every instruction once, layout() moves them when the widget changes"""
+        # The vector face, drawn on the canvas or into the sprite Fbos
+        self.body = Canvas()
+        with self.body:
+            # Background fills entire screen
+            self.bg_color = Color(0.85, 0.95, 0.95, 1)  # Light cyan/white
+            self.bg_rect = Rectangle()
+            
+            # Eyebrows
+            self.left_brow_color = Color(0.2, 0.2, 0.2, 1)
+            self.left_brow = Line(points=[], width=5)
+            
+            self.right_brow_color = Color(0.2, 0.2, 0.2, 1)
+            self.right_brow = Line(points=[], width=5)
+            
+            # Left Eye
+            self.left_eye_color = Color(0.1, 0.1, 0.1, 1)
+            self.left_eye = Ellipse()
+            
+            # Left eye highlight (white shine)
+            Color(1, 1, 1, 1)
+            self.left_eye_highlight = Ellipse()
+            
+            # Right Eye
+            self.right_eye_color = Color(0.1, 0.1, 0.1, 1)
+            self.right_eye = Ellipse()
+            
+            # Right eye highlight
+            Color(1, 1, 1, 1)
+            self.right_eye_highlight = Ellipse()
+            
+            # Eyelashes
+            self.draw_eyelashes()
+            
+            # Cheeks
+            self.left_cheek_color = Color(1, 0.7, 0.75, 0)
+            self.left_cheek = Ellipse()
+            
+            self.right_cheek_color = Color(1, 0.7, 0.75, 0)
+            self.right_cheek = Ellipse()
+            
+            # Mouth
+            self.mouth_color = Color(0.2, 0.2, 0.2, 1)
+            self.mouth = Line(points=[], width=4)
+        
+        # Sprite mode: the expressions either side of the level, the upper one faded in
+        self.sprite_group = InstructionGroup()
+        self.sprite_group.add(Color(1, 1, 1, 1))
+        self.sprite_low = Rectangle()
+        self.sprite_group.add(self.sprite_low)
+        self.sprite_color = Color(1, 1, 1, 0)
+        self.sprite_group.add(self.sprite_color)
+        self.sprite_high = Rectangle()
+        self.sprite_group.add(self.sprite_high)
+        
+        self.canvas.add(self.sprite_group if self.sprites else self.body)
+        with self.canvas:
+            # Tear
+            self.tear_color = Color(0.3, 0.6, 1, 0)
+            self.tear = Ellipse()
+        
+        self.layout()
+        # New instructions start out at the current expression, no transition
+        self.set_expression(self.expression or expression_for(self.moisture_level), animate=False)
+    
+    def draw_eyelashes(self):
+        """Create four lashes per eye, layout() gives them their points"""
+        Color(0.1, 0.1, 0.1, 1)
+        self.left_lashes = [Line(points=[], width=2.5) for _ in range(4)]
+        Color(0.1, 0.1, 0.1, 1)
+        self.right_lashes = [Line(points=[], width=2.5) for _ in range(4)]
+    
+    def layout(self, *args):
+        """Fit the existing instructions to pos and size without allocating new ones
+        
+        Instructions are moved in place rather than scaled by a transform: x
+        and y follow width and height independently, and a non-uniform scale
+        would squash the round eyes and line widths.
+        """
+        self.bg_rect.pos = self.sprite_low.pos = self.sprite_high.pos = self.pos
+        self.bg_rect.size = self.sprite_low.size = self.sprite_high.size = self.size
+        
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        
+        # Eye size based on screen
+        self.original_eye_size = min(self.width, self.height) * 0.12
+        eye_size = self.original_eye_size
+        
+        # Eye spacing
+        eye_spacing = self.width * 0.15
+        eye_y = center_y + self.height * 0.08 - eye_size/2
+        
+        # A blink in flight would tween back to the old positions
+        for instruction in (self.left_eye, self.right_eye,
+                            self.left_eye_highlight, self.right_eye_highlight):
+            Animation.cancel_all(instruction)
+        self.is_blinking = False
+        
+        for eye, highlight, eye_x in ((self.left_eye, self.left_eye_highlight, center_x - eye_spacing),
+                                      (self.right_eye, self.right_eye_highlight, center_x + eye_spacing)):
+            eye.pos = (eye_x - eye_size/2, eye_y)
+            eye.size = (eye_size, eye_size)
+            # White shine
+            highlight.pos = (eye_x - eye_size/2 + eye_size * 0.3, eye_y + eye_size * 0.3)
+            highlight.size = (eye_size * 0.35, eye_size * 0.35)
+        
+        # Eyelashes fan out from the top of each eye
+        lash_length = eye_size * 0.6
+        lash_y = eye_y + eye_size
+        for lashes, eye_x, lean in ((self.left_lashes, center_x - eye_spacing, -1),
+                                    (self.right_lashes, center_x + eye_spacing, 1)):
+            for i, lash in enumerate(lashes):
+                offset_x = (i - 1.5) * eye_size * 0.25
+                angle_offset = (i - 1.5) * 0.15
+                lash.points = [eye_x + offset_x, lash_y,
+                               eye_x + offset_x + lean * lash_length * angle_offset,
+                               lash_y + lash_length]
+        
+        # Cheeks
+        cheek_size = self.width * 0.08
+        cheek_y = center_y - self.height * 0.05 - cheek_size/2
+        self.left_cheek.pos = (center_x - self.width * 0.25 - cheek_size/2, cheek_y)
+        self.right_cheek.pos = (center_x + self.width * 0.25 - cheek_size/2, cheek_y)
+        self.left_cheek.size = self.right_cheek.size = (cheek_size, cheek_size * 0.7)
+        
+        # Tear restarts its fall from the new eye position
+        Animation.cancel_all(self.tear)
+        self.tear.size = (self.width * 0.02, self.height * 0.04)
+        if self.expression == 'sad':
+            self.drop_tear()
+        else:
+            self.tear.pos = (center_x + eye_spacing + eye_size * 0.6, center_y)
+        
+        self.curves = {name: self.expression_curves(EXPRESSIONS[name]) for name in EXPRESSIONS}
+        if self.sprites:
+            self.render_sprites()
+        self.update_geometry()
+    
+    def render_sprites(self):
+        """Draw every expression, eyes open and shut, into an Fbo at the current size"""
+        size = (max(1, int(self.width)), max(1, int(self.height)))
+        fbos = SPRITES.get(size)
+        if fbos is not None:
+            SPRITES.move_to_end(size)
+            self.sprite_fbos = fbos
+            return
+        fbos = {}
+        try:
+            for expression, target in EXPRESSIONS.items():
+                self.bg_color.rgba = target['background']
+                self.left_cheek_color.a = self.right_cheek_color.a = target['cheeks']
+                for line, points in zip((self.mouth, self.left_brow, self.right_brow),
+                                        self.curves[expression]):
+                    line.points = points
+                for shut in (False, True):
+                    self.pose_eyes(shut)
+                    fbo = fbos[expression, shut] = Fbo(size=size)
+                    with fbo:
+                        ClearColor(0, 0, 0, 0)
+                        ClearBuffers()
+                        Translate(-self.x, -self.y)
+                    fbo.add(self.body)
+                    fbo.draw()
+                    fbo.remove(self.body)
+        except Exception as e:
+            print(f"Face sprites unavailable, drawing vectors: {e}")
+            self.sprites = False
+            self.sprite_fbos = {}
+            self.canvas.insert(self.canvas.indexof(self.sprite_group), self.body)
+            self.canvas.remove(self.sprite_group)
+            self.set_expression(self.expression or expression_for(self.moisture_level), animate=False)
+            return
+        finally:
+            self.pose_eyes(False)
+        self.sprite_fbos = SPRITES[size] = fbos
+        while len(SPRITES) > SPRITE_SIZES:
+            SPRITES.popitem(last=False)
+    
+    def pose_eyes(self, shut):
+        """Open the eyes, or close them to a slit as at the middle of a blink"""
+        eye_size = self.original_eye_size
+        for eye, highlight in ((self.left_eye, self.left_eye_highlight),
+                               (self.right_eye, self.right_eye_highlight)):
+            x = highlight.pos[0] - eye_size * 0.3
+            y = highlight.pos[1] - eye_size * 0.3
+            eye.pos = (x, y + eye_size/2 if shut else y)
+            eye.size = (eye_size, 3 if shut else eye_size)
+            highlight.size = (0, 0) if shut else (eye_size * 0.35, eye_size * 0.35)
+    
+    def show_sprites(self, *args):
+        low, high, weight = self.blend
+        self.sprite_low.texture = self.sprite_fbos[low, self.is_blinking].texture
+        self.sprite_high.texture = self.sprite_fbos[high, self.is_blinking].texture
+        self.sprite_color.a = weight
+        # An invisible full-size quad still costs a full-screen fill
+        self.sprite_high.size = self.size if weight else (0, 0)
+    
+    def end_blink(self, *args):
+        self.is_blinking = False
+        if self.sprites:
+            self.show_sprites()
+    
+    def blink(self, dt):
+        if self.is_blinking:
+            return
+        
+        self.is_blinking = True
+        if self.sprites:
+            # Swap to the eyes-shut sprites rather than tweening four ellipses
+            self.show_sprites()
+            Clock.schedule_once(self.end_blink, BLINK)
+            return
+        
+        left_eye_x, left_eye_y = self.left_eye.pos
+        right_eye_x, right_eye_y = self.right_eye.pos
+        left_high_x, left_high_y = self.left_eye_highlight.pos
+        right_high_x, right_high_y = self.right_eye_highlight.pos
+        
+        # Close eyes
+        close_anim = Animation(
+            size=(self.original_eye_size, 3),
+            pos=(left_eye_x, left_eye_y + self.original_eye_size/2),
+            duration=0.08
+        )
+        close_anim2 = Animation(
+            size=(self.original_eye_size, 3),
+            pos=(right_eye_x, right_eye_y + self.original_eye_size/2),
+            duration=0.08
+        )
+        
+        # Hide highlights during blink
+        hide_high = Animation(size=(0, 0), duration=0.08)
+        hide_high2 = Animation(size=(0, 0), duration=0.08)
+        
+        # Open eyes
+        open_anim = Animation(
+            size=(self.original_eye_size, self.original_eye_size),
+            pos=(left_eye_x, left_eye_y),
+            duration=0.08
+        )
+        open_anim2 = Animation(
+            size=(self.original_eye_size, self.original_eye_size),
+            pos=(right_eye_x, right_eye_y),
+            duration=0.08
+        )
+        
+        # Show highlights
+        show_high = Animation(
+            size=(self.original_eye_size * 0.35, self.original_eye_size * 0.35),
+            duration=0.08
+        )
+        show_high2 = Animation(
+            size=(self.original_eye_size * 0.35, self.original_eye_size * 0.35),
+            duration=0.08
+        )
+        
+        sequence = close_anim + open_anim
+        sequence2 = close_anim2 + open_anim2
+        high_seq = hide_high + show_high
+        high_seq2 = hide_high2 + show_high2
+        
+        sequence.bind(on_complete=self.end_blink)
+        
+        sequence.start(self.left_eye)
+        sequence2.start(self.right_eye)
+        high_seq.start(self.left_eye_highlight)
+        high_seq2.start(self.right_eye_highlight)
+    
+    def update_expression(self, *args):
+        """Runs on every moisture_level step, but only acts when the band changes"""
+        expression = expression_for(self.moisture_level)
+        if expression != self.expression:
+            self.set_expression(expression)
+    
+    def set_expression(self, expression, animate=True):
+        """Transition to an expression, replacing any transition still in flight"""
+        target = EXPRESSIONS[expression]
+        self.expression = expression
+        
+        for instruction in (self.bg_color, self.left_cheek_color, self.right_cheek_color,
+                            self.tear_color, self.tear):
+            Animation.cancel_all(instruction)
+        
+        if not animate:
+            self.bg_color.rgba = target['background']
+            self.left_cheek_color.a = self.right_cheek_color.a = target['cheeks']
+            self.tear_color.a = target['tear']
+            return
+        
+        if not self.sprites:
+            # Sprites have these baked in and cross-fade with the mood instead
+            Animation(rgba=target['background'], duration=TRANSITION).start(self.bg_color)
+            cheeks = Animation(a=target['cheeks'], duration=TRANSITION)
+            cheeks.start(self.left_cheek_color)
+            cheeks.start(self.right_cheek_color)
+        Animation(a=target['tear'], duration=TRANSITION).start(self.tear_color)
+        if target['tear']:
+            self.drop_tear()
+    
+    def expression_curves(self, target):
+        """Flat mouth and brow point lists for an expression at the current size"""
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        
+        # Mouth: a parabola whose depth is smile, negative curves up
+        width = self.width * 0.25
+        mouth_x = center_x - width/2
+        mouth_y = center_y - self.height * target['mouth_drop']
+        depth = width * target['smile']
+        mouth = []
+        for step, arch in zip(MOUTH_STEPS, MOUTH_ARCH):
+            mouth += (mouth_x + width * step, mouth_y + depth * arch)
+        
+        # Brows: an arch plus a tilt that lifts (or drops) the inner ends
+        eye_spacing = self.width * 0.15
+        brow_y = center_y + self.height * 0.18
+        brow_width = self.width * 0.08
+        left_x = center_x - eye_spacing - brow_width/2
+        right_x = center_x + eye_spacing - brow_width/2
+        arch_height = self.height * target['brow_arch']
+        tilt = self.height * target['brow_tilt']
+        left, right = [], []
+        for step, arch in zip(BROW_STEPS, BROW_ARCH):
+            y = brow_y + arch_height * arch
+            left += (left_x + brow_width * step, y + tilt * step)
+            right += (right_x + brow_width * step, y + tilt * (1 - step))
+        return mouth, left, right
+    
+    def update_geometry(self, *args):
+        """Blend the cached mouth and brow curves of the moods either side of moisture_level"""
+        low, high, weight = self.blend = mood_blend(self.moisture_level)
+        if self.sprites:
+            self.show_sprites()
+            return
+        lines = (self.mouth, self.left_brow, self.right_brow)
+        if not weight:
+            for line, points in zip(lines, self.curves[low]):
+                line.points = points
+            return
+        for line, start, end in zip(lines, self.curves[low], self.curves[high]):
+            line.points = [a + (b - a) * weight for a, b in zip(start, end)]
+    
+    def drop_tear(self):
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        eye_spacing = self.width * 0.15
+        self.tear.pos = (center_x + eye_spacing + self.original_eye_size * 0.6, center_y)
+        Animation(pos=(self.tear.pos[0], center_y - self.height * 0.2),
+                  duration=1.5, t='in_quad').start(self.tear)
+    
+    def pause(self):
+        """Stop blinking and settle the tear, nothing on the face moves until resume()"""
+        self.blink_event.cancel()
+        Animation.cancel_all(self.tear)
+    
+    def resume(self):
+        if self.blinks:
+            self.blink_event()
+        if self.expression == 'sad':
+            self.drop_tear()
+    
+    def animate_to_level(self, new_level):
+        # Restarting the tween on every repeat of a reading means it never lands
+        if new_level == self.level_target:
+            return
+        self.level_target = new_level
+        Animation.cancel_all(self, 'moisture_level')
+        anim = Animation(moisture_level=new_level, duration=self.level_duration, t='in_out_quad')
+        anim.start(self)
@@ -0,0 +1,292 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import matplotlib.ticker as mticker
+import numpy as np
+from dateutil import tz
+
+from downsample import column_extremes, envelope, lttb
+
+# Reading timestamps are local wall-clock times, label the date axis in the same zone
+LOCAL_TZ = tz.tzlocal()
+
+
+def init_worker():
+    """Warm up matplotlib in a render worker before the first job arrives"""
+    fig, ax = plt.subplots(figsize=(1, 1))
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def graph_series(data, graph_type='all', max_points=None):
+    """Plot-ready (xs, ys) pairs for a graph, downsampled to max_points if given
+
+    The time series go through LTTB so peaks and troughs survive; the scatter
+    graphs keep the lowest and highest moisture in each x pixel column. Rows
+    carrying epoch seconds in 't' (chart pyramid views) are plotted against
+    matplotlib dates, anything else against the reading index. Pyramid rows
+    also carry each bucket's '_min' and '_max', which are drawn as a per
+    pixel column envelope instead of the bucket means.
+    """
+    moistures = [d['moisture'] for d in data]
+    if graph_type == 'all':
+        if data and 't' in data[0]:
+            times = [d['t'] / 86400 for d in data]
+        else:
+            times = list(range(len(data)))
+        if data and 'moisture_min' in data[0]:
+            return [envelope(times, [d[key + '_min'] for d in data],
+                             [d[key + '_max'] for d in data], max_points)
+                    for key in ('moisture', 'temperature', 'humidity')]
+        series = [(times, moistures),
+                  (times, [d['temperature'] for d in data]),
+                  (times, [d['humidity'] for d in data])]
+        if max_points:
+            series = [lttb(xs, ys, max_points) for xs, ys in series]
+        return series
+    
+    key = 'temperature' if graph_type == 'temp_moisture' else 'humidity'
+    pairs = [(d[key], m) for d, m in zip(data, moistures)]
+    if max_points:
+        pairs = column_extremes(pairs, max_points)
+    return [([x for x, _ in pairs], [y for _, y in pairs])]
+
+
+FIT_STYLES = ('k-', 'k--')
+
+
+def fit_line_points(fit, xlim):
+    """Endpoints of a (label, slope, intercept) fit line across the x limits"""
+    _, slope, intercept = fit
+    return list(xlim), [slope * x + intercept for x in xlim]
+
+
+def draw_graph(ax, display_data, graph_type='all', max_points=None, fits=()):
+    """Draw one of the analytics graphs onto an existing axes
+
+    fits are (label, slope, intercept) lines drawn over the scatter graphs.
+    """
+    series = graph_series(display_data, graph_type, max_points)
+    if graph_type == 'all':
+        (mx, my), (tx, ty), (hx, hy) = series
+        ax.plot(mx, my, 'b-', linewidth=2, label='Moisture')
+        ax.plot(tx, ty, 'r-', linewidth=2, label='Temp')
+        ax.plot(hx, hy, 'g-', linewidth=2, label='Humidity')
+        ax.set_title('All Parameters Over Time', fontsize=14, fontweight='bold')
+        ax.legend()
+    elif graph_type == 'temp_moisture':
+        temps, moistures = series[0]
+        ax.scatter(temps, moistures, c='red', s=30, alpha=0.6)
+        ax.set_xlabel('Temperature (°C)', fontsize=12)
+        ax.set_ylabel('Moisture (%)', fontsize=12)
+        ax.set_title('Temperature vs Moisture', fontsize=14, fontweight='bold')
+    else:
+        humids, moistures = series[0]
+        ax.scatter(humids, moistures, c='green', s=30, alpha=0.6)
+        ax.set_xlabel('Humidity (%)', fontsize=12)
+        ax.set_ylabel('Moisture (%)', fontsize=12)
+        ax.set_title('Humidity vs Moisture', fontsize=14, fontweight='bold')
+    
+    if graph_type != 'all' and fits:
+        xlim = ax.get_xlim()
+        for fit, style in zip(fits, FIT_STYLES):
+            ax.plot(*fit_line_points(fit, xlim), style, linewidth=1.5, label=fit[0])
+        ax.set_xlim(xlim)
+        ax.legend(loc='upper right')
+
+    ax.grid(True, alpha=0.3)
+
+
+def build_figure(data, graph_type='all', figsize=(8, 5), dpi=80, downsample=True):
+    """Draw a graph onto a fresh Agg canvas, caller must plt.close() it
+
+    With downsample, each series is reduced to about one point per pixel
+    column, so any history length renders in roughly constant time.
+    """
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi, facecolor='white')
+    draw_graph(ax, data, graph_type, int(figsize[0] * dpi) if downsample else None)
+    fig.tight_layout()
+    fig.canvas.draw()
+    return fig
+
+
+class PersistentGraph:
+    """A figure built once per graph type whose data artists are updated in place
+
+    Title, labels, grid and ticks are rendered once and kept as a background
+    snapshot. An update restores that snapshot and redraws only the data
+    layers, unless the data falls outside the current axis limits, in which
+    case the figure is laid out and snapshotted again.
+    """
+    
+    SERIES = [('moisture', 'b-', 'Moisture'), ('temperature', 'r-', 'Temp'),
+              ('humidity', 'g-', 'Humidity')]
+    
+    def __init__(self, graph_type='all', figsize=(8, 5), dpi=80):
+        self.graph_type = graph_type
+        self.fig, self.ax = plt.subplots(figsize=figsize, dpi=dpi, facecolor='white')
+        self.max_points = int(figsize[0] * dpi)
+        self.background = None
+        self.full_redraws = 0
+        self.dated = False
+        self.fit_lines = []
+        self.fit_legend = None
+        self.fit_labels = ()
+        
+        ax = self.ax
+        if graph_type == 'all':
+            self.artists = [ax.plot([], [], style, linewidth=2, label=label, animated=True)[0]
+                            for _, style, label in self.SERIES]
+            ax.set_title('All Parameters Over Time', fontsize=14, fontweight='bold')
+            self.legend = ax.legend(loc='upper left')
+            self.legend.set_animated(True)
+            self.artists.append(self.legend)
+        else:
+            color = 'red' if graph_type == 'temp_moisture' else 'green'
+            xlabel = 'Temperature (°C)' if graph_type == 'temp_moisture' else 'Humidity (%)'
+            self.artists = [ax.scatter([], [], c=color, s=30, alpha=0.6, animated=True)]
+            self.fit_lines = [ax.plot([], [], style, linewidth=1.5, animated=True)[0]
+                              for style in FIT_STYLES]
+            self.artists.extend(self.fit_lines)
+            ax.set_xlabel(xlabel, fontsize=12)
+            ax.set_ylabel('Moisture (%)', fontsize=12)
+            ax.set_title('Temperature vs Moisture' if graph_type == 'temp_moisture'
+                         else 'Humidity vs Moisture', fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+    
+    def set_data(self, data, xlim=None):
+        """Push new values into the artists, return True if the limits moved"""
+        series = graph_series(data, self.graph_type, self.max_points)
+        if self.graph_type == 'all':
+            for line, (xs, ys) in zip(self.artists, series):
+                line.set_data(xs, ys)
+            changed = self.set_dated(xlim is not None)
+            if xlim is not None:
+                changed = self.fit_view(*xlim) or changed
+            else:
+                changed = self.fit_time(len(data) - 1) or changed
+        else:
+            xs, ys = series[0]
+            self.artists[0].set_offsets(np.column_stack([xs, ys]) if xs
+                                        else np.empty((0, 2)))
+            changed = bool(xs) and self.fit(min(xs), max(xs), self.ax.get_xlim, self.ax.set_xlim)
+        ys = [y for _, values in series for y in values]
+        if ys:
+            changed = self.fit(min(ys), max(ys), self.ax.get_ylim, self.ax.set_ylim) or changed
+        return changed
+    
+    def set_fits(self, fits):
+        """Lay the (label, slope, intercept) fit lines across the current x limits"""
+        if not self.fit_lines:
+            return
+        fits = tuple(fits or ())[:len(self.fit_lines)]
+        xlim = self.ax.get_xlim()
+        for i, line in enumerate(self.fit_lines):
+            if i < len(fits):
+                line.set_data(*fit_line_points(fits[i], xlim))
+                line.set_label(fits[i][0])
+            else:
+                line.set_data([], [])
+        labels = tuple(fit[0] for fit in fits)
+        if labels != self.fit_labels:
+            # Only rebuilt when a rounded r value changes, not on every update
+            self.fit_labels = labels
+            if self.fit_legend is not None:
+                self.fit_legend.remove()
+                self.fit_legend = None
+            if fits:
+                self.fit_legend = self.ax.legend(handles=self.fit_lines[:len(fits)],
+                                                 loc='upper right')
+                self.fit_legend.set_animated(True)
+    
+    def set_dated(self, dated):
+        """Switch the x axis between reading index and dates"""
+        if dated == self.dated:
+            return False
+        self.dated = dated
+        axis = self.ax.xaxis
+        if dated:
+            locator = mdates.AutoDateLocator(tz=LOCAL_TZ)
+            axis.set_major_locator(locator)
+            axis.set_major_formatter(mdates.ConciseDateFormatter(locator, tz=LOCAL_TZ))
+        else:
+            axis.set_major_locator(mticker.AutoLocator())
+            axis.set_major_formatter(mticker.ScalarFormatter())
+        return True
+    
+    def fit_view(self, t0, t1):
+        """Pin the time axis to a pyramid view, given in epoch seconds"""
+        lim = (t0 / 86400, max(t1, t0 + 1) / 86400)
+        if self.background is not None and tuple(self.ax.get_xlim()) == lim:
+            return False
+        self.ax.set_xlim(*lim)
+        return True
+    
+    def fit_time(self, last):
+        """Time axis starts at 0 and grows with 10% headroom so appends rarely relayout"""
+        cur_hi = self.ax.get_xlim()[1]
+        if self.background is not None and cur_hi / 2 <= last <= cur_hi:
+            return False
+        self.ax.set_xlim(0, max(last * 1.1, 1))
+        return True
+    
+    def fit(self, lo, hi, get_lim, set_lim):
+        """Refit limits when data leaves them or shrinks to under half the span"""
+        cur_lo, cur_hi = get_lim()
+        if (self.background is not None and cur_lo <= lo and hi <= cur_hi
+                and (hi - lo) * 2 >= cur_hi - cur_lo):
+            return False
+        pad = max((hi - lo) * 0.1, 1)
+        set_lim(lo - pad, hi + pad)
+        return True
+    
+    def update(self, data, xlim=None, fits=None):
+        """Redraw with new data and return the canvas RGBA buffer
+
+        xlim pins the time axis of the 'all' graph to a view in epoch seconds,
+        fits are (label, slope, intercept) lines for the scatter graphs. The
+        buffer is only valid until the next update.
+        """
+        canvas = self.fig.canvas
+        changed = self.set_data(data, xlim)
+        self.set_fits(fits)
+        if changed or self.background is None:
+            self.fig.tight_layout()
+            canvas.draw()
+            self.background = canvas.copy_from_bbox(self.fig.bbox)
+            self.full_redraws += 1
+        else:
+            canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        if self.fit_legend is not None:
+            self.ax.draw_artist(self.fit_legend)
+        return canvas.buffer_rgba()
+    
+    def size(self):
+        return self.fig.canvas.get_width_height()
+
+
+persistent_graphs = {}
+
+
+def get_persistent_graph(graph_type='all', figsize=(8, 5), dpi=80):
+    key = (graph_type, tuple(figsize), dpi)
+    graph = persistent_graphs.get(key)
+    if graph is None:
+        graph = persistent_graphs[key] = PersistentGraph(graph_type, figsize, dpi)
+    return graph
+
+
+def render_graph(data, graph_type='all', figsize=(8, 5), dpi=80, xlim=None, fits=None):
+    """Render a graph off-screen and return (width, height, rgba bytes)
+
+    Safe to run in a worker process: no Kivy imports, and the result is plain
+    bytes that pickle cheaply back to the UI process. Each worker keeps its
+    own persistent figures, so repeat renders only redraw the data layers.
+    """
+    graph = get_persistent_graph(graph_type, figsize, dpi)
+    pixels = bytes(graph.update(data, xlim, fits))
+    width, height = graph.size()
+    return width, height, pixels
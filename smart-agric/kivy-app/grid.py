@@ -0,0 +1,181 @@
+"""Grid of plant faces, one per device, for benches with dozens of pots
+
+Usage: python grid.py [--devices N] [--log sensor_log.jsonl]
+
+Readings are routed by device_id. With --log the grid follows a
+multi-device sensor log; without it, N simulated devices report every
+couple of seconds.
+"""
+import argparse
+import os
+import random
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+from kivy.uix.scrollview import ScrollView
+
+from display import DisplayBinding, GlyphLabel
+from face import AnimatedFace
+from profiler import install_from_env
+
+TILE_SIZE = (150, 180)
+SPACING = 8
+BLINK_PERIOD = 3  # Seconds between blinks of one face, on average
+
+
+class BlinkScheduler:
+    """One clock event blinks a whole set of faces at random, staggered times
+
+    Replaces the 3 s interval each AnimatedFace would otherwise run, so 50
+    faces cost one wakeup per tick rather than 50 timers.
+    """
+
+    def __init__(self, period=BLINK_PERIOD, tick=0.25, seed=None):
+        self.period = period
+        self.faces = set()
+        self.rng = random.Random(seed)
+        self.event = Clock.schedule_interval(self.tick, tick)
+
+    def tick(self, dt):
+        chance = dt / self.period
+        for face in self.faces:
+            if self.rng.random() < chance:
+                face.blink(dt)
+
+    def stop(self):
+        self.event.cancel()
+
+
+class PlantTile(BoxLayout):
+    """Face, device name and moisture readout for one pot"""
+
+    def __init__(self, device, **kwargs):
+        super().__init__(orientation='vertical', size_hint=(None, None), size=TILE_SIZE, **kwargs)
+        self.device = device
+        # Sprites are shared by every tile since they are all one size
+        self.face = AnimatedFace(sprites=True, blinks=False, size_hint=(1, 0.72))
+        self.add_widget(self.face)
+        self.add_widget(Label(text=device, font_size='13sp', color=(0.2, 0.2, 0.2, 1),
+                              size_hint=(1, 0.12)))
+        self.moisture_label = GlyphLabel(text='--%', font_size='18sp', bold=True,
+                                         color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.16))
+        self.add_widget(self.moisture_label)
+        self.moisture_display = DisplayBinding(self.moisture_label, '{}%')
+        self.culled = False
+
+    def show(self, reading):
+        moisture = reading.get('moisture')
+        if isinstance(moisture, (int, float)):
+            self.face.animate_to_level(moisture)
+            self.moisture_display.update(moisture)
+
+
+class PlantGrid(ScrollView):
+    """Scrollable grid of PlantTiles, created as devices first report
+
+    Tiles scrolled out of view are culled: their canvas is detached from
+    the grid so it is not drawn at all, and their face stops blinking.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.layout = GridLayout(cols=1, spacing=SPACING, padding=SPACING, size_hint_y=None)
+        self.layout.bind(minimum_height=self.layout.setter('height'))
+        self.add_widget(self.layout)
+        self.tiles = {}  # device -> PlantTile
+        self.blinker = BlinkScheduler()
+        self.cull_trigger = Clock.create_trigger(self.cull, -1)
+        self.bind(size=self.update_columns)
+        self.update_columns()
+
+    def update_from_scroll(self, *args):
+        # Scrolling moves the viewport translation, not the tiles
+        super().update_from_scroll(*args)
+        self.cull_trigger()
+
+    def update_columns(self, *args):
+        self.layout.cols = max(1, int((self.width - SPACING) // (TILE_SIZE[0] + SPACING)))
+        self.cull_trigger()
+
+    def add(self, reading, device=None):
+        device = device or reading.get('device_id', 'local')
+        tile = self.tiles.get(device)
+        if tile is None:
+            tile = self.tiles[device] = PlantTile(device)
+            tile.bind(pos=self.cull_trigger)  # The grid places new tiles a layout pass later
+            self.layout.add_widget(tile)
+            self.blinker.faces.add(tile.face)
+        tile.show(reading)
+
+    def extend(self, readings):
+        for reading in readings:
+            self.add(reading)
+
+    def cull(self, *args):
+        left, bottom = self.to_window(self.x, self.y)
+        right, top = left + self.width, bottom + self.height
+        for tile in self.tiles.values():
+            x, y = tile.to_window(tile.x, tile.y)
+            visible = x < right and x + tile.width > left and y < top and y + tile.height > bottom
+            if visible and tile.culled:
+                self.layout.canvas.add(tile.canvas)
+                tile.face.resume()
+                self.blinker.faces.add(tile.face)
+            elif not visible and not tile.culled:
+                self.layout.canvas.remove(tile.canvas)
+                tile.face.pause()
+                self.blinker.faces.discard(tile.face)
+            tile.culled = not visible
+
+    def visible_count(self):
+        return sum(not tile.culled for tile in self.tiles.values())
+
+
+class GridApp(App):
+    def __init__(self, devices=20, log=None, **kwargs):
+        super().__init__(**kwargs)
+        self.devices = devices
+        self.log = log
+
+    def build(self):
+        install_from_env()
+        self.grid = PlantGrid()
+        if self.log:
+            from sensor_log import SensorLogTail
+            self.tail = SensorLogTail(self.log)
+            Clock.schedule_interval(self.read_log, 1)
+        else:
+            from synthetic import VirtualDevice
+            self.fleet = [VirtualDevice(f"sensor_{i + 1}", i) for i in range(self.devices)]
+            self.t = 0
+            Clock.schedule_interval(self.simulate, 2)
+        return self.grid
+
+    def read_log(self, dt):
+        readings, _ = self.tail.read_new()
+        self.grid.extend(readings)
+
+    def simulate(self, dt):
+        # An hour of drying per tick so the faces visibly move
+        self.t += 3600
+        for device in self.fleet:
+            moisture, temperature, humidity, raw = device.step(self.t, 3600)
+            self.grid.add({'moisture': moisture, 'temperature': temperature,
+                           'humidity': humidity}, device.device_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='One plant face per device')
+    parser.add_argument('--devices', type=int, default=20, help='simulated devices without --log')
+    parser.add_argument('--log', help='multi-device sensor log to follow')
+    args = parser.parse_args(argv)
+    GridApp(args.devices, args.log).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Idle mode for wall-mounted displays that can go hours without a new value"""
+from kivy.clock import Clock
+
+IDLE_AFTER = 300  # Seconds without a changed value or a touch
+IDLE_FPS = 4
+
+
+class IdleMode:
+    """Drop the frame rate and pause decoration while nothing changes
+
+    watch() every reading; only a value that differs from the last one
+    counts as activity. After idle_after seconds without activity the frame
+    cap drops to idle_fps and every widget in `pausable` gets pause(). A
+    changed value or activity() (bind it to on_touch_down) restores the
+    frame rate and calls resume() at once, so the wake delay is at most
+    one idle frame.
+
+    Kivy has no public setter for the frame cap once the clock is running,
+    so this adjusts Clock._max_fps, which the clock reads before each sleep.
+    """
+
+    def __init__(self, pausable=(), idle_after=IDLE_AFTER, idle_fps=IDLE_FPS):
+        self.pausable = list(pausable)
+        self.idle_fps = idle_fps
+        self.active_fps = Clock._max_fps
+        self.idle = False
+        self.last_value = None
+        self.idle_trigger = Clock.create_trigger(self.enter_idle, idle_after)
+        self.idle_trigger()
+
+    def watch(self, value):
+        if value != self.last_value:
+            self.last_value = value
+            self.activity()
+
+    def activity(self, *args):
+        self.idle_trigger.cancel()
+        self.idle_trigger()
+        if self.idle:
+            self.idle = False
+            Clock._max_fps = self.active_fps
+            for widget in self.pausable:
+                widget.resume()
+            print("Display awake")
+
+    def enter_idle(self, *args):
+        if self.idle:
+            return
+        self.idle = True
+        self.active_fps = Clock._max_fps
+        Clock._max_fps = self.idle_fps
+        for widget in self.pausable:
+            widget.pause()
+        print(f"Display idle, {self.idle_fps} fps")
@@ -5,10 +5,7 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.widget import Widget
-from kivy.animation import Animation
-from kivy.graphics import Color, Rectangle, Ellipse, Line
-from kivy.properties import NumericProperty
+from kivy.graphics import Color, Rectangle
 from kivy.clock import Clock
 from kivy_garden.graph import Graph, MeshLinePlot
 
@@ -16,11 +13,28 @@ import serial
 import json 
 import time
 import os
+from collections import deque
 from datetime import datetime
+from threading import Thread
+
+from downsample import MinMaxBuckets
+from display import DisplayBinding, GlyphLabel
+from face import AnimatedFace
+from idle import IdleMode
+from profiler import install_from_env, span
+from sensor_log import SensorLogTail, stamp
+from sketch import SketchStore
+from sparkline import Sparkline
+from streaming import (DRY_LEVEL, AnomalyMonitor, CorrelationTracker, DryingForecasts,
+                       summary_bands)
+from synthetic import sample_readings
 
 SERIAL_PORT = '/dev/ttyUSB0'
 BAUD_RATE = 9600
 
+CHART_HISTORY = 43200  # Readings charted, a month at one reading a minute
+CHART_POINTS = 400     # Min/max buckets per chart, about its pixel width
+
 
 def read_sensor_data(ser):
     """Read and parse JSON data from Arduino"""
@@ -36,7 +50,7 @@ def read_sensor_data(ser):
 
 def save_to_csv(data):
     """Save data as JSON to file"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    timestamp = data.get('timestamp') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     try:
         log_entry = {
@@ -77,29 +91,8 @@ def load_sensor_data(filename='sensor_log.jsonl'):
 
 
 def generate_sample_data():
-    """Generate sample data"""
-    import random
-    from datetime import datetime, timedelta
-    
-    data = []
-    start_time = datetime.now() - timedelta(hours=24)
-    
-    for i in range(100):
-        timestamp = start_time + timedelta(minutes=i * 15)
-        moisture = 40 + random.randint(-20, 40)
-        temp = 25 + random.randint(-5, 10)
-        humidity = 50 + random.randint(-15, 25)
-        
-        data.append({
-            'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            'raw': random.randint(300, 700),
-            'moisture': max(0, min(100, moisture)),
-            'temperature': temp,
-            'humidity': max(0, min(100, humidity)),
-            'status': 'WET' if moisture > 60 else ('MOIST' if moisture > 30 else 'DRY')
-        })
-    
-    return data
+    """A day of synthetic readings at 15 minute intervals, for when there is no sensor log yet"""
+    return sample_readings(100, 900)
 
 
 def analyze_data(data):
@@ -120,23 +113,24 @@ def analyze_data(data):
     avg_temp = sum(temps) / len(temps)
     avg_humidity = sum(humidities) / len(humidities)
     
-    dry_periods = sum(1 for m in moistures if m < 30)
+    dry_periods = sum(1 for m in moistures if m < DRY_LEVEL)
+    moisture, temp, critical = summary_bands(avg_moisture, avg_temp, dry_periods, len(data))
     
     insights = []
     
-    if avg_moisture < 40:
+    if moisture == 'low':
         insights.append(f"WARNING: Low moisture ({avg_moisture:.1f}%). Water more frequently!")
-    elif avg_moisture > 70:
+    elif moisture == 'high':
         insights.append(f"HIGH moisture ({avg_moisture:.1f}%). Reduce watering.")
     else:
         insights.append(f"OPTIMAL moisture ({avg_moisture:.1f}%). Great job!")
     
-    if dry_periods > len(data) * 0.3:
+    if critical:
         insights.append(f"{dry_periods} critical dry periods detected!")
     
-    if avg_temp > 30:
+    if temp == 'high':
         insights.append(f"High temperature ({avg_temp:.1f}C). Consider shade.")
-    elif avg_temp < 18:
+    elif temp == 'low':
         insights.append(f"Low temperature ({avg_temp:.1f}C). Protect from cold.")
     
     insights.append(f"Monitored {len(data)} data points.")
@@ -149,310 +143,37 @@ def analyze_data(data):
     }
 
 
-class AnimatedFace(Widget):
-    moisture_level = NumericProperty(50)
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.bg_color = None
-        self.bg_rect = None
-        self.left_eye = None
-        self.right_eye = None
-        self.left_eye_color = None
-        self.right_eye_color = None
-        self.left_eye_highlight = None
-        self.right_eye_highlight = None
-        self.left_brow = None
-        self.right_brow = None
-        self.left_brow_color = None
-        self.right_brow_color = None
-        self.left_lashes = []
-        self.right_lashes = []
-        self.left_cheek = None
-        self.right_cheek = None
-        self.left_cheek_color = None
-        self.right_cheek_color = None
-        self.mouth_color = None
-        self.mouth = None
-        self.tear = None
-        self.tear_color = None
-        self.is_blinking = False
-        self.original_eye_size = 0
-        
-        self.draw_face()
-        self.bind(moisture_level=self.update_expression)
-        self.bind(pos=self.redraw, size=self.redraw)
-        Clock.schedule_interval(self.blink, 3)
-    
-    def draw_face(self):
-        self.canvas.clear()
-        
-        with self.canvas.before:
-            self.bg_color = Color(0.85, 0.95, 0.95, 1)
-            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
-        
-        with self.canvas:
-            center_x = self.x + self.width / 2
-            center_y = self.y + self.height / 2
-            self.original_eye_size = min(self.width, self.height) * 0.12
-            eye_size = self.original_eye_size
-            eye_spacing = self.width * 0.15
-            
-            self.left_brow_color = Color(0.2, 0.2, 0.2, 1)
-            self.left_brow = Line(points=[], width=5)
-            self.right_brow_color = Color(0.2, 0.2, 0.2, 1)
-            self.right_brow = Line(points=[], width=5)
-            
-            self.left_eye_color = Color(0.1, 0.1, 0.1, 1)
-            self.left_eye = Ellipse(
-                pos=(center_x - eye_spacing - eye_size/2, 
-                     center_y + self.height * 0.08 - eye_size/2),
-                size=(eye_size, eye_size)
-            )
-            
-            Color(1, 1, 1, 1)
-            self.left_eye_highlight = Ellipse(
-                pos=(center_x - eye_spacing - eye_size/2 + eye_size * 0.3, 
-                     center_y + self.height * 0.08 - eye_size/2 + eye_size * 0.3),
-                size=(eye_size * 0.35, eye_size * 0.35)
-            )
-            
-            self.right_eye_color = Color(0.1, 0.1, 0.1, 1)
-            self.right_eye = Ellipse(
-                pos=(center_x + eye_spacing - eye_size/2, 
-                     center_y + self.height * 0.08 - eye_size/2),
-                size=(eye_size, eye_size)
-            )
-            
-            Color(1, 1, 1, 1)
-            self.right_eye_highlight = Ellipse(
-                pos=(center_x + eye_spacing - eye_size/2 + eye_size * 0.3, 
-                     center_y + self.height * 0.08 - eye_size/2 + eye_size * 0.3),
-                size=(eye_size * 0.35, eye_size * 0.35)
-            )
-            
-            self.draw_eyelashes(center_x, center_y, eye_spacing, eye_size)
-            
-            cheek_size = self.width * 0.08
-            self.left_cheek_color = Color(1, 0.7, 0.75, 0)
-            self.left_cheek = Ellipse(
-                pos=(center_x - self.width * 0.25 - cheek_size/2, 
-                     center_y - self.height * 0.05 - cheek_size/2),
-                size=(cheek_size, cheek_size * 0.7)
-            )
-            
-            self.right_cheek_color = Color(1, 0.7, 0.75, 0)
-            self.right_cheek = Ellipse(
-                pos=(center_x + self.width * 0.25 - cheek_size/2, 
-                     center_y - self.height * 0.05 - cheek_size/2),
-                size=(cheek_size, cheek_size * 0.7)
-            )
-            
-            self.mouth_color = Color(0.2, 0.2, 0.2, 1)
-            self.mouth = Line(points=[], width=4)
-            
-            self.tear_color = Color(0.3, 0.6, 1, 0)
-            self.tear = Ellipse(
-                pos=(center_x + eye_spacing + eye_size * 0.8, center_y),
-                size=(self.width * 0.02, self.height * 0.04)
-            )
-        
-        self.update_expression()
-    
-    def draw_eyelashes(self, center_x, center_y, eye_spacing, eye_size):
-        lash_length = eye_size * 0.6
-        eye_y = center_y + self.height * 0.08 + eye_size/2
-        
-        left_eye_x = center_x - eye_spacing
-        Color(0.1, 0.1, 0.1, 1)
-        for i in range(4):
-            offset_x = (i - 1.5) * eye_size * 0.25
-            angle_offset = (i - 1.5) * 0.15
-            lash = Line(
-                points=[left_eye_x + offset_x, eye_y,
-                       left_eye_x + offset_x - lash_length * angle_offset, 
-                       eye_y + lash_length],
-                width=2.5
-            )
-            self.left_lashes.append(lash)
-        
-        right_eye_x = center_x + eye_spacing
-        Color(0.1, 0.1, 0.1, 1)
-        for i in range(4):
-            offset_x = (i - 1.5) * eye_size * 0.25
-            angle_offset = (i - 1.5) * 0.15
-            lash = Line(
-                points=[right_eye_x + offset_x, eye_y,
-                       right_eye_x + offset_x + lash_length * angle_offset, 
-                       eye_y + lash_length],
-                width=2.5
-            )
-            self.right_lashes.append(lash)
-    
-    def redraw(self, *args):
-        self.draw_face()
-    
-    def blink(self, dt):
-        if self.is_blinking:
-            return
-        
-        self.is_blinking = True
-        
-        left_eye_x, left_eye_y = self.left_eye.pos
-        right_eye_x, right_eye_y = self.right_eye.pos
-        
-        close_anim = Animation(size=(self.original_eye_size, 3),
-                              pos=(left_eye_x, left_eye_y + self.original_eye_size/2),
-                              duration=0.08)
-        close_anim2 = Animation(size=(self.original_eye_size, 3),
-                               pos=(right_eye_x, right_eye_y + self.original_eye_size/2),
-                               duration=0.08)
-        hide_high = Animation(size=(0, 0), duration=0.08)
-        hide_high2 = Animation(size=(0, 0), duration=0.08)
-        
-        open_anim = Animation(size=(self.original_eye_size, self.original_eye_size),
-                             pos=(left_eye_x, left_eye_y), duration=0.08)
-        open_anim2 = Animation(size=(self.original_eye_size, self.original_eye_size),
-                              pos=(right_eye_x, right_eye_y), duration=0.08)
-        show_high = Animation(size=(self.original_eye_size * 0.35, self.original_eye_size * 0.35),
-                             duration=0.08)
-        show_high2 = Animation(size=(self.original_eye_size * 0.35, self.original_eye_size * 0.35),
-                              duration=0.08)
-        
-        sequence = close_anim + open_anim
-        sequence2 = close_anim2 + open_anim2
-        high_seq = hide_high + show_high
-        high_seq2 = hide_high2 + show_high2
-        
-        def reset_blink(*args):
-            self.is_blinking = False
-        sequence.bind(on_complete=reset_blink)
-        
-        sequence.start(self.left_eye)
-        sequence2.start(self.right_eye)
-        high_seq.start(self.left_eye_highlight)
-        high_seq2.start(self.right_eye_highlight)
-    
-    def update_expression(self, *args):
-        center_x = self.x + self.width / 2
-        center_y = self.y + self.height / 2
-        mouth_width = self.width * 0.25
-        
-        if self.moisture_level > 60:
-            self.draw_happy_mouth(center_x, center_y, mouth_width)
-            self.draw_happy_eyebrows(center_x, center_y)
-            self.animate_background_color((0.3, 0.95, 0.4, 1))
-            self.show_cheeks()
-            self.hide_tear()
-        elif self.moisture_level > 30:
-            self.draw_worried_mouth(center_x, center_y, mouth_width)
-            self.draw_worried_eyebrows(center_x, center_y)
-            self.animate_background_color((1, 0.95, 0.3, 1))
-            self.hide_cheeks()
-            self.hide_tear()
-        else:
-            self.draw_sad_mouth(center_x, center_y, mouth_width)
-            self.draw_sad_eyebrows(center_x, center_y)
-            self.animate_background_color((1, 0.4, 0.4, 1))
-            self.hide_cheeks()
-            self.show_tear(center_x, center_y)
-    
-    def animate_background_color(self, target_color):
-        Animation(rgba=target_color, duration=0.3).start(self.bg_color)
-    
-    def draw_happy_eyebrows(self, center_x, center_y):
-        eye_spacing = self.width * 0.15
-        brow_y = center_y + self.height * 0.18
-        brow_width = self.width * 0.08
-        
-        left_points = []
-        for i in range(8):
-            x = center_x - eye_spacing - brow_width/2 + (brow_width * i / 7)
-            progress = i / 7
-            y = brow_y + self.height * 0.02 * (1 - 4 * (progress - 0.5) ** 2)
-            left_points.extend([x, y])
-        self.left_brow.points = left_points
-        
-        right_points = []
-        for i in range(8):
-            x = center_x + eye_spacing - brow_width/2 + (brow_width * i / 7)
-            progress = i / 7
-            y = brow_y + self.height * 0.02 * (1 - 4 * (progress - 0.5) ** 2)
-            right_points.extend([x, y])
-        self.right_brow.points = right_points
-    
-    def draw_worried_eyebrows(self, center_x, center_y):
-        eye_spacing = self.width * 0.15
-        brow_y = center_y + self.height * 0.18
-        brow_width = self.width * 0.08
-        
-        self.left_brow.points = [
-            center_x - eye_spacing - brow_width/2, brow_y,
-            center_x - eye_spacing + brow_width/2, brow_y + self.height * 0.015
-        ]
-        self.right_brow.points = [
-            center_x + eye_spacing - brow_width/2, brow_y + self.height * 0.015,
-            center_x + eye_spacing + brow_width/2, brow_y
-        ]
-    
-    def draw_sad_eyebrows(self, center_x, center_y):
-        eye_spacing = self.width * 0.15
-        brow_y = center_y + self.height * 0.18
-        brow_width = self.width * 0.08
-        
-        self.left_brow.points = [
-            center_x - eye_spacing - brow_width/2, brow_y,
-            center_x - eye_spacing + brow_width/2, brow_y - self.height * 0.02
-        ]
-        self.right_brow.points = [
-            center_x + eye_spacing - brow_width/2, brow_y - self.height * 0.02,
-            center_x + eye_spacing + brow_width/2, brow_y
-        ]
-    
-    def draw_happy_mouth(self, center_x, center_y, width):
-        mouth_y = center_y - self.height * 0.12
-        points = []
-        for i in range(20):
-            x = center_x - width/2 + (width * i / 19)
-            progress = (i / 19) - 0.5
-            y = mouth_y - (width * 0.4) * (1 - 4 * progress * progress)
-            points.extend([x, y])
-        self.mouth.points = points
-    
-    def draw_worried_mouth(self, center_x, center_y, width):
-        mouth_y = center_y - self.height * 0.15
-        self.mouth.points = [center_x - width/2, mouth_y, center_x + width/2, mouth_y]
-    
-    def draw_sad_mouth(self, center_x, center_y, width):
-        mouth_y = center_y - self.height * 0.12
-        points = []
-        for i in range(20):
-            x = center_x - width/2 + (width * i / 19)
-            progress = (i / 19) - 0.5
-            y = mouth_y + (width * 0.4) * (1 - 4 * progress * progress)
-            points.extend([x, y])
-        self.mouth.points = points
-    
-    def show_cheeks(self):
-        Animation(a=0.5, duration=0.5).start(self.left_cheek_color)
-        Animation(a=0.5, duration=0.5).start(self.right_cheek_color)
-    
-    def hide_cheeks(self):
-        Animation(a=0, duration=0.3).start(self.left_cheek_color)
-        Animation(a=0, duration=0.3).start(self.right_cheek_color)
-    
-    def show_tear(self, center_x, center_y):
-        eye_spacing = self.width * 0.15
-        self.tear.pos = (center_x + eye_spacing + self.original_eye_size * 0.6, center_y)
-        Animation(a=1, duration=0.5).start(self.tear_color)
-        Animation(pos=(self.tear.pos[0], self.tear.pos[1] - self.height * 0.2),
-                 duration=1.5, t='in_quad').start(self.tear)
-    
-    def hide_tear(self):
-        Animation(a=0, duration=0.3).start(self.tear_color)
-    
-    def animate_to_level(self, new_level):
-        Animation(moisture_level=new_level, duration=0.3, t='in_out_quad').start(self)
+class WindowExtremes:
+    """Running min/max over the last `size` values, amortized O(1) per value"""
+    
+    def __init__(self, size):
+        self.size = size
+        self.count = 0
+        self.mins = deque()
+        self.maxs = deque()
+    
+    def push(self, value):
+        index = self.count
+        self.count += 1
+        
+        while self.mins and self.mins[-1][1] >= value:
+            self.mins.pop()
+        self.mins.append((index, value))
+        while self.maxs and self.maxs[-1][1] <= value:
+            self.maxs.pop()
+        self.maxs.append((index, value))
+        
+        oldest = self.count - self.size
+        if self.mins[0][0] < oldest:
+            self.mins.popleft()
+        if self.maxs[0][0] < oldest:
+            self.maxs.popleft()
+    
+    def min(self):
+        return self.mins[0][1]
+    
+    def max(self):
+        return self.maxs[0][1]
 
 
 class MainMonitorScreen(Screen):
@@ -461,7 +182,7 @@ class MainMonitorScreen(Screen):
         
         layout = FloatLayout()
         
-        self.face = AnimatedFace(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0})
+        self.face = AnimatedFace(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0}, level_duration=0.3)
         layout.add_widget(self.face)
         
         # Analytics button
@@ -482,8 +203,8 @@ class MainMonitorScreen(Screen):
                                size=(80, 100), pos_hint={'x': 0.02, 'top': 0.98})
         temp_layout.add_widget(Label(text='T', font_size='50sp', bold=True,
                                     color=(0.9, 0.3, 0.2, 1), size_hint=(1, 0.6)))
-        self.temp_value = Label(text='--C', font_size='22sp', bold=True,
-                               color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
+        self.temp_value = GlyphLabel(text='--C', font_size='22sp', bold=True,
+                                     color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
         temp_layout.add_widget(self.temp_value)
         layout.add_widget(temp_layout)
         
@@ -492,23 +213,46 @@ class MainMonitorScreen(Screen):
                                 size=(80, 100), pos_hint={'right': 0.98, 'top': 0.98})
         humid_layout.add_widget(Label(text='H', font_size='50sp', bold=True,
                                      color=(0.2, 0.5, 0.9, 1), size_hint=(1, 0.6)))
-        self.humidity_value = Label(text='--%', font_size='22sp', bold=True,
-                                   color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
+        self.humidity_value = GlyphLabel(text='--%', font_size='22sp', bold=True,
+                                         color=(0.2, 0.2, 0.2, 1), size_hint=(1, 0.4))
         humid_layout.add_widget(self.humidity_value)
         layout.add_widget(humid_layout)
         
         # Moisture
-        self.moisture_label = Label(text='--%', font_size='56sp', bold=True,
-                                   color=(0.2, 0.2, 0.2, 1), size_hint=(None, None),
-                                   size=(200, 100), pos_hint={'center_x': 0.5, 'y': 0.02})
+        self.moisture_label = GlyphLabel(text='--%', font_size='56sp', bold=True,
+                                         color=(0.2, 0.2, 0.2, 1), size_hint=(None, None),
+                                         size=(200, 100), pos_hint={'center_x': 0.5, 'y': 0.02})
         layout.add_widget(self.moisture_label)
         
+        # Readouts redraw only when the shown string changes, at most once a second
+        self.moisture_display = DisplayBinding(self.moisture_label, '{}%')
+        self.temp_display = DisplayBinding(self.temp_value, '{}C')
+        self.humidity_display = DisplayBinding(self.humidity_value, '{}%')
+        
+        self.eta_label = Label(text='', font_size='18sp', color=(0.3, 0.3, 0.3, 1),
+                               size_hint=(None, None), size=(300, 40),
+                               pos_hint={'center_x': 0.5, 'y': 0.14})
+        layout.add_widget(self.eta_label)
+        self.forecasts = DryingForecasts()
+        
+        # Recent moisture trend, without a trip to the analytics screen
+        self.sparkline = Sparkline(size_hint=(None, None), size=(200, 60),
+                                   pos_hint={'right': 0.98, 'y': 0.04})
+        layout.add_widget(self.sparkline)
+        
         self.add_widget(layout)
         
-        # Serial connection
+        # Low frame rate and no blinking when the readings stop changing, a touch wakes it
+        self.idle = IdleMode([self.face])
+        self.bind(on_touch_down=self.idle.activity)
+        
+        # Serial connection, read on a thread that wakes read_sensor once per frame at most
         self.ser = None
+        self.readings = deque()
+        self.sensor_trigger = Clock.create_trigger(self.read_sensor)
         self.init_serial()
-        Clock.schedule_interval(self.read_sensor, 0.5)
+        if self.ser is None:
+            Clock.schedule_interval(self.simulate_data, 0.5)
     
     def init_serial(self):
         try:
@@ -516,34 +260,56 @@ class MainMonitorScreen(Screen):
             time.sleep(2)
             self.ser.flushInput()
             print("Connected!")
+            Thread(target=self.read_loop, daemon=True).start()
         except:
             print("Simulation mode")
             self.ser = None
     
+    def read_loop(self):
+        """Blocking serial reads, off the UI thread"""
+        while self.ser is not None:
+            data = read_sensor_data(self.ser)
+            if data:
+                self.readings.append(stamp(data))
+                self.sensor_trigger()
+            else:
+                time.sleep(0.1)  # readline blocks, only a failing port returns at once
+    
     def read_sensor(self, dt):
-        if self.ser is None:
-            self.simulate_data(dt)
+        """Save every reading that landed since the last frame and show the newest"""
+        latest = None
+        while self.readings:
+            data = self.readings.popleft()
+            try:
+                self.forecasts.add(data)
+                with span('save_to_csv'):
+                    save_to_csv(data)
+                self.sparkline.add(data['moisture'])
+                latest = data
+            except:
+                pass
+        if latest is None:
             return
-        
         try:
-            data = read_sensor_data(self.ser)
-            if data:
-                moisture = data['moisture']
-                self.face.animate_to_level(moisture)
-                self.moisture_label.text = str(moisture) + '%'
-                self.temp_value.text = str(int(data.get('temperature', 0))) + 'C'
-                self.humidity_value.text = str(int(data.get('humidity', 0))) + '%'
-                save_to_csv(data)
+            moisture = latest['moisture']
+            self.idle.watch((moisture, latest.get('temperature'), latest.get('humidity')))
+            self.face.animate_to_level(moisture)
+            self.moisture_display.update(moisture)
+            self.temp_display.update(int(latest.get('temperature', 0)))
+            self.humidity_display.update(int(latest.get('humidity', 0)))
+            self.eta_label.text = self.forecasts.summary()
         except:
             pass
     
     def simulate_data(self, dt):
         import random
         m = random.randint(20, 95)
+        self.idle.watch(m)
         self.face.animate_to_level(m)
-        self.moisture_label.text = str(m) + '%'
-        self.temp_value.text = str(random.randint(18, 30)) + 'C'
-        self.humidity_value.text = str(random.randint(40, 80)) + '%'
+        self.moisture_display.update(m)
+        self.sparkline.add(m)
+        self.temp_display.update(random.randint(18, 30))
+        self.humidity_display.update(random.randint(40, 80))
     
     def go_to_analytics(self, *args):
         self.manager.transition = SlideTransition(direction='left')
@@ -551,7 +317,8 @@ class MainMonitorScreen(Screen):
     
     def on_stop(self):
         if self.ser:
-            self.ser.close()
+            ser, self.ser = self.ser, None  # Ends read_loop
+            ser.close()
 
 
 class AnalyticsScreen(Screen):
@@ -621,6 +388,39 @@ class AnalyticsScreen(Screen):
             else:
                 self.graph3 = graph
         
+        # Plots are created once and their points updated in place on refresh
+        self.moisture_plot = MeshLinePlot(color=[0.2, 0.6, 0.9, 1])
+        self.temp_plot = MeshLinePlot(color=[0.9, 0.4, 0.2, 1])
+        self.humid_plot = MeshLinePlot(color=[0.4, 0.8, 0.4, 1])
+        self.temp_moisture_plot = MeshLinePlot(color=[0.9, 0.4, 0.2, 1])
+        self.humid_moisture_plot = MeshLinePlot(color=[0.4, 0.8, 0.4, 1])
+        self.graph1.add_plot(self.moisture_plot)
+        self.graph1.add_plot(self.temp_plot)
+        self.graph1.add_plot(self.humid_plot)
+        self.graph2.add_plot(self.temp_moisture_plot)
+        self.graph3.add_plot(self.humid_moisture_plot)
+        self.plots = [self.moisture_plot, self.temp_plot, self.humid_plot,
+                      self.temp_moisture_plot, self.humid_moisture_plot]
+        # Full-history and rolling-window fit lines over the scatter plots
+        self.fit_plots = {}
+        for graph_type, graph in (('temp_moisture', self.graph2), ('humid_moisture', self.graph3)):
+            lines = [MeshLinePlot(color=[0.1, 0.1, 0.1, 1]), MeshLinePlot(color=[0.5, 0.5, 0.5, 1])]
+            for line in lines:
+                graph.add_plot(line)
+            self.fit_plots[graph_type] = (graph, lines)
+        self.buckets = {}
+        self.pending = {}
+        self.bucket_ends = {}  # plot -> deque of (last reading seq, points) per completed bucket
+        
+        self.log_tail = SensorLogTail()
+        self.monitor = AnomalyMonitor()
+        self.forecasts = DryingForecasts()
+        self.correlations = CorrelationTracker()
+        self.sketches = SketchStore()
+        self.readings = []
+        self.showing_sample = False
+        self.reset_window()
+        
         # Insights
         insights_box = BoxLayout(orientation='vertical', size_hint=(1, None), padding=15, spacing=10)
         insights_box.bind(minimum_height=insights_box.setter('height'))
@@ -662,52 +462,143 @@ class AnalyticsScreen(Screen):
         card.value_label = value_label
         return card
     
+    def reset_window(self):
+        self.seq = 0
+        self.temp_extremes = WindowExtremes(CHART_HISTORY)
+        self.reset_plots(1)
+    
+    def reset_plots(self, bucket_size):
+        self.bucket_size = bucket_size
+        for plot in self.plots:
+            plot.points = []
+            self.buckets[plot] = MinMaxBuckets(bucket_size)
+            self.pending[plot] = 0
+            self.bucket_ends[plot] = deque()
+    
+    def reset_readings(self):
+        """Drop every reading and the trackers and plots built from them"""
+        self.readings = []
+        self.monitor = AnomalyMonitor()
+        self.forecasts = DryingForecasts()
+        self.correlations = CorrelationTracker()
+        self.showing_sample = False
+        self.reset_window()
+    
     def load_data(self, *args):
-        data = load_sensor_data()
+        new_data, restarted = self.log_tail.read_new()
+        # Real readings replace the synthetic sample rather than follow it
+        if restarted or (self.showing_sample and new_data):
+            self.reset_readings()
+        sample = not self.readings and not new_data
+        if sample:
+            print("No sensor readings logged yet, showing synthetic sample data")
+            new_data = generate_sample_data()
+            self.showing_sample = True
+        self.readings.extend(new_data)
+        self.monitor.extend(new_data)
+        self.forecasts.extend(new_data)
+        self.correlations.extend(new_data)
+        if not sample:
+            self.sketches.extend(new_data)  # Sample data must not end up in the persisted sketches
+        data = self.readings
         analysis = analyze_data(data)
         
         self.moisture_card.value_label.text = f"{analysis['avg_moisture']:.1f}%"
         self.temp_card.value_label.text = f"{analysis['avg_temp']:.1f}C"
         self.humid_card.value_label.text = f"{analysis['avg_humidity']:.1f}%"
         
-        display_data = data[-100:]
-        
-        # Graph 1: All parameters
-        moisture_plot = MeshLinePlot(color=[0.2, 0.6, 0.9, 1])
-        moisture_plot.points = [(i, d['moisture']) for i, d in enumerate(display_data)]
-        
-        temp_plot = MeshLinePlot(color=[0.9, 0.4, 0.2, 1])
-        temp_plot.points = [(i, d['temperature'] * 2) for i, d in enumerate(display_data)]
-        
-        humid_plot = MeshLinePlot(color=[0.4, 0.8, 0.4, 1])
-        humid_plot.points = [(i, d['humidity']) for i, d in enumerate(display_data)]
-        
-        for p in list(self.graph1.plots):
-            self.graph1.remove_plot(p)
-        self.graph1.add_plot(moisture_plot)
-        self.graph1.add_plot(temp_plot)
-        self.graph1.add_plot(humid_plot)
-        
-        # Graph 2: Temp vs Moisture
-        temp_moisture_plot = MeshLinePlot(color=[0.9, 0.4, 0.2, 1])
-        temp_moisture_plot.points = [(d['temperature'], d['moisture']) for d in display_data]
-        
-        for p in list(self.graph2.plots):
-            self.graph2.remove_plot(p)
-        self.graph2.xmin = min(d['temperature'] for d in display_data) - 2
-        self.graph2.xmax = max(d['temperature'] for d in display_data) + 2
-        self.graph2.add_plot(temp_moisture_plot)
-        
-        # Graph 3: Humidity vs Moisture
-        humid_moisture_plot = MeshLinePlot(color=[0.4, 0.8, 0.4, 1])
-        humid_moisture_plot.points = [(d['humidity'], d['moisture']) for d in display_data]
-        
-        for p in list(self.graph3.plots):
-            self.graph3.remove_plot(p)
-        self.graph3.add_plot(humid_moisture_plot)
+        self.append_points(new_data)
+        self.update_fit_lines()
         
         # Insights
-        self.insights_label.text = '\n\n'.join(analysis['insights'])
+        self.insights_label.text = '\n\n'.join(analysis['insights'] + self.forecasts.insights()
+                                               + self.sketches.insights() + self.correlations.insights()
+                                               + self.monitor.insights())
+    
+    def append_points(self, new_data):
+        """Bucket new readings onto the plots and trim points that left the history"""
+        if not new_data:
+            return
+        
+        self.seq += len(new_data)
+        new_data = new_data[-CHART_HISTORY:]
+        for d in new_data:
+            self.temp_extremes.push(d['temperature'])
+        
+        # Double the bucket size whenever the charted span outgrows the chart width;
+        # that re-buckets the history, but only log2(CHART_HISTORY) times in total
+        charted = min(self.seq, CHART_HISTORY)
+        bucket_size = self.bucket_size
+        while charted > bucket_size * CHART_POINTS and bucket_size * CHART_POINTS < CHART_HISTORY:
+            bucket_size *= 2
+        if bucket_size != self.bucket_size:
+            history = self.readings[-charted:]
+            self.reset_plots(bucket_size)
+            self.push_points(history, self.seq - len(history))
+        else:
+            self.push_points(new_data, self.seq - len(new_data))
+        self.trim_points()
+        
+        # Graph 1 x axis slides with the reading sequence number
+        self.graph1.xmin = max(0, self.seq - CHART_HISTORY)
+        self.graph1.xmax = max(self.seq, self.graph1.xmin + 1)
+        self.graph1.x_ticks_major = max(1, (self.graph1.xmax - self.graph1.xmin) // 5)
+        
+        # Graph 2 x axis follows the temperature range in the window
+        self.graph2.xmin = self.temp_extremes.min() - 2
+        self.graph2.xmax = self.temp_extremes.max() + 2
+    
+    def update_fit_lines(self):
+        for graph_type, (graph, lines) in self.fit_plots.items():
+            fits = self.correlations.fits(graph_type)
+            for i, line in enumerate(lines):
+                if i < len(fits):
+                    _, slope, intercept = fits[i]
+                    line.points = [(x, slope * x + intercept) for x in (graph.xmin, graph.xmax)]
+                else:
+                    line.points = []
+    
+    def plot_values(self, readings, first_seq):
+        xs = range(first_seq, first_seq + len(readings))
+        return [
+            (self.moisture_plot, [(x, d['moisture']) for x, d in zip(xs, readings)]),
+            (self.temp_plot, [(x, d['temperature'] * 2) for x, d in zip(xs, readings)]),
+            (self.humid_plot, [(x, d['humidity']) for x, d in zip(xs, readings)]),
+            (self.temp_moisture_plot, [(d['temperature'], d['moisture']) for d in readings]),
+            (self.humid_moisture_plot, [(d['humidity'], d['moisture']) for d in readings]),
+        ]
+    
+    def push_points(self, readings, first_seq):
+        for plot, values in self.plot_values(readings, first_seq):
+            buckets = self.buckets[plot]
+            ends = self.bucket_ends[plot]
+            # The partially filled bucket is provisional, replace it
+            if self.pending[plot]:
+                del plot.points[-self.pending[plot]:]
+            completed = []
+            for seq, (x, y) in enumerate(values, first_seq):
+                points = buckets.push(x, y)
+                if points:
+                    completed.extend(points)
+                    ends.append((seq, len(points)))
+            tail = buckets.pending()
+            plot.points.extend(completed + tail)
+            self.pending[plot] = len(tail)
+    
+    def trim_points(self):
+        """Drop the buckets whose readings all left the history, the same ones from every plot
+        
+        Every plot buckets the same readings, so trimming by reading sequence
+        keeps the scatters on the same window as the time series even though
+        their buckets yield different numbers of points.
+        """
+        oldest = self.seq - CHART_HISTORY
+        for plot, ends in self.bucket_ends.items():
+            stale = 0
+            while ends and ends[0][0] < oldest:
+                stale += ends.popleft()[1]
+            if stale:
+                del plot.points[:stale]
     
     def go_back(self, *args):
         self.manager.transition = SlideTransition(direction='right')
@@ -716,6 +607,7 @@ class AnalyticsScreen(Screen):
 
 class SmartAgricApp(App):
     def build(self):
+        install_from_env()
         sm = ScreenManager()
         sm.add_widget(MainMonitorScreen(name='main'))
         sm.add_widget(AnalyticsScreen(name='analytics'))
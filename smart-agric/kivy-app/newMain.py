@@ -2,27 +2,34 @@ from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.label import Label
-from kivy.uix.widget import Widget
-from kivy.animation import Animation
-from kivy.graphics import Color, Rectangle, Ellipse, Line
-from kivy.properties import NumericProperty, StringProperty
-from kivy.clock import Clock
-from supabase import create_client, Client
+from kivy.clock import Clock, mainthread
 
 import serial
 import json 
 import time
 from datetime import datetime
-import paho.mqtt.client as mqtt
 import json
 import time
 import random
+import os
+from functools import partial
 from threading import Thread
 import queue
 
+from display import DisplayBinding, GlyphLabel
+from face import AnimatedFace
+from idle import IdleMode
+from profiler import install_from_env, span
+from sensor_log import stamp
+from sparkline import Sparkline
+from streaming import DryingForecasts
+
 SERIAL_PORT = '/dev/ttyUSB0'
 BAUD_RATE = 9600
 
+# Pre-rendered face sprites, for Pi Zero-class boards that can't redraw the vector face every frame
+FACE_SPRITES = False
+
 # MQTT Configuration
 BROKER = "f3150d0d05ce46d0873bf1a69c56ff38.s1.eu.hivemq.cloud"  # e.g., HiveMQ Cloud URL
 PORT = 8883  # Use 8883 for TLS, 1883 for non-TLS
@@ -34,22 +41,45 @@ TOPIC = "agripal/farm1/sensor1"
 DEVICE_ID = "sensor_1"
 FARM_ID = "farm1"
 
+# Supabase Configuration (kept out of the repo: export SUPABASE_URL and SUPABASE_KEY before starting)
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
+SUPABASE_KEY = os.environ.get("SUPABASE_KEY", "")
+UPLOAD_BACKLOG = 5000  # Readings held while Supabase is unreachable, the oldest are dropped first
+
 
 
 data_queue = queue.Queue()
 
 
+def load_mqtt():
+    """Import paho on first use so it doesn't delay the first frame"""
+    import paho.mqtt.client as mqtt
+    return mqtt
+
+
+def load_supabase_client(url, key):
+    """Import supabase on first use, it is the slowest import in the app"""
+    from supabase import create_client
+    return create_client(url, key)
+
+
 class SUPABASEPublisher:
     """Upload to Supabase with background thread"""
     
-    def __init__(self, url, key):
+    def __init__(self, url, key, on_status=None):
         self.url = url
         self.key = key
-        self.supabase = create_client(self.url, self.key)
-        self.queue = queue.Queue()
+        self.on_status = on_status
+        self.supabase = None  # Created by the upload thread
+        self.enabled = bool(url and key)
+        self.queue = queue.Queue(maxsize=UPLOAD_BACKLOG)
         self.running = False
         self.upload_thread = None
     
+    def report(self, ready):
+        if self.on_status:
+            self.on_status(ready)
+    
     def start(self):
         """Start background upload thread"""
         self.running = True
@@ -59,6 +89,8 @@ class SUPABASEPublisher:
     
     def save_to_supabase(self, data):
         """Save sensor data to Supabase in real-time"""    
+        if not self.enabled:
+            return
         try:
             record = {
                 'device_id': DEVICE_ID,
@@ -71,15 +103,36 @@ class SUPABASEPublisher:
                 'status': data['status']
             }
             
-            self.queue.put(record)
+            self.enqueue(record)
         except Exception as e:
             print(f"Supabase error: {e}")
     
+    def enqueue(self, record):
+        """Queue a record for upload, dropping the oldest when the backlog is full"""
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+    
     def _upload_worker(self):
         """Background worker that uploads batches"""
+        if not self.enabled:
+            print("Supabase not configured, uploads disabled")
+            self.report(False)
+            return
+        
         batch = []
         while self.running:
             try:
+                if self.supabase is None:
+                    self.supabase = load_supabase_client(self.url, self.key)
+                    self.report(True)
+                
                 timeout = time.time() + 30
                 while len(batch) < 20 and time.time() < timeout:
                     try:
@@ -108,7 +161,7 @@ class SUPABASEPublisher:
             except queue.Empty:
                 break
         
-        if remaining:
+        if remaining and self.supabase is not None:
             try:
                 self.supabase.table('sensor_readings').insert(remaining).execute()
                 print(f"Flished {len(remaining)} records")
@@ -117,13 +170,18 @@ class SUPABASEPublisher:
                         
 class MQTTPublisher:
     """Seperate class to manage MQTT connection"""
-    def __init__(self):
+    def __init__(self, on_status=None):
         self.client = None
         self.connected = False
-        self.setup_client()
+        self.on_status = on_status
+    
+    def report(self, ready):
+        if self.on_status:
+            self.on_status(ready)
     
     def setup_client(self):
         """Initialize MQTT client with proper callbacks"""
+        mqtt = load_mqtt()
         self.client = mqtt.Client(
             client_id=f"raspberry_pi_{DEVICE_ID}",
             callback_api_version = mqtt.CallbackAPIVersion.VERSION2,
@@ -145,30 +203,33 @@ class MQTTPublisher:
         else:
             print(f"Failed to connect, return code {reason_code}")
             self.connected = False
+        self.report(self.connected)
     
     def on_disconnect(self, client, userdata, flags, reason_code, properties):
         """Callback when disconnected"""
         print(f"Disconnected from MQTT Broker (code: {reason_code})")
         self.connected = False
+        self.report(False)
     
     def on_publish(self, client, userdata, mid, reason_code, properties):
         """Callback when message is published"""
         print(f"Message {mid} published")
     
     def connect(self):
-        """Connect to MQTT broker"""
+        """Start connecting to the MQTT broker without waiting for it
+        
+        The network loop thread finishes the handshake (and reconnects later
+        on) and on_connect reports readiness through on_status.
+        """
         try:
-            self.client.connect(BROKER, PORT, keepalive=60)
+            if self.client is None:
+                self.setup_client()
+            self.client.connect_async(BROKER, PORT, keepalive=60)
             self.client.loop_start()
-            
-            timeout = 5
-            start_time = time.time()
-            while not self.connected and (time.time() - start_time) < timeout:
-                time.sleep(0.1)
-            
-            return self.connected
+            return True
         except Exception as e:
             print(f"Connection error: {e}")
+            self.report(False)
             return False
     
     def publish(self, temperature, humidity, moisture):
@@ -192,7 +253,7 @@ class MQTTPublisher:
             payload = json.dumps(sensor_data)
             result = self.client.publish(TOPIC, payload, qos=1)
             
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
+            if result.rc == load_mqtt().MQTT_ERR_SUCCESS:
                 print(f"Published M:{moisture}% T:{temperature}C H:{humidity}%")
                 return True
             else:
@@ -214,11 +275,12 @@ class MQTTPublisher:
 class SerialReader:
     """Separate class to handle serial communication"""
     
-    def __init__(self, port, baudrate):
+    def __init__(self, port, baudrate, on_status=None):
         self.port = port
         self.baudrate = baudrate
         self.serial = None
         self.running = False
+        self.on_status = on_status
     
     def connect(self):
         """Connect to serial port"""
@@ -252,20 +314,31 @@ class SerialReader:
             print(f"❌ Error reading from serial: {e}")
             return None
     
-    def start_reading(self, data_queue):
-        """Start reading in a separate thread"""
+    def start_reading(self, data_queue, on_data=None):
+        """Start reading in a separate thread, calling on_data after each reading is queued"""
         self.running = True
         
         def read_loop():
             while self.running:
                 data = self.read_data()
                 if data:
-                    data_queue.put(data)
-                time.sleep(0.1)
+                    data_queue.put(stamp(data))
+                    if on_data:
+                        on_data()
+                else:
+                    time.sleep(0.1)  # readline blocks, only a failing port returns at once
         
         thread = Thread(target=read_loop, daemon=True)
         thread.start()
     
+    def connect_and_read(self, data_queue, on_data=None):
+        """Connect (the Arduino needs 2 s to reset) then start reading, for a background thread"""
+        ready = self.connect()
+        if ready:
+            self.start_reading(data_queue, on_data)
+        if self.on_status:
+            self.on_status(ready)
+    
     def stop(self):
         """Stop reading and close serial port"""
         self.running = False
@@ -310,7 +383,7 @@ def read_sensor_data(ser):
 
 def save_to_csv(data):
     """Save data as JSON to file"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    timestamp = data.get('timestamp') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     try:
         log_entry = {
@@ -328,435 +401,26 @@ def save_to_csv(data):
     except Exception as e:
         print(f"Error saving: {e}")
         
-class AnimatedFace(Widget):
-    moisture_level = NumericProperty(50)
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        
-        # Background color (changes based on emotion)
-        self.bg_color = None
-        self.bg_rect = None
-        
-        # Graphics references
-        self.left_eye = None
-        self.right_eye = None
-        self.left_eye_color = None
-        self.right_eye_color = None
-        
-        # Eye highlights (for shine effect)
-        self.left_eye_highlight = None
-        self.right_eye_highlight = None
-        
-        # Eyebrows
-        self.left_brow = None
-        self.right_brow = None
-        self.left_brow_color = None
-        self.right_brow_color = None
-        
-        # Eyelashes
-        self.left_lashes = []
-        self.right_lashes = []
-        
-        # Cheeks
-        self.left_cheek = None
-        self.right_cheek = None
-        self.left_cheek_color = None
-        self.right_cheek_color = None
-        
-        self.mouth_color = None
-        self.mouth = None
-        self.tear = None
-        self.tear_color = None
-        
-        self.is_blinking = False
-        self.original_eye_size = 0
-        
-        self.draw_face()
-        
-        self.bind(moisture_level=self.update_expression)
-        self.bind(pos=self.redraw, size=self.redraw)
-        
-        Clock.schedule_interval(self.blink, 3)
-    
-    def draw_face(self):
-        self.canvas.clear()
-        
-        with self.canvas.before:
-            # Background fills entire screen
-            self.bg_color = Color(0.85, 0.95, 0.95, 1)  # Light cyan/white
-            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
-        
-        with self.canvas:
-            # Calculate face area (central 80% of screen)
-            face_width = self.width * 0.8
-            face_height = self.height * 0.7
-            face_x = self.x + (self.width - face_width) / 2
-            face_y = self.y + (self.height - face_height) / 2
-            
-            center_x = self.x + self.width / 2
-            center_y = self.y + self.height / 2
-            
-            # Eye size based on screen
-            self.original_eye_size = min(self.width, self.height) * 0.12
-            eye_size = self.original_eye_size
-            
-            # Eye spacing
-            eye_spacing = self.width * 0.15
-            
-            # Eyebrows
-            self.left_brow_color = Color(0.2, 0.2, 0.2, 1)
-            self.left_brow = Line(points=[], width=5)
-            
-            self.right_brow_color = Color(0.2, 0.2, 0.2, 1)
-            self.right_brow = Line(points=[], width=5)
-            
-            # Left Eye
-            self.left_eye_color = Color(0.1, 0.1, 0.1, 1)
-            self.left_eye = Ellipse(
-                pos=(center_x - eye_spacing - eye_size/2, 
-                     center_y + self.height * 0.08 - eye_size/2),
-                size=(eye_size, eye_size)
-            )
-            
-            # Left eye highlight (white shine)
-            Color(1, 1, 1, 1)
-            self.left_eye_highlight = Ellipse(
-                pos=(center_x - eye_spacing - eye_size/2 + eye_size * 0.3, 
-                     center_y + self.height * 0.08 - eye_size/2 + eye_size * 0.3),
-                size=(eye_size * 0.35, eye_size * 0.35)
-            )
-            
-            # Right Eye
-            self.right_eye_color = Color(0.1, 0.1, 0.1, 1)
-            self.right_eye = Ellipse(
-                pos=(center_x + eye_spacing - eye_size/2, 
-                     center_y + self.height * 0.08 - eye_size/2),
-                size=(eye_size, eye_size)
-            )
-            
-            # Right eye highlight
-            Color(1, 1, 1, 1)
-            self.right_eye_highlight = Ellipse(
-                pos=(center_x + eye_spacing - eye_size/2 + eye_size * 0.3, 
-                     center_y + self.height * 0.08 - eye_size/2 + eye_size * 0.3),
-                size=(eye_size * 0.35, eye_size * 0.35)
-            )
-            
-            # Eyelashes
-            self.draw_eyelashes(center_x, center_y, eye_spacing, eye_size)
-            
-            # Cheeks
-            cheek_size = self.width * 0.08
-            self.left_cheek_color = Color(1, 0.7, 0.75, 0)
-            self.left_cheek = Ellipse(
-                pos=(center_x - self.width * 0.25 - cheek_size/2, 
-                     center_y - self.height * 0.05 - cheek_size/2),
-                size=(cheek_size, cheek_size * 0.7)
-            )
-            
-            self.right_cheek_color = Color(1, 0.7, 0.75, 0)
-            self.right_cheek = Ellipse(
-                pos=(center_x + self.width * 0.25 - cheek_size/2, 
-                     center_y - self.height * 0.05 - cheek_size/2),
-                size=(cheek_size, cheek_size * 0.7)
-            )
-            
-            # Mouth
-            self.mouth_color = Color(0.2, 0.2, 0.2, 1)
-            self.mouth = Line(points=[], width=4)
-            
-            # Tear
-            self.tear_color = Color(0.3, 0.6, 1, 0)
-            self.tear = Ellipse(
-                pos=(center_x + eye_spacing + eye_size * 0.8, center_y),
-                size=(self.width * 0.02, self.height * 0.04)
-            )
-        
-        self.update_expression()
-    
-    def draw_eyelashes(self, center_x, center_y, eye_spacing, eye_size):
-        """Draw eyelashes"""
-        lash_length = eye_size * 0.6
-        eye_y = center_y + self.height * 0.08 + eye_size/2
-        
-        # Left eye lashes
-        left_eye_x = center_x - eye_spacing
-        Color(0.1, 0.1, 0.1, 1)
-        for i in range(4):
-            offset_x = (i - 1.5) * eye_size * 0.25
-            angle_offset = (i - 1.5) * 0.15
-            lash = Line(
-                points=[
-                    left_eye_x + offset_x, eye_y,
-                    left_eye_x + offset_x - lash_length * angle_offset, 
-                    eye_y + lash_length
-                ],
-                width=2.5
-            )
-            self.left_lashes.append(lash)
-        
-        # Right eye lashes
-        right_eye_x = center_x + eye_spacing
-        Color(0.1, 0.1, 0.1, 1)
-        for i in range(4):
-            offset_x = (i - 1.5) * eye_size * 0.25
-            angle_offset = (i - 1.5) * 0.15
-            lash = Line(
-                points=[
-                    right_eye_x + offset_x, eye_y,
-                    right_eye_x + offset_x + lash_length * angle_offset, 
-                    eye_y + lash_length
-                ],
-                width=2.5
-            )
-            self.right_lashes.append(lash)
-    
-    def redraw(self, *args):
-        self.draw_face()
-    
-    def blink(self, dt):
-        if self.is_blinking:
-            return
-        
-        self.is_blinking = True
-        
-        left_eye_x, left_eye_y = self.left_eye.pos
-        right_eye_x, right_eye_y = self.right_eye.pos
-        left_high_x, left_high_y = self.left_eye_highlight.pos
-        right_high_x, right_high_y = self.right_eye_highlight.pos
-        
-        # Close eyes
-        close_anim = Animation(
-            size=(self.original_eye_size, 3),
-            pos=(left_eye_x, left_eye_y + self.original_eye_size/2),
-            duration=0.08
-        )
-        close_anim2 = Animation(
-            size=(self.original_eye_size, 3),
-            pos=(right_eye_x, right_eye_y + self.original_eye_size/2),
-            duration=0.08
-        )
-        
-        # Hide highlights during blink
-        hide_high = Animation(size=(0, 0), duration=0.08)
-        hide_high2 = Animation(size=(0, 0), duration=0.08)
-        
-        # Open eyes
-        open_anim = Animation(
-            size=(self.original_eye_size, self.original_eye_size),
-            pos=(left_eye_x, left_eye_y),
-            duration=0.08
-        )
-        open_anim2 = Animation(
-            size=(self.original_eye_size, self.original_eye_size),
-            pos=(right_eye_x, right_eye_y),
-            duration=0.08
-        )
-        
-        # Show highlights
-        show_high = Animation(
-            size=(self.original_eye_size * 0.35, self.original_eye_size * 0.35),
-            duration=0.08
-        )
-        show_high2 = Animation(
-            size=(self.original_eye_size * 0.35, self.original_eye_size * 0.35),
-            duration=0.08
-        )
-        
-        sequence = close_anim + open_anim
-        sequence2 = close_anim2 + open_anim2
-        high_seq = hide_high + show_high
-        high_seq2 = hide_high2 + show_high2
-        
-        def reset_blink(*args):
-            self.is_blinking = False
-        sequence.bind(on_complete=reset_blink)
-        
-        sequence.start(self.left_eye)
-        sequence2.start(self.right_eye)
-        high_seq.start(self.left_eye_highlight)
-        high_seq2.start(self.right_eye_highlight)
-    
-    def update_expression(self, *args):
-        center_x = self.x + self.width / 2
-        center_y = self.y + self.height / 2
-        mouth_width = self.width * 0.25
-        
-        if self.moisture_level > 60:
-            # Happy - GREEN BACKGROUND
-            self.draw_happy_mouth(center_x, center_y, mouth_width)
-            self.draw_happy_eyebrows(center_x, center_y)
-            self.animate_background_color((0.3, 0.95, 0.4, 1))  # Bright green
-            self.show_cheeks()
-            self.hide_tear()
-            
-        elif self.moisture_level > 30:
-            # Worried - YELLOW BACKGROUND
-            self.draw_worried_mouth(center_x, center_y, mouth_width)
-            self.draw_worried_eyebrows(center_x, center_y)
-            self.animate_background_color((1, 0.95, 0.3, 1))  # Bright yellow
-            self.hide_cheeks()
-            self.hide_tear()
-            
-        else:
-            # Sad - RED BACKGROUND
-            self.draw_sad_mouth(center_x, center_y, mouth_width)
-            self.draw_sad_eyebrows(center_x, center_y)
-            self.animate_background_color((1, 0.4, 0.4, 1))  # Bright red
-            self.hide_cheeks()
-            self.show_tear(center_x, center_y)
-    
-    def animate_background_color(self, target_color):
-        """Animate the background color change"""
-        anim = Animation(rgba=target_color, duration=0.5)
-        anim.start(self.bg_color)
-    
-    def draw_happy_eyebrows(self, center_x, center_y):
-        """Raised, curved eyebrows"""
-        eye_spacing = self.width * 0.15
-        brow_y = center_y + self.height * 0.18
-        brow_width = self.width * 0.08
-        
-        # Left brow
-        left_points = []
-        for i in range(8):
-            x = center_x - eye_spacing - brow_width/2 + (brow_width * i / 7)
-            progress = i / 7
-            y = brow_y + self.height * 0.02 * (1 - 4 * (progress - 0.5) ** 2)
-            left_points.extend([x, y])
-        self.left_brow.points = left_points
-        
-        # Right brow
-        right_points = []
-        for i in range(8):
-            x = center_x + eye_spacing - brow_width/2 + (brow_width * i / 7)
-            progress = i / 7
-            y = brow_y + self.height * 0.02 * (1 - 4 * (progress - 0.5) ** 2)
-            right_points.extend([x, y])
-        self.right_brow.points = right_points
-    
-    def draw_worried_eyebrows(self, center_x, center_y):
-        """Concerned eyebrows"""
-        eye_spacing = self.width * 0.15
-        brow_y = center_y + self.height * 0.18
-        brow_width = self.width * 0.08
-        
-        # Left brow (slightly raised)
-        left_points = [
-            center_x - eye_spacing - brow_width/2, brow_y,
-            center_x - eye_spacing + brow_width/2, brow_y + self.height * 0.015
-        ]
-        self.left_brow.points = left_points
-        
-        # Right brow
-        right_points = [
-            center_x + eye_spacing - brow_width/2, brow_y + self.height * 0.015,
-            center_x + eye_spacing + brow_width/2, brow_y
-        ]
-        self.right_brow.points = right_points
-    
-    def draw_sad_eyebrows(self, center_x, center_y):
-        """Droopy sad eyebrows"""
-        eye_spacing = self.width * 0.15
-        brow_y = center_y + self.height * 0.18
-        brow_width = self.width * 0.08
-        
-        # Left brow
-        left_points = [
-            center_x - eye_spacing - brow_width/2, brow_y,
-            center_x - eye_spacing + brow_width/2, brow_y - self.height * 0.02
-        ]
-        self.left_brow.points = left_points
-        
-        # Right brow
-        right_points = [
-            center_x + eye_spacing - brow_width/2, brow_y - self.height * 0.02,
-            center_x + eye_spacing + brow_width/2, brow_y
-        ]
-        self.right_brow.points = right_points
-    
-    def draw_happy_mouth(self, center_x, center_y, width):
-        mouth_y = center_y - self.height * 0.12
-        num_points = 20
-        points = []
-        for i in range(num_points):
-            x = center_x - width/2 + (width * i / (num_points - 1))
-            progress = (i / (num_points - 1)) - 0.5
-            y = mouth_y - (width * 0.4) * (1 - 4 * progress * progress)
-            points.extend([x, y])
-        self.mouth.points = points
-    
-    def draw_worried_mouth(self, center_x, center_y, width):
-        mouth_y = center_y - self.height * 0.15
-        points = [
-            center_x - width/2, mouth_y,
-            center_x + width/2, mouth_y
-        ]
-        self.mouth.points = points
-    
-    def draw_sad_mouth(self, center_x, center_y, width):
-        mouth_y = center_y - self.height * 0.12
-        num_points = 20
-        points = []
-        for i in range(num_points):
-            x = center_x - width/2 + (width * i / (num_points - 1))
-            progress = (i / (num_points - 1)) - 0.5
-            y = mouth_y + (width * 0.4) * (1 - 4 * progress * progress)
-            points.extend([x, y])
-        self.mouth.points = points
-    
-    def show_cheeks(self):
-        """Show rosy cheeks"""
-        anim = Animation(a=0.5, duration=0.5)
-        anim.start(self.left_cheek_color)
-        anim.start(self.right_cheek_color)
-    
-    def hide_cheeks(self):
-        """Hide cheeks"""
-        anim = Animation(a=0, duration=0.3)
-        anim.start(self.left_cheek_color)
-        anim.start(self.right_cheek_color)
-    
-    def show_tear(self, center_x, center_y):
-        eye_spacing = self.width * 0.15
-        self.tear.pos = (center_x + eye_spacing + self.original_eye_size * 0.6, center_y)
-        
-        anim = Animation(a=1, duration=0.5)
-        anim.start(self.tear_color)
-        
-        tear_drop = Animation(
-            pos=(self.tear.pos[0], self.tear.pos[1] - self.height * 0.2),
-            duration=1.5,
-            t='in_quad'
-        )
-        tear_drop.start(self.tear)
-    
-    def hide_tear(self):
-        anim = Animation(a=0, duration=0.3)
-        anim.start(self.tear_color)
-    
-    def animate_to_level(self, new_level):
-        anim = Animation(moisture_level=new_level, duration=1, t='in_out_quad')
-        anim.start(self)
-
-
 class SmartAgricDashboard(FloatLayout):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
         self.plant_name = "Tommy"
         
-        # Initialize MQTT and Serial
-        self.mqtt_publisher = MQTTPublisher()
-        self.serial_reader = SerialReader(SERIAL_PORT, BAUD_RATE)
-        self.supabase = SUPABASEPublisher(SUPABASE_URL, SUPABASE_KEY)
-        self.supabase.start()
+        # Initialize MQTT and Serial, they connect in the background
+        self.connection_status = {'serial': None, 'mqtt': None, 'supabase': None}
+        self.mqtt_publisher = MQTTPublisher(
+            on_status=partial(self.on_connection_status, 'mqtt'))
+        self.serial_reader = SerialReader(
+            SERIAL_PORT, BAUD_RATE, on_status=partial(self.on_connection_status, 'serial'))
+        self.supabase = SUPABASEPublisher(
+            SUPABASE_URL, SUPABASE_KEY, on_status=partial(self.on_connection_status, 'supabase'))
         
         # Full screen face
         self.face = AnimatedFace(
             size_hint=(1, 1),
-            pos_hint={'x': 0, 'y': 0}
+            pos_hint={'x': 0, 'y': 0},
+            sprites=FACE_SPRITES
         )
         self.add_widget(self.face)
         
@@ -775,7 +439,7 @@ class SmartAgricDashboard(FloatLayout):
             color=(0.9, 0.3, 0.2, 1),
             size_hint=(1, 0.6)
         )
-        self.temp_value = Label(
+        self.temp_value = GlyphLabel(
             text='24C',
             font_size='22sp',
             bold=True,
@@ -801,7 +465,7 @@ class SmartAgricDashboard(FloatLayout):
             color=(0.2, 0.5, 0.9, 1),
             size_hint=(1, 0.6)
         )
-        self.humidity_value = Label(
+        self.humidity_value = GlyphLabel(
             text='65%',
             font_size='22sp',
             bold=True,
@@ -813,7 +477,7 @@ class SmartAgricDashboard(FloatLayout):
         self.add_widget(humidity_display)
         
         # Bottom center - Moisture percentage
-        self.moisture_label = Label(
+        self.moisture_label = GlyphLabel(
             text='50%',
             font_size='56sp',
             bold=True,
@@ -824,59 +488,133 @@ class SmartAgricDashboard(FloatLayout):
         )
         self.add_widget(self.moisture_label)
         
+        # Readouts redraw only when the shown string changes, at most once a second
+        self.moisture_display = DisplayBinding(self.moisture_label, "{}%")
+        self.temp_display = DisplayBinding(self.temp_value, "{}°C")
+        self.humidity_display = DisplayBinding(self.humidity_value, "{}%")
+        
+        # Above moisture - time until the plant reaches DRY
+        self.forecasts = DryingForecasts(default_device=DEVICE_ID)
+        self.eta_label = Label(
+            text='',
+            font_size='18sp',
+            color=(0.3, 0.3, 0.3, 1),
+            size_hint=(None, None),
+            size=(300, 40),
+            pos_hint={'center_x': 0.5, 'y': 0.14}
+        )
+        self.add_widget(self.eta_label)
+        
+        # Bottom right - recent moisture trend
+        self.sparkline = Sparkline(
+            size_hint=(None, None),
+            size=(200, 60),
+            pos_hint={'right': 0.98, 'y': 0.04}
+        )
+        self.add_widget(self.sparkline)
+        
+        # Bottom left - serial, MQTT and Supabase readiness
+        self.status_label = Label(
+            text=self.status_text(),
+            font_size='13sp',
+            halign='left',
+            color=(0.3, 0.3, 0.3, 1),
+            size_hint=(None, None),
+            size=(200, 60),
+            pos_hint={'x': 0.02, 'y': 0.04}
+        )
+        self.status_label.bind(size=self.status_label.setter('text_size'))
+        self.add_widget(self.status_label)
+        
         # Start simulation
         # Clock.schedule_interval(self.simulate_sensor_update, 5)
         
-        # Connect to MQTT
-        Clock.schedule_once(self.initialize_connections, 1)
+        # Low frame rate and no blinking when the readings stop changing, a touch wakes it
+        self.idle = IdleMode([self.face])
+        self.bind(on_touch_down=self.idle.activity)
         
-        Clock.schedule_interval(self.check_sensor_data, 0.5)
+        # Connect once the first frame is on screen
+        Clock.schedule_once(self.initialize_connections, 0)
+        
+        # The serial thread fires this per reading, a burst is handled in one pass next frame
+        self.data_trigger = Clock.create_trigger(self.check_sensor_data)
     
     def initialize_connections(self, dt):
-        """Initialize MQTT and Serial connections"""
-        # connect to MQTT
-        if self.mqtt_publisher.connect():
-            print("MQTT ready")
-        else:
-            print("MQTT connection failed")
-        
-        # Connect to Serial and start reading
-        if self.serial_reader.connect():
-            self.serial_reader.start_reading(data_queue)
-            print("Serial reader started")
-        else:
-          print("Serial connection failed")
+        """Start serial, MQTT and Supabase concurrently without blocking the UI
+        
+        Each one reports through on_connection_status, so readings show up on
+        the face as soon as serial is up, however slow the cloud is.
+        """
+        Thread(target=self.serial_reader.connect_and_read,
+               args=(data_queue, self.data_trigger), daemon=True).start()
+        Thread(target=self.mqtt_publisher.connect, daemon=True).start()
+        self.supabase.start()
     
-    def check_sensor_data(self, dt):
-        """Check queue for new sensor data (non-blocking)"""
-        try:
-            data = data_queue.get_nowait()
-            
-            if data:
-                moisture = data.get('moisture', 0)
-                temperature = data.get('temperature', 0)
-                humidity = data.get('humidity', 0)
-                
-                self.face.animate_to_level(moisture)
-                self.moisture_label.text = f"{moisture}%"
-                self.temp_value.text = f"{temperature}°C"
-                self.humidity_value.text = f"{humidity}%"
-                
-                # Publish to MQTT
-                self.mqtt_publisher.publish(temperature, humidity, moisture)
-                self.supabase.save_to_supabase(data)
-                
-                # Save to CSV
-                save_to_csv(data)
-                
-                # Log
-                timestamp = datetime.now().strftime('%H:%M:%S')
-                print(f"[{timestamp}] Moisture: {moisture}% | Temp: {temperature}°C | Humidity: {humidity}%")
-            
-        except queue.Empty:
-            pass
-        except Exception as e:
-            print(f"Error processing sensor data: {e}")
+    @mainthread
+    def on_connection_status(self, name, ready):
+        """Readiness callback from the connection threads, runs on the UI thread"""
+        if self.connection_status[name] == ready:
+            return
+        self.connection_status[name] = ready
+        print(f"{name} {'ready' if ready else 'unavailable'}")
+        self.status_label.text = self.status_text()
+    
+    def status_text(self):
+        names = {'serial': 'Serial', 'mqtt': 'MQTT', 'supabase': 'Supabase'}
+        states = {None: 'connecting...', True: 'ready', False: 'unavailable'}
+        return '\n'.join(f"{names[name]}: {states[ready]}"
+                         for name, ready in self.connection_status.items())
+    
+    def check_sensor_data(self, *args):
+        """Handle every queued reading, then show the newest"""
+        latest = None
+        while True:
+            try:
+                data = data_queue.get_nowait()
+            except queue.Empty:
+                break
+            if not data:
+                continue
+            try:
+                self.record(data)
+                latest = data
+            except Exception as e:
+                print(f"Error processing sensor data: {e}")
+        if latest:
+            self.show(latest)
+    
+    def record(self, data):
+        """Forecast, publish, save and log one reading"""
+        moisture = data.get('moisture', 0)
+        temperature = data.get('temperature', 0)
+        humidity = data.get('humidity', 0)
+        
+        self.forecasts.add(data)
+        self.sparkline.add(moisture)
+        
+        # Publish to MQTT
+        self.mqtt_publisher.publish(temperature, humidity, moisture)
+        self.supabase.save_to_supabase(data)
+        
+        # Save to CSV
+        with span('save_to_csv'):
+            save_to_csv(data)
+        
+        # Log
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        print(f"[{timestamp}] Moisture: {moisture}% | Temp: {temperature}°C | Humidity: {humidity}%")
+    
+    def show(self, data):
+        moisture = data.get('moisture', 0)
+        temperature = data.get('temperature', 0)
+        humidity = data.get('humidity', 0)
+        
+        self.idle.watch((moisture, temperature, humidity))
+        self.face.animate_to_level(moisture)
+        self.moisture_display.update(moisture)
+        self.temp_display.update(temperature)
+        self.humidity_display.update(humidity)
+        self.eta_label.text = self.forecasts.summary()
     
     def on_stop(self):
         """Cleanup when app closes"""
@@ -889,7 +627,9 @@ class SmartAgricDashboard(FloatLayout):
 
 class SmartAgricApp(App):
     def build(self):
-        return SmartAgricDashboard()
+        install_from_env()
+        self.dashboard = SmartAgricDashboard()
+        return self.dashboard
 
     def on_stop(self):
         """Called when app is closing"""
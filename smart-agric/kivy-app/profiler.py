@@ -0,0 +1,242 @@
+"""Frame-time profiler: Clock callback accounting, an on-screen overlay and a trace dump
+
+Set AGRIC_PROFILE=1 to turn it on in any of the apps. The trace is written
+on exit, or whenever F12 is pressed, to AGRIC_TRACE (frame_trace.json by
+default) in Chrome's trace event format, which opens in chrome://tracing
+or https://ui.perfetto.dev.
+"""
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from threading import Thread, get_ident
+from types import MethodType
+
+from kivy.animation import Animation
+from kivy.app import App
+from kivy.clock import Clock, ClockEvent
+from kivy.graphics import Color, Rectangle
+from kivy.uix.label import Label
+from kivy.weakmethod import WeakMethod
+
+FRAMES = 300           # Frames the overlay's percentiles are taken over
+CALLS = 2000           # Recent callback timings the overlay ranks
+TRACE_EVENTS = 200000  # Events kept for the trace, oldest dropped first
+TRACE_FILE = 'frame_trace.json'
+DUMP_KEY = 293         # F12
+
+profiler = None  # The installed Profiler, if any
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def callback_name(callback):
+    owner = getattr(callback, '__self__', None)
+    if isinstance(owner, Animation):
+        return 'Animation(' + ', '.join(owner.animated_properties) + ')'
+    func = getattr(callback, 'func', callback)  # functools.partial
+    code = getattr(func, '__code__', None)
+    if code is not None and 'func' in code.co_freevars:
+        # @mainthread schedules a closure over the function it decorates
+        func = func.__closure__[code.co_freevars.index('func')].cell_contents
+    return getattr(func, '__qualname__', None) or repr(func)
+
+
+class Profiler:
+    """Times every Clock callback, animation tick and drawn frame
+
+    install() replaces Clock.schedule_once, schedule_interval and
+    create_trigger with versions that wrap the callback in a timer, so it
+    has to run before the widgets schedule anything: at the top of build().
+    Animations tick through schedule_interval and are named after the
+    properties they animate. Bound methods stay weakly referenced, as Kivy
+    holds them, and Clock.unschedule still finds a wrapped callback.
+
+    Frame time is the work from the start of the clock tick to the end of
+    the buffer flip, so sleeping at the frame cap is not counted.
+    """
+
+    def __init__(self, trace_file=TRACE_FILE):
+        self.trace_file = trace_file
+        self.now = time.perf_counter
+        # Frames start at Clock.get_time(), which may use another clock than perf_counter
+        self.clock_offset = Clock.time() - time.perf_counter()
+        self.frames = deque(maxlen=FRAMES)
+        self.calls = deque(maxlen=CALLS)
+        self.totals = {}  # name -> [calls, total ms, worst ms]
+        self.events = deque(maxlen=TRACE_EVENTS)  # (name, category, start s, duration s, thread id)
+        self.originals = {}
+        self.overlay = None
+        self.stopped = False
+
+    def install(self, overlay=True):
+        from kivy.core.window import Window
+        for name in ('schedule_once', 'schedule_interval', 'create_trigger'):
+            self.originals[name] = getattr(Clock, name)
+            setattr(Clock, name, self.patched(self.originals[name]))
+        self.originals['unschedule'] = Clock.unschedule
+        Clock.unschedule = self.unschedule
+        self.originals['flip'] = Window.flip
+        Window.flip = self.flip
+        Window.bind(on_key_down=self.on_key_down)
+        app = App.get_running_app()
+        if app is not None:
+            app.bind(on_stop=self.stop)
+        if overlay:
+            # Added a frame later so it lands above the app's root widget
+            self.overlay = ProfilerOverlay(self)
+            Clock.schedule_once(lambda dt: Window.add_widget(self.overlay))
+        print(f"Profiling frames and Clock callbacks, F12 writes {self.trace_file}")
+
+    def uninstall(self):
+        from kivy.core.window import Window
+        for name in ('schedule_once', 'schedule_interval', 'create_trigger', 'unschedule'):
+            setattr(Clock, name, self.originals.pop(name))
+        Window.flip = self.originals.pop('flip')
+        Window.unbind(on_key_down=self.on_key_down)
+        if self.overlay is not None and self.overlay.parent is not None:
+            Window.remove_widget(self.overlay)
+
+    def patched(self, schedule):
+        def schedule_timed(callback, *args, **kwargs):
+            return schedule(self.timed(callback), *args, **kwargs)
+        return schedule_timed
+
+    def timed(self, callback):
+        name = callback_name(callback)
+        category = 'animation' if name.startswith('Animation(') else 'clock'
+        if isinstance(callback, MethodType):
+            target = WeakMethod(callback)
+        else:
+            target = lambda: callback
+
+        def timed_callback(*args):
+            func = target()
+            if func is None:
+                return False  # Owner was collected, drop the event as Kivy would
+            start = self.now()
+            try:
+                return func(*args)
+            finally:
+                self.record(name, category, start, self.now())
+        timed_callback.target = target
+        return timed_callback
+
+    @contextmanager
+    def span(self, name):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.record(name, 'span', start, self.now())
+
+    def record(self, name, category, start, end):
+        ms = (end - start) * 1000
+        self.calls.append((ms, name))
+        totals = self.totals.get(name)
+        if totals is None:
+            totals = self.totals[name] = [0, 0.0, 0.0]
+        totals[0] += 1
+        totals[1] += ms
+        totals[2] = max(totals[2], ms)
+        self.events.append((name, category, start, end - start, get_ident()))
+
+    def unschedule(self, callback, all=True):
+        if not isinstance(callback, ClockEvent):
+            for event in Clock.get_events():
+                target = getattr(event.get_callback(), 'target', None)
+                if target is not None and target() == callback:
+                    event.cancel()
+                    if not all:
+                        return
+        self.originals['unschedule'](callback, all)
+
+    def flip(self):
+        self.originals['flip']()
+        start = Clock.get_time() - self.clock_offset
+        end = self.now()
+        self.frames.append((end - start) * 1000)
+        self.events.append(('frame', 'frame', start, end - start, get_ident()))
+
+    def slowest(self, count=5):
+        """Worst time of each of the slowest recent callbacks, as (ms, name)"""
+        worst = {}
+        for ms, name in self.calls:
+            if ms > worst.get(name, -1):
+                worst[name] = ms
+        return sorted(((ms, name) for name, ms in worst.items()), reverse=True)[:count]
+
+    def on_key_down(self, window, key, *args):
+        if key == DUMP_KEY:
+            # Writing 200k events takes seconds on a Pi, keep it off the UI thread
+            Thread(target=self.dump, args=(None, list(self.events)), daemon=True).start()
+            return True
+
+    def dump(self, path=None, events=None):
+        path = path or self.trace_file
+        pid = os.getpid()
+        events = [{'name': name, 'cat': category, 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6,
+                   'pid': pid, 'tid': tid}
+                  for name, category, start, duration, tid in (events or list(self.events))]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Wrote {len(events)} trace events to {path}")
+        return path
+
+    def stop(self, *args):
+        if self.stopped:
+            return
+        self.stopped = True
+        print("Slowest callbacks: calls, total ms, worst ms")
+        ranked = sorted(self.totals.items(), key=lambda item: item[1][2], reverse=True)
+        for name, (calls, total, worst) in ranked[:10]:
+            print(f"  {calls:7d} {total:10.1f} {worst:8.2f}  {name}")
+        self.dump()
+
+
+class ProfilerOverlay(Label):
+    """Frame time percentiles and the slowest recent callbacks, top left, refreshed every second"""
+
+    def __init__(self, profiler, **kwargs):
+        super().__init__(font_name='RobotoMono-Regular', font_size='11sp', halign='left',
+                         size_hint=(None, None), padding=(6, 4), **kwargs)
+        self.profiler = profiler
+        with self.canvas.before:
+            Color(0, 0, 0, 0.6)
+            self.background = Rectangle()
+        self.bind(texture_size=self.setter('size'), pos=self.update_background,
+                  size=self.update_background)
+        Clock.schedule_interval(self.refresh, 1)
+
+    def update_background(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+
+    def refresh(self, dt):
+        frames = self.profiler.frames
+        lines = [f"frame {percentile(frames, 0.5):5.1f} {percentile(frames, 0.95):5.1f} "
+                 f"{percentile(frames, 0.99):5.1f} ms  p50 p95 p99 of {len(frames)}"]
+        lines += [f"{ms:6.1f} ms  {name}" for ms, name in self.profiler.slowest()]
+        self.text = '\n'.join(lines)
+        if self.parent is not None:
+            self.top = self.parent.height
+
+
+def install_from_env():
+    """Install a Profiler if AGRIC_PROFILE is set; call it first thing in App.build()"""
+    global profiler
+    if profiler is None and os.environ.get('AGRIC_PROFILE'):
+        profiler = Profiler(os.environ.get('AGRIC_TRACE', TRACE_FILE))
+        profiler.install()
+    return profiler
+
+
+def span(name):
+    """Time a block as its own entry while profiling: with span('save_to_csv'): ..."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name)
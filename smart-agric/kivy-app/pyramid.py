@@ -0,0 +1,119 @@
+from bisect import bisect_left, bisect_right
+
+from sensor_log import reading_time
+
+METRICS = ('moisture', 'temperature', 'humidity')
+LEVELS = [('raw', 0), ('1 min', 60), ('15 min', 900), ('1 h', 3600), ('1 day', 86400)]
+
+
+class PyramidLevel:
+    """Time-ordered buckets of one resolution; width 0 keeps every reading"""
+
+    def __init__(self, name, width):
+        self.name = name
+        self.width = width
+        self.starts = []
+        self.counts = []
+        self.sums = {m: [] for m in METRICS}
+        self.mins = {m: [] for m in METRICS}
+        self.maxs = {m: [] for m in METRICS}
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, t, values):
+        start = t - t % self.width if self.width else t
+        if self.width and self.starts and self.starts[-1] == start:
+            self.merge(len(self.starts) - 1, values)
+        elif not self.starts or start >= self.starts[-1]:
+            self.insert(len(self.starts), start, values)
+        else:
+            # Out of order reading, rare for an append-only log
+            i = bisect_left(self.starts, start)
+            if self.width and i < len(self.starts) and self.starts[i] == start:
+                self.merge(i, values)
+            else:
+                self.insert(i, start, values)
+
+    def insert(self, i, start, values):
+        self.starts.insert(i, start)
+        self.counts.insert(i, 1)
+        for m in METRICS:
+            self.sums[m].insert(i, values[m])
+            self.mins[m].insert(i, values[m])
+            self.maxs[m].insert(i, values[m])
+
+    def merge(self, i, values):
+        self.counts[i] += 1
+        for m in METRICS:
+            v = values[m]
+            self.sums[m][i] += v
+            if v < self.mins[m][i]:
+                self.mins[m][i] = v
+            if v > self.maxs[m][i]:
+                self.maxs[m][i] = v
+
+    def slice(self, t0, t1):
+        """Buckets overlapping [t0, t1] as reading-like dicts of bucket means"""
+        i = bisect_left(self.starts, t0 - self.width)
+        j = bisect_right(self.starts, t1)
+        half = self.width / 2
+        rows = []
+        for k in range(i, j):
+            n = self.counts[k]
+            row = {'t': self.starts[k] + half, 'count': n}
+            for m in METRICS:
+                row[m] = self.sums[m][k] / n
+                row[m + '_min'] = self.mins[m][k]
+                row[m + '_max'] = self.maxs[m][k]
+            rows.append(row)
+        return rows
+
+
+class ChartPyramid:
+    """Multi-resolution rollups of the sensor log for zooming and panning charts
+
+    Readings are folded into every level as they arrive. A view picks the
+    coarsest level that still has at least one bucket per visible pixel and
+    slices it with bisect, so its cost depends on the pixel width, not on
+    how much history has been logged.
+    """
+
+    def __init__(self):
+        self.levels = [PyramidLevel(name, width) for name, width in LEVELS]
+        self.version = 0
+
+    def add(self, reading):
+        t = reading_time(reading)
+        if t is None:
+            return False
+        try:
+            values = {m: float(reading.get(m, 0)) for m in METRICS}
+        except (TypeError, ValueError):
+            return False
+        for level in self.levels:
+            level.add(t, values)
+        self.version += 1
+        return True
+
+    def extend(self, readings):
+        for reading in readings:
+            self.add(reading)
+
+    def bounds(self):
+        raw = self.levels[0]
+        if not raw.starts:
+            return None
+        return raw.starts[0], raw.starts[-1]
+
+    def pick_level(self, t0, t1, pixels):
+        span = t1 - t0
+        for level in reversed(self.levels[1:]):
+            if span / level.width >= pixels:
+                return level
+        return self.levels[0]
+
+    def view(self, t0, t1, pixels):
+        """Return (level name, rows) covering [t0, t1] at about `pixels` resolution"""
+        level = self.pick_level(t0, t1, pixels)
+        return level.name, level.slice(t0, t1)
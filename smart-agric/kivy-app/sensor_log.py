@@ -0,0 +1,52 @@
+import json
+import os
+from datetime import datetime
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def reading_time(reading):
+    """Epoch seconds of a logged reading's local timestamp, None if unparseable"""
+    try:
+        return datetime.strptime(reading['timestamp'], TIMESTAMP_FORMAT).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def stamp(reading):
+    """Record when a live reading arrived, in the log's format, so a burst handled later keeps its times"""
+    reading.setdefault('timestamp', datetime.now().strftime(TIMESTAMP_FORMAT))
+    return reading
+
+
+class SensorLogTail:
+    """Follow the sensor log, returning only readings appended since the last read"""
+    
+    def __init__(self, filename='sensor_log.jsonl'):
+        self.filename = filename
+        self.offset = 0
+    
+    def read_new(self):
+        """Return (readings, restarted); restarted means the log shrank and was re-read"""
+        data = []
+        restarted = False
+        if not os.path.exists(self.filename):
+            return data, restarted
+        
+        try:
+            with open(self.filename, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < self.offset:
+                    self.offset = 0
+                    restarted = True
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Partial line still being written
+                    self.offset += len(line)
+                    try:
+                        data.append(json.loads(line))
+                    except:
+                        continue
+        except Exception as e:
+            print(f"Error reading log: {e}")
+        return data, restarted
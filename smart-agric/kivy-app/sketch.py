@@ -0,0 +1,372 @@
+"""Mergeable quantile sketches so distributions don't need every reading in memory"""
+import json
+import math
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from threading import Thread
+
+from sensor_log import reading_time
+from streaming import DRY_LEVEL, WET_LEVEL
+
+METRICS = ('moisture', 'temperature', 'humidity')
+
+
+class KllSketch:
+    """KLL quantile sketch: about 3k values whatever the stream length
+
+    Level h holds values standing for 2**h readings each. A full level is
+    sorted and every other value promoted to the next level, so the rank
+    error stays within a few multiples of 1/k of the count. Two
+    sketches merge by concatenating levels and compacting, which is what
+    makes them combinable across hours, days and devices.
+    """
+
+    def __init__(self, k=128):
+        self.k = k
+        self.levels = [[]]
+        self.size = 0
+        self.n = 0
+        self.min = None
+        self.max = None
+        self.flip = 0  # Alternates which half survives a compaction
+        self.resize()
+
+    def __len__(self):
+        return self.size
+
+    def capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def resize(self):
+        """Recompute per-level capacities, they shift whenever a level is added"""
+        self.capacities = [self.capacity(h) for h in range(len(self.levels))]
+        self.limit = sum(self.capacities)
+
+    def update(self, value):
+        self.levels[0].append(value)
+        self.size += 1
+        self.n += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.size >= self.limit:
+            self.compress()
+
+    def compress(self):
+        while self.size >= self.limit:
+            for h, level in enumerate(self.levels):
+                if len(level) >= self.capacities[h]:
+                    break
+            else:
+                return
+            if h + 1 == len(self.levels):
+                self.levels.append([])
+                self.resize()
+            level.sort()
+            keep = [level.pop()] if len(level) % 2 else []
+            promoted = level[self.flip::2]
+            self.levels[h + 1].extend(promoted)
+            self.flip ^= 1
+            self.size -= len(level) - len(promoted)
+            self.levels[h] = keep
+
+    def merge(self, other):
+        """Fold another sketch into this one, returns self"""
+        if other.n == 0:
+            return self
+        if len(self.levels) < len(other.levels):
+            self.levels.extend([] for _ in range(len(other.levels) - len(self.levels)))
+            self.resize()
+        for mine, theirs in zip(self.levels, other.levels):
+            mine.extend(theirs)
+        self.size += other.size
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.compress()
+        return self
+
+    def weighted(self):
+        """(sorted values, cumulative weights) over all levels"""
+        items = sorted((value, 1 << h) for h, level in enumerate(self.levels) for value in level)
+        values, cumulative, total = [], [], 0
+        for value, weight in items:
+            total += weight
+            values.append(value)
+            cumulative.append(total)
+        return values, cumulative
+
+    def quantiles(self, qs):
+        """Approximate values at each fraction in qs, None for an empty sketch"""
+        if self.n == 0:
+            return [None for _ in qs]
+        values, cumulative = self.weighted()
+        total = cumulative[-1]
+        out = []
+        for q in qs:
+            if q <= 0:
+                out.append(self.min)
+            elif q >= 1:
+                out.append(self.max)
+            else:
+                i = bisect_right(cumulative, q * total)
+                out.append(values[min(i, len(values) - 1)])
+        return out
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def histogram(self, edges, right=False):
+        """Approximate reading counts below edges[0], between each edge pair, and above the last
+
+        With right, a value equal to an edge counts in the bucket below it.
+        """
+        counts = []
+        if self.n == 0:
+            return [0] * (len(edges) + 1)
+        values, cumulative = self.weighted()
+        scale = self.n / cumulative[-1]
+        below = 0
+        find = bisect_right if right else bisect_left
+        for edge in edges:
+            i = find(values, edge)
+            rank = cumulative[i - 1] * scale if i else 0
+            counts.append(rank - below)
+            below = rank
+        counts.append(self.n - below)
+        return counts
+
+    def to_dict(self):
+        return {'k': self.k, 'n': self.n, 'min': self.min, 'max': self.max,
+                'levels': [[round(v, 2) for v in level] for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, d):
+        sketch = cls(d['k'])
+        sketch.n = d['n']
+        sketch.min = d['min']
+        sketch.max = d['max']
+        sketch.levels = [list(level) for level in d['levels']] or [[]]
+        sketch.size = sum(len(level) for level in sketch.levels)
+        sketch.resize()
+        return sketch
+
+
+def new_sketches(k):
+    return {m: KllSketch(k) for m in METRICS}
+
+
+def local_day(t):
+    """Epoch seconds of the local midnights starting and ending t's day
+
+    Readings are stamped in local time, so days split at local midnight;
+    a day around a DST change is 23 or 25 hours long.
+    """
+    day = datetime.fromtimestamp(t).date()
+    start = datetime(day.year, day.month, day.day)
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+
+def entry_line(device, start, span, sketches):
+    return json.dumps({'device': device, 'start': start, 'span': span,
+                       'sketches': {m: s.to_dict() for m, s in sketches.items()}}) + '\n'
+
+
+class SketchStore:
+    """Per-device quantile sketches of each metric for every hour of readings
+
+    Hours are appended to `filename` as they close and rolled into day
+    sketches. Once a device's readings move on to a new day, the earlier
+    days keep only their day sketch, in memory and on disk, so the file
+    and memory grow by a line per device per day. A query merges whole
+    days plus, within days still open, the hours at its edges. Hours
+    already filed are skipped on ingest, which makes re-reading the sensor
+    log after a restart harmless. The open hour lives in memory only; it
+    is rebuilt from the log.
+
+    The file is read on a background thread so building the app does not
+    wait for it; every method that needs the sketches waits for it first.
+    """
+
+    def __init__(self, filename='sensor_sketches.jsonl', bucket=3600, k=128, default_device='local',
+                 background=True):
+        self.filename = filename
+        self.bucket = bucket
+        self.k = k
+        self.default_device = default_device
+        self.hours = {}   # (device, day) -> {hour start: {metric: sketch}}, open days only
+        self.days = {}    # (device, day) -> {metric: sketch}
+        self.current = {}  # device -> (hour start, {metric: sketch})
+        self.loader = None
+        if background:
+            self.loader = Thread(target=self.load, daemon=True)
+            self.loader.start()
+        else:
+            self.load()
+
+    def wait(self):
+        """Block until the sketch file has been read"""
+        if self.loader is not None:
+            self.loader.join()
+            self.loader = None
+
+    def day_of(self, start):
+        return local_day(start)[0]
+
+    def load(self):
+        if not self.filename or not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        device, start = entry['device'], entry['start']
+                        sketches = {m: KllSketch.from_dict(d) for m, d in entry['sketches'].items()}
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if entry.get('span', self.bucket) == 86400:
+                        key = (device, self.day_of(start))  # Files from before local days started at UTC midnight
+                        self.hours.pop(key, None)
+                        if key in self.days:
+                            for metric, sketch in sketches.items():
+                                self.days[key].setdefault(metric, KllSketch(self.k)).merge(sketch)
+                        else:
+                            self.days[key] = sketches
+                    else:
+                        self.file(device, start, sketches)
+        except OSError as e:
+            print(f"Error reading sketches: {e}")
+            return
+        if self.close_days():
+            self.save()  # Hours written before their day was compacted
+
+    def file(self, device, start, sketches):
+        """Keep a finished hour and fold it into its day, False if already filed"""
+        if self.is_closed(device, start):
+            return False
+        key = (device, self.day_of(start))
+        self.hours.setdefault(key, {})[start] = sketches
+        day_sketches = self.days.setdefault(key, new_sketches(self.k))
+        for metric, sketch in sketches.items():
+            day_sketches.setdefault(metric, KllSketch(self.k)).merge(sketch)
+        return True
+
+    def close_days(self):
+        """Drop the hours of each device's days before its newest, their day sketch stays"""
+        newest = {}
+        for device, day in self.hours:
+            newest[device] = max(newest.get(device, day), day)
+        closed = [key for key in self.hours if key[1] < newest[key[0]]]
+        for key in closed:
+            del self.hours[key]
+        return bool(closed)
+
+    def close(self, device, start, sketches, persist=True):
+        """File a finished hour, compacting days that are over"""
+        self.wait()
+        if not self.file(device, start, sketches):
+            return
+        compacted = self.close_days()
+        if not persist or not self.filename:
+            return
+        if compacted:
+            self.save()
+            return
+        try:
+            with open(self.filename, 'a') as f:
+                f.write(entry_line(device, start, self.bucket, sketches))
+        except OSError as e:
+            print(f"Error saving sketches: {e}")
+
+    def save(self):
+        """Rewrite the file as one line per closed day plus the hours of open days"""
+        temp = self.filename + '.tmp'
+        try:
+            with open(temp, 'w') as f:
+                for (device, day), day_sketches in self.days.items():
+                    hours = self.hours.get((device, day))
+                    if hours is None:
+                        f.write(entry_line(device, day, 86400, day_sketches))
+                        continue
+                    for start, sketches in hours.items():
+                        f.write(entry_line(device, start, self.bucket, sketches))
+            os.replace(temp, self.filename)
+        except OSError as e:
+            print(f"Error saving sketches: {e}")
+
+    def is_closed(self, device, start):
+        key = (device, self.day_of(start))
+        if key not in self.hours:
+            return key in self.days  # A compacted day
+        return start in self.hours[key]
+
+    def add(self, reading, device=None, t=None):
+        self.wait()
+        if t is None:
+            t = reading_time(reading)
+        if t is None:
+            return
+        device = device or reading.get('device_id', self.default_device)
+        start = t - t % self.bucket
+        current = self.current.get(device)
+        if current is None or start > current[0]:
+            if current is not None:
+                self.close(device, *current)
+            if self.is_closed(device, start):
+                return
+            current = self.current[device] = (start, new_sketches(self.k))
+        elif start < current[0]:
+            return  # Late reading for an hour that has already closed
+        for metric, sketch in current[1].items():
+            value = reading.get(metric)
+            if isinstance(value, (int, float)) and not math.isnan(value):
+                sketch.update(float(value))
+
+    def extend(self, readings):
+        for reading in readings:
+            self.add(reading)
+
+    def query(self, metric, t0=None, t1=None, devices=None):
+        """Merged sketch of metric over [t0, t1] and devices
+
+        The range is matched at hour resolution within open days and at day
+        resolution before them.
+        """
+        self.wait()
+        lo = float('-inf') if t0 is None else t0
+        hi = float('inf') if t1 is None else t1
+        merged = KllSketch(self.k)
+        for (device, day), day_sketches in self.days.items():
+            if devices is not None and device not in devices:
+                continue
+            end = local_day(day)[1]
+            if end <= lo or day > hi:
+                continue
+            if (lo <= day and end - 1 <= hi) or (device, day) not in self.hours:
+                merged.merge(day_sketches[metric])
+                continue
+            for start, sketches in self.hours[(device, day)].items():
+                if start + self.bucket > lo and start <= hi:
+                    merged.merge(sketches[metric])
+        for device, (start, sketches) in self.current.items():
+            if devices is not None and device not in devices:
+                continue
+            if start + self.bucket > lo and start <= hi:
+                merged.merge(sketches[metric])
+        return merged
+
+    def insights(self, t0=None, t1=None):
+        lines = []
+        for metric, unit in (('moisture', '%'), ('temperature', 'C'), ('humidity', '%')):
+            p5, p50, p95 = self.query(metric, t0, t1).quantiles([0.05, 0.5, 0.95])
+            if p50 is not None:
+                lines.append(f"{metric.capitalize()} p5/p50/p95: {p5:.0f}/{p50:.0f}/{p95:.0f}{unit}")
+        moisture = self.query('moisture', t0, t1)
+        if moisture.n:
+            dry, moist, wet = (100 * c / moisture.n for c in moisture.histogram([DRY_LEVEL, WET_LEVEL], right=True))
+            lines.append(f"Time DRY/MOIST/WET: {dry:.0f}/{moist:.0f}/{wet:.0f}%")
+        return lines
@@ -0,0 +1,90 @@
+"""Sparkline of the latest readings for the main screen, no matplotlib involved"""
+from array import array
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Mesh
+from kivy.properties import ColorProperty, NumericProperty
+from kivy.uix.widget import Widget
+
+SPARKLINE_POINTS = 120
+
+
+class Sparkline(Widget):
+    """Line through the last `points` values, newest at the right, scaled to their range
+
+    Values go into a fixed-size ring buffer. The vertices live in a float
+    array the Mesh draws from in place, so a redraw writes y values into it
+    and nothing is allocated for the line; x is only rewritten on resize.
+    Redraws are coalesced to one per frame however many values arrive, and
+    nothing runs on frames without a new value. Until the buffer fills,
+    the unused vertices sit on the oldest point so the strip keeps its length.
+    """
+    color = ColorProperty([0.2, 0.6, 0.3, 1])
+    min_span = NumericProperty(5)  # Smallest value range drawn full height, so noise stays flat
+
+    def __init__(self, points=SPARKLINE_POINTS, **kwargs):
+        super().__init__(**kwargs)
+        self.values = [0.0] * points
+        self.head = 0  # Slot the next value goes in
+        self.count = 0
+        self.vertices = array('f', bytes(16 * points))  # x, y, u, v per point
+        self.placed = False  # x coordinates match pos and size
+        with self.canvas:
+            self.tint = Color(rgba=self.color)
+            self.mesh = Mesh(vertices=self.vertices, indices=array('H', range(points)),
+                             mode='line_strip')
+        self.redraw_trigger = Clock.create_trigger(self.redraw, -1)
+        self.bind(pos=self.replace, size=self.replace, min_span=self.redraw_trigger,
+                  color=self.update_color)
+
+    def update_color(self, *args):
+        self.tint.rgba = self.color
+
+    def replace(self, *args):
+        self.placed = False
+        self.redraw_trigger()
+
+    def add(self, value):
+        self.values[self.head] = value
+        self.head = (self.head + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+        self.redraw_trigger()
+
+    def redraw(self, *args):
+        count = self.count
+        if not count:
+            return
+        values, vertices = self.values, self.vertices
+        points = len(values)
+        empty = points - count
+        if empty or not self.placed:
+            # Slots not filled yet collapse onto the oldest point
+            step = self.width / (points - 1)
+            for k in range(points):
+                vertices[4 * k] = self.x + max(k, empty) * step
+            self.placed = not empty
+        if empty:
+            # The buffer fills from slot 0, scan the filled slots in place rather than slice them
+            low = high = values[0]
+            for i in range(1, count):
+                value = values[i]
+                if value < low:
+                    low = value
+                elif value > high:
+                    high = value
+        else:
+            low, high = min(values), max(values)
+        span = max(high - low, self.min_span)
+        scale = self.height / span
+        y0 = self.y - (low + high - span) / 2 * scale  # A range narrower than min_span sits in the middle
+        oldest = (self.head - count) % points
+        k = 4 * empty + 1
+        for i in range(oldest, min(oldest + count, points)):
+            vertices[k] = y0 + values[i] * scale
+            k += 4
+        for i in range(oldest + count - points):
+            vertices[k] = y0 + values[i] * scale
+            k += 4
+        for k in range(1, 4 * empty, 4):
+            vertices[k] = vertices[4 * empty + 1]
+        self.mesh.vertices = vertices
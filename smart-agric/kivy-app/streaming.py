@@ -0,0 +1,434 @@
+"""Streaming statistics over sensor readings, O(1) work per reading"""
+import math
+from collections import deque
+from itertools import islice
+from datetime import datetime
+
+from sensor_log import reading_time
+
+METRICS = ('moisture', 'temperature', 'humidity')
+
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class EwmaDetector:
+    """EWMA mean/variance of one metric, flagging readings far from the running mean"""
+
+    def __init__(self, alpha=0.1, threshold=4.0, warmup=10, min_std=1.0):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_std = min_std
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+    def std(self):
+        return max(math.sqrt(self.var), self.min_std)
+
+    def update(self, value):
+        """Fold value in, return its z-score if it is a spike, else None"""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return None
+        diff = value - self.mean
+        z = diff / self.std()
+        spike = self.count > self.warmup and abs(z) > self.threshold
+        self.mean += self.alpha * diff
+        self.var = (1 - self.alpha) * (self.var + self.alpha * diff * diff)
+        return z if spike else None
+
+
+class AnomalyMonitor:
+    """Flags spikes, sensor dropouts and abnormal drying as readings stream in
+
+    Each metric has an EwmaDetector for spikes. A dropout is a missing value,
+    a 0 temperature or humidity (what the logger writes when the sensor did
+    not answer) or a gap of many expected intervals between readings. Drying
+    is tracked as an EWMA of the moisture rate of change in %/hour over about
+    rate_window seconds, and drops faster than drying_rate are flagged once
+    per episode. Events go into bounded per-kind deques so the insights panel
+    never rescans history.
+    """
+
+    KINDS = ('spike', 'dropout', 'drying')
+
+    def __init__(self, drying_rate=-5.0, rate_window=3600, gap_factor=10, min_gap=120,
+                 max_events=200):
+        self.detectors = {m: EwmaDetector() for m in METRICS}
+        self.drying_rate = drying_rate
+        self.rate_window = rate_window
+        self.gap_factor = gap_factor
+        self.min_gap = min_gap
+        self.events = deque(maxlen=max_events)
+        self.index = {kind: deque(maxlen=max_events) for kind in self.KINDS}
+        self.counts = {kind: 0 for kind in self.KINDS}
+        self.last_t = None
+        self.last_moisture = None
+        self.interval = None
+        self.rate = 0.0
+        self.rate_span = 0.0
+        self.drying = False
+        self.dropped = set()
+
+    def flag(self, t, kind, metric, value, detail):
+        event = {'t': t, 'kind': kind, 'metric': metric, 'value': value, 'detail': detail}
+        self.events.append(event)
+        self.index[kind].append(event)
+        self.counts[kind] += 1
+        return event
+
+    def add(self, reading):
+        """Process one reading, return the events it raised"""
+        t = reading_time(reading)
+        if t is None:
+            return []
+        raised = []
+
+        if self.last_t is not None:
+            dt = t - self.last_t
+            if dt > 0:
+                if self.interval is not None and dt > max(self.gap_factor * self.interval, self.min_gap):
+                    raised.append(self.flag(t, 'dropout', 'all', dt,
+                                            f"no readings for {dt / 60:.0f} min"))
+                else:
+                    self.interval = dt if self.interval is None else 0.9 * self.interval + 0.1 * dt
+
+        spiked = set()
+        for metric in METRICS:
+            value = reading.get(metric)
+            if is_missing(value) or (metric != 'moisture' and value == 0):
+                if metric not in self.dropped:
+                    self.dropped.add(metric)
+                    raised.append(self.flag(t, 'dropout', metric, value, f"{metric} sensor not reading"))
+                continue
+            self.dropped.discard(metric)
+            z = self.detectors[metric].update(float(value))
+            if z is not None:
+                spiked.add(metric)
+                raised.append(self.flag(t, 'spike', metric, value,
+                                        f"{metric} spike to {value:.1f} ({z:+.1f} sd)"))
+
+        moisture = reading.get('moisture')
+        # A moisture spike would read as a sudden rise then a fast drop, keep it out of the rate
+        if not is_missing(moisture) and 'moisture' not in spiked:
+            if self.last_moisture is not None and self.last_t is not None and t > self.last_t:
+                dt = t - self.last_t
+                hourly = (moisture - self.last_moisture) / dt * 3600
+                # Time-weighted so the smoothing spans rate_window seconds whatever the log interval
+                weight = 1 - math.exp(-dt / self.rate_window)
+                self.rate += weight * (hourly - self.rate)
+                self.rate_span += dt
+                warm = self.rate_span >= self.rate_window / 2
+                if warm and self.rate < self.drying_rate and not self.drying:
+                    self.drying = True
+                    raised.append(self.flag(t, 'drying', 'moisture', self.rate,
+                                            f"drying fast ({self.rate:.1f}%/h)"))
+                elif self.rate > self.drying_rate / 2:
+                    self.drying = False
+            self.last_moisture = moisture
+
+        self.last_t = t
+        return raised
+
+    def extend(self, readings):
+        for reading in readings:
+            self.add(reading)
+
+    def recent(self, kind=None, limit=5):
+        """Newest events first, optionally only one kind"""
+        events = self.events if kind is None else self.index[kind]
+        return list(islice(reversed(events), limit))
+
+    def insights(self, limit=3):
+        """Lines for the Smart Insights panel, newest events first"""
+        lines = []
+        totals = ', '.join(f"{self.counts[k]} {k}" for k in self.KINDS if self.counts[k])
+        if totals:
+            lines.append(f"Anomalies: {totals}")
+        for event in self.recent(limit=limit):
+            when = datetime.fromtimestamp(event['t']).strftime('%m-%d %H:%M')
+            lines.append(f"{when} {event['detail']}")
+        return lines
+
+
+DRY_LEVEL = 30  # Moisture below this is DRY in analyze_data and makes the face sad
+WET_LEVEL = 60  # Sensor status is WET above this, MOIST above DRY_LEVEL, else DRY
+LOW_MOISTURE, HIGH_MOISTURE = 40, 70  # Average moisture bands in the insights
+COLD, HOT = 18, 30  # Average temperature bands, °C
+DRY_SHARE = 0.3  # Share of DRY readings that counts as critical
+
+
+def summary_bands(avg_moisture, avg_temp, dry_periods, count):
+    """analyze_data's rules: moisture and temperature 'low', 'ok' or 'high', and whether DRY is critical"""
+    moisture = 'low' if avg_moisture < LOW_MOISTURE else ('high' if avg_moisture > HIGH_MOISTURE else 'ok')
+    temp = 'low' if avg_temp < COLD else ('high' if avg_temp > HOT else 'ok')
+    return moisture, temp, dry_periods > count * DRY_SHARE
+
+
+def summary_insights(avg_moisture, avg_temp, dry_periods, count):
+    """Short insight lines for the averages, as shown on the analytics screen and by batch.py"""
+    moisture, temp, critical = summary_bands(avg_moisture, avg_temp, dry_periods, count)
+    insights = [{'low': f"WARNING: Low moisture ({avg_moisture:.1f}%)",
+                 'high': f"HIGH moisture ({avg_moisture:.1f}%)",
+                 'ok': f"OPTIMAL moisture ({avg_moisture:.1f}%)"}[moisture]]
+    if critical:
+        insights.append(f"{dry_periods} critical dry periods!")
+    if temp == 'high':
+        insights.append(f"High temp ({avg_temp:.1f}C)")
+    elif temp == 'low':
+        insights.append(f"Low temp ({avg_temp:.1f}C)")
+    insights.append(f"Total: {count} readings")
+    return insights
+
+
+def format_duration(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    if hours >= 48:
+        return f"{hours // 24}d {hours % 24}h"
+    return f"{hours}h {rest // 60:02d}m" if hours else f"{rest // 60}m"
+
+
+class DryingForecast:
+    """Least-squares line through moisture since the last watering, updated in O(1)
+
+    Keeps running sums of t, m, t*t and t*m (t relative to the watering) so
+    the fit is refreshed on every reading without revisiting old ones. A rise
+    of watering_rise above the lowest moisture since the last watering starts
+    a new decay curve.
+    """
+
+    def __init__(self, dry_level=DRY_LEVEL, watering_rise=10.0, min_points=5, min_span=600):
+        self.dry_level = dry_level
+        self.watering_rise = watering_rise
+        self.min_points = min_points
+        self.min_span = min_span
+        self.watered_at = None
+        self.waterings = 0
+        self.reset(None, None)
+
+    def reset(self, t, moisture):
+        self.t0 = t
+        self.low = moisture
+        self.n = 0
+        self.st = self.sm = self.stt = self.stm = 0.0
+        self.last_t = t
+
+    def add(self, t, moisture):
+        if self.t0 is None:
+            self.reset(t, moisture)
+        elif t < self.last_t:
+            return  # Out of order, a stale reading must not restart the curve either
+        elif moisture > self.low + self.watering_rise:
+            self.reset(t, moisture)
+            self.watered_at = t
+            self.waterings += 1
+        self.low = min(self.low, moisture)
+        x = t - self.t0
+        self.n += 1
+        self.st += x
+        self.sm += moisture
+        self.stt += x * x
+        self.stm += x * moisture
+        self.last_t = t
+
+    def fit(self):
+        """(slope per second, intercept at the watering) or None if too little data"""
+        if self.n < self.min_points or self.last_t - self.t0 < self.min_span:
+            return None
+        denom = self.n * self.stt - self.st * self.st
+        if denom <= 0:
+            return None
+        slope = (self.n * self.stm - self.st * self.sm) / denom
+        return slope, (self.sm - slope * self.st) / self.n
+
+    def eta(self):
+        """Seconds from the last reading until the fit crosses dry_level
+
+        0 when already below it, None while the fit is too young or moisture
+        is not falling.
+        """
+        fitted = self.fit()
+        if fitted is None:
+            return None
+        slope, intercept = fitted
+        now = intercept + slope * (self.last_t - self.t0)
+        if now < self.dry_level:
+            return 0
+        if slope >= 0:
+            return None
+        return (self.dry_level - now) / slope
+
+
+class DryingForecasts:
+    """One DryingForecast per device, fed straight from readings"""
+
+    def __init__(self, default_device='local', **options):
+        self.default_device = default_device
+        self.options = options
+        self.devices = {}
+
+    def add(self, reading, device=None, t=None):
+        """Fold in one reading; t defaults to its logged timestamp"""
+        moisture = reading.get('moisture')
+        if t is None:
+            t = reading_time(reading)
+        if t is None or is_missing(moisture):
+            return
+        device = device or reading.get('device_id', self.default_device)
+        forecast = self.devices.get(device)
+        if forecast is None:
+            forecast = self.devices[device] = DryingForecast(**self.options)
+        forecast.add(t, float(moisture))
+
+    def extend(self, readings):
+        for reading in readings:
+            self.add(reading)
+
+    def summary(self, device=None):
+        """Short ETA text for the main screen, '' when there is no forecast yet"""
+        forecast = self.devices.get(device or self.default_device)
+        eta = forecast.eta() if forecast else None
+        if eta is None:
+            return ''
+        if eta == 0:
+            return 'Dry now, time to water'
+        return f"Dry in {format_duration(eta)}"
+
+    def insights(self):
+        lines = []
+        for device, forecast in self.devices.items():
+            eta = forecast.eta()
+            if eta is None:
+                continue
+            name = '' if len(self.devices) == 1 else f"{device}: "
+            if eta == 0:
+                lines.append(f"{name}Below {forecast.dry_level}% moisture, water now")
+            else:
+                when = datetime.fromtimestamp(forecast.last_t + eta).strftime('%d %b %H:%M')
+                lines.append(f"{name}Reaches {forecast.dry_level}% in {format_duration(eta)} "
+                             f"(around {when})")
+        return lines
+
+
+class PairStats:
+    """Running means, variances and covariance of (x, y) pairs (Welford's method)"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.sxx = self.syy = self.sxy = 0.0
+
+    def add(self, x, y):
+        self.n += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+        self.sxx += dx * (x - self.mean_x)
+        self.syy += dy * (y - self.mean_y)
+        self.sxy += dx * (y - self.mean_y)
+
+    def remove(self, x, y):
+        """Undo an earlier add of the same pair"""
+        if self.n <= 1:
+            self.__init__()
+            return
+        mean_x = (self.n * self.mean_x - x) / (self.n - 1)
+        mean_y = (self.n * self.mean_y - y) / (self.n - 1)
+        self.sxx -= (x - mean_x) * (x - self.mean_x)
+        self.syy -= (y - mean_y) * (y - self.mean_y)
+        self.sxy -= (x - mean_x) * (y - self.mean_y)
+        self.n -= 1
+        self.mean_x, self.mean_y = mean_x, mean_y
+
+    def covariance(self):
+        return self.sxy / (self.n - 1) if self.n > 1 else None
+
+    def correlation(self):
+        """Pearson r, None until both variables have varied"""
+        if self.n < 3 or self.sxx <= 1e-9 or self.syy <= 1e-9:
+            return None
+        return max(-1.0, min(1.0, self.sxy / math.sqrt(self.sxx * self.syy)))
+
+    def line(self):
+        """(slope, intercept) of the least-squares fit of y on x, or None"""
+        if self.n < 3 or self.sxx <= 1e-9:
+            return None
+        slope = self.sxy / self.sxx
+        return slope, self.mean_y - slope * self.mean_x
+
+
+class RollingPairStats(PairStats):
+    """PairStats over the last `size` pairs, retiring the oldest as new ones arrive"""
+
+    def __init__(self, size):
+        super().__init__()
+        self.window = deque(maxlen=size)
+
+    def add(self, x, y):
+        if len(self.window) == self.window.maxlen:
+            self.remove(*self.window[0])
+        self.window.append((x, y))
+        super().add(x, y)
+
+
+# Scatter graph -> the variable plotted against moisture
+PAIRS = {'temp_moisture': ('temperature', '%/°C'), 'humid_moisture': ('humidity', '%/%')}
+
+
+class CorrelationTracker:
+    """Correlation and fit of moisture against temperature and humidity
+
+    Keeps full-history and rolling-window PairStats per scatter graph, so the
+    numbers in Smart Insights and the fit lines on the charts cost O(1) per
+    reading and never touch old readings again.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.full = {graph: PairStats() for graph in PAIRS}
+        self.recent = {graph: RollingPairStats(window) for graph in PAIRS}
+
+    def add(self, reading):
+        moisture = reading.get('moisture')
+        if is_missing(moisture):
+            return
+        for graph, (key, _) in PAIRS.items():
+            value = reading.get(key)
+            # 0 is what the logger writes when the DHT sensor did not answer
+            if is_missing(value) or value == 0:
+                continue
+            self.full[graph].add(float(value), float(moisture))
+            self.recent[graph].add(float(value), float(moisture))
+
+    def extend(self, readings):
+        for reading in readings:
+            self.add(reading)
+
+    def fits(self, graph):
+        """Fit lines for a scatter graph as hashable (label, slope, intercept) tuples"""
+        lines = []
+        for label, stats in (('all', self.full[graph]), (f'last {self.window}', self.recent[graph])):
+            line = stats.line()
+            r = stats.correlation()
+            if line is not None and r is not None:
+                lines.append((f"{label} r={r:+.2f}", round(line[0], 4), round(line[1], 2)))
+        return tuple(lines)
+
+    def insights(self):
+        lines = []
+        for graph, (key, unit) in PAIRS.items():
+            full, recent = self.full[graph], self.recent[graph]
+            r = full.correlation()
+            if r is None:
+                continue
+            text = f"Moisture vs {key}: r={r:+.2f}, {full.line()[0]:+.2f}{unit}"
+            recent_r = recent.correlation()
+            if recent_r is not None and recent.n < full.n:
+                text += f" (last {recent.n}: r={recent_r:+.2f})"
+            lines.append(text)
+        return lines
@@ -0,0 +1,187 @@
+"""Synthetic sensor readings with realistic soil-moisture dynamics
+
+Usage: python synthetic.py [--devices N] [--days D] [--interval S] [--seed N] [--start DATE]
+                           [--format jsonl csv supabase sketches] [--out DIR] [--append]
+
+Each virtual device gets its own climate and soil: temperature and humidity
+follow a daily sine with noise, moisture decays exponentially towards a
+floor at a rate driven by heat and dryness, and the plant is watered back
+up some time after it goes DRY. Output is seeded, so a given command line
+always writes the same files.
+
+Files go to synthetic_data/ by default, away from the app's live logs, and
+existing files are only appended to with --append.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sensor_log import TIMESTAMP_FORMAT
+
+FORMATS = {
+    'jsonl': 'sensor_log.jsonl',         # save_to_csv in main.py / newMain.py
+    'csv': 'sensor_log.csv',             # timestamp,raw,moisture,status as in main2.py
+    'supabase': 'sensor_readings.jsonl',  # Rows for the Supabase sensor_readings table
+    'sketches': 'sensor_sketches.jsonl',  # SketchStore hourly sketches
+}
+
+
+def status_of(moisture):
+    return 'WET' if moisture > 60 else ('MOIST' if moisture > 30 else 'DRY')
+
+
+class VirtualDevice:
+    """One plant and sensor, stepped forward one reading at a time"""
+
+    def __init__(self, device_id, seed, dropout=0.001):
+        rng = self.rng = random.Random(seed)
+        self.device_id = device_id
+        self.dropout = dropout
+        self.mean_temp = rng.uniform(20, 28)
+        self.temp_swing = rng.uniform(3, 8)
+        self.mean_humidity = rng.uniform(50, 70)
+        self.humidity_swing = rng.uniform(8, 18)
+        self.floor = rng.uniform(5, 15)
+        self.drying = rng.uniform(0.02, 0.05)  # Per hour at 25C and 60% humidity
+        self.water_below = rng.uniform(22, 32)
+        self.moisture = rng.uniform(50, 90)
+        self.water_at = None
+        self.dry_raw = rng.randint(680, 720)
+        self.wet_raw = rng.randint(280, 320)
+
+    def step(self, t, dt):
+        """Advance dt seconds to epoch t, return (moisture, temperature, humidity, raw)"""
+        rng = self.rng
+        # Warmest mid-afternoon, humidity moves the other way
+        phase = math.sin(2 * math.pi * ((t / 3600 - 9) % 24) / 24)
+        temperature = self.mean_temp + self.temp_swing * phase + rng.gauss(0, 0.3)
+        humidity = self.mean_humidity - self.humidity_swing * phase + rng.gauss(0, 1.0)
+        humidity = min(100.0, max(10.0, humidity))
+
+        rate = self.drying * (1 + 0.06 * (temperature - 25)) * (1 + 0.02 * (60 - humidity))
+        self.moisture = self.floor + (self.moisture - self.floor) * math.exp(-max(rate, 0) * dt / 3600)
+        if self.moisture < self.water_below and self.water_at is None:
+            self.water_at = t + rng.uniform(0.5, 12) * 3600  # Someone notices eventually
+        if self.water_at is not None and t >= self.water_at:
+            self.moisture = min(100.0, self.moisture + rng.uniform(45, 70))
+            self.water_at = None
+
+        moisture = min(100.0, max(0.0, self.moisture + rng.gauss(0, 0.4)))
+        raw = int(self.dry_raw - (self.dry_raw - self.wet_raw) * moisture / 100)
+        if rng.random() < self.dropout:
+            temperature = humidity = 0.0  # What the logger writes when the DHT times out
+        return round(moisture, 1), round(temperature, 1), round(humidity, 1), raw
+
+
+def generate(devices=1, days=1.0, interval=60, seed=1, start=None, dropout=0.001):
+    """Yield (epoch t, timestamp, device_id, moisture, temperature, humidity, raw) in time order"""
+    if start is None:
+        start = datetime.now() - timedelta(days=days)
+    fleet = [VirtualDevice(f"sensor_{i + 1}", seed * 1000003 + i, dropout) for i in range(devices)]
+    t = start.timestamp()
+    for _ in range(int(days * 86400 / interval)):
+        t += interval
+        # One strftime per tick, shared by every device
+        stamp = datetime.fromtimestamp(t).strftime(TIMESTAMP_FORMAT)
+        for device in fleet:
+            yield (t, stamp, device.device_id) + device.step(t, interval)
+
+
+def sample_readings(count=100, interval=900, seed=None):
+    """Readings for one device ending now, shaped like the sensor log"""
+    rows = generate(1, count * interval / 86400, interval, random.randrange(1 << 30) if seed is None else seed)
+    return [{'timestamp': stamp, 'raw': raw, 'moisture': m, 'temperature': temp,
+             'humidity': humid, 'status': status_of(m)}
+            for _, stamp, _, m, temp, humid, raw in rows]
+
+
+class Writers:
+    """Open files for the requested formats, each row formatted by hand for speed"""
+
+    def __init__(self, formats, out_dir='.', farm_id='farm1', append=False):
+        self.files = {}
+        self.sketches = None
+        self.farm_id = farm_id
+        paths = [os.path.join(out_dir, FORMATS[fmt]) for fmt in formats]
+        existing = [path for path in paths if os.path.exists(path)]
+        if existing and not append:
+            raise FileExistsError(f"{', '.join(existing)} already there, pass --append to add to existing files")
+        for fmt in formats:
+            path = os.path.join(out_dir, FORMATS[fmt])
+            if fmt == 'sketches':
+                from sketch import SketchStore
+                self.sketches = SketchStore(path)
+            else:
+                self.files[fmt] = open(path, 'a', buffering=1 << 20)
+
+    def write(self, t, stamp, device_id, moisture, temperature, humidity, raw):
+        status = status_of(moisture)
+        f = self.files.get('jsonl')
+        if f:
+            f.write(f'{{"timestamp": "{stamp}", "raw": {raw}, "moisture": {moisture}, '
+                    f'"temperature": {temperature}, "humidity": {humidity}, '
+                    f'"status": "{status}", "device_id": "{device_id}"}}\n')
+        f = self.files.get('csv')
+        if f:
+            f.write(f"{stamp},{raw},{moisture},{status}\n")
+        f = self.files.get('supabase')
+        if f:
+            f.write(f'{{"device_id": "{device_id}", "farm_id": "{self.farm_id}", '
+                    f'"timestamp": "{stamp[:10]}T{stamp[11:]}", "raw_value": {raw}, '
+                    f'"moisture": {moisture}, "temperature": {temperature}, '
+                    f'"humidity": {humidity}, "status": "{status}"}}\n')
+        if self.sketches:
+            self.sketches.add({'moisture': moisture, 'temperature': temperature,
+                               'humidity': humidity}, device_id, t)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        if self.sketches:
+            # Persist the hours still open, nothing will be appended to them
+            for device, (start, sketches) in list(self.sketches.current.items()):
+                self.sketches.close(device, start, sketches)
+            self.sketches.current.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write synthetic sensor readings')
+    parser.add_argument('--devices', type=int, default=1)
+    parser.add_argument('--days', type=float, default=30)
+    parser.add_argument('--interval', type=float, default=60, help='seconds between readings')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--start', default='2026-01-01',
+                        help='first day, fixed so runs are reproducible (YYYY-MM-DD)')
+    parser.add_argument('--dropout', type=float, default=0.001, help='chance of a failed DHT read')
+    parser.add_argument('--format', nargs='+', choices=sorted(FORMATS), default=['jsonl'])
+    parser.add_argument('--out', default='synthetic_data', help='directory to write the files in')
+    parser.add_argument('--append', action='store_true', help='add to files that already exist')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    try:
+        writers = Writers(args.format, args.out, append=args.append)
+    except FileExistsError as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    count = 0
+    try:
+        rows = generate(args.devices, args.days, args.interval, args.seed,
+                        datetime.strptime(args.start, '%Y-%m-%d'), args.dropout)
+        for row in rows:
+            writers.write(*row)
+            count += 1
+    finally:
+        writers.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} readings from {args.devices} device(s) in {elapsed:.1f} s "
+          f"({count / max(elapsed, 1e-9):,.0f}/s) -> {', '.join(FORMATS[f] for f in args.format)}",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()